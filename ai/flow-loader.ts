@@ -0,0 +1,72 @@
+/**
+ * Lazy loaders for Genkit flows and agent orchestrators
+ *
+ * Importing a flow initialises Genkit and its plugins, so route handlers load
+ * flows on first use instead of at module evaluation. warmUpFlows() is an
+ * optional hook (AI_WARMUP) that loads everything ahead of the first request.
+ */
+
+import { metricsRegistry } from '@/lib/metrics';
+
+function lazy<T>(load: () => Promise<T>): () => Promise<T> {
+  let pending: Promise<T> | null = null;
+  return () => {
+    if (!pending) {
+      pending = load().catch(error => {
+        // Allow a later call to retry after a failed import
+        pending = null;
+        throw error;
+      });
+    }
+    return pending;
+  };
+}
+
+export const loadGenerateReport = lazy(() =>
+  import('@/ai/flows/chatbot-generate-report').then(m => m.generateReport)
+);
+export const loadSummarizeUploadedData = lazy(() =>
+  import('@/ai/flows/chatbot-summarize-data').then(m => m.summarizeUploadedData)
+);
+export const loadSuggestTasks = lazy(() =>
+  import('@/ai/flows/chatbot-suggest-tasks').then(m => m.chatbotSuggestTasks)
+);
+export const loadContextualHelp = lazy(() =>
+  import('@/ai/flows/chatbot-contextual-help').then(m => m.getContextualHelp)
+);
+export const loadZentereAuth = lazy(() =>
+  import('@/ai/flows/zentere-auth').then(m => m.zentereAuth)
+);
+export const loadEnhancedOrchestrator = lazy(() =>
+  import('@/ai/enhanced-agent-orchestrator').then(m => m.enhancedOrchestrator)
+);
+
+const warmupDuration = metricsRegistry.gauge(
+  'ai_warmup_duration_seconds',
+  'Time spent preloading Genkit flows, by module.'
+);
+
+/**
+ * Preloads every flow (and optionally the orchestrators) so the first request
+ * does not pay for Genkit initialisation. Failures are logged, not thrown.
+ */
+export async function warmUpFlows({ includeOrchestrators = false } = {}): Promise<void> {
+  const loaders: Record<string, () => Promise<unknown>> = {
+    generateReport: loadGenerateReport,
+    summarizeUploadedData: loadSummarizeUploadedData,
+    suggestTasks: loadSuggestTasks,
+    contextualHelp: loadContextualHelp,
+    zentereAuth: loadZentereAuth,
+  };
+  if (includeOrchestrators) loaders.enhancedOrchestrator = loadEnhancedOrchestrator;
+
+  await Promise.all(Object.entries(loaders).map(async ([name, load]) => {
+    const started = performance.now();
+    try {
+      await load();
+      warmupDuration.set((performance.now() - started) / 1000, { module: name });
+    } catch (error) {
+      console.warn(`Warm-up failed for ${name}:`, error);
+    }
+  }));
+}
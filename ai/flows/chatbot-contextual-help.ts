@@ -7,7 +7,7 @@
  * - ContextualHelpOutput - The return type for the getContextualHelp function.
  */
 
-import {ai} from '@/ai/genkit';
+import {ai, runScheduledFlow} from '@/ai/genkit';
 import {z} from 'genkit';
 
 const ContextualHelpInputSchema = z.object({
@@ -23,7 +23,7 @@ const ContextualHelpOutputSchema = z.object({
 export type ContextualHelpOutput = z.infer<typeof ContextualHelpOutputSchema>;
 
 export async function getContextualHelp(input: ContextualHelpInput): Promise<ContextualHelpOutput> {
-  return contextualHelpFlow(input);
+  return runScheduledFlow('interactive', model => contextualHelpFlow(input, {context: {model}}));
 }
 
 const prompt = ai.definePrompt({
@@ -45,8 +45,8 @@ const contextualHelpFlow = ai.defineFlow(
     inputSchema: ContextualHelpInputSchema,
     outputSchema: ContextualHelpOutputSchema,
   },
-  async input => {
-    const {output} = await prompt(input);
+  async (input, {context}) => {
+    const {output} = await prompt(input, {model: context?.model});
     return output!;
   }
 );
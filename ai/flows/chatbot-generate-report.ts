@@ -6,7 +6,7 @@
  * - generateReport - A function that handles the report generation process.
  */
 
-import {ai} from '@/ai/genkit';
+import {ai, runScheduledFlow} from '@/ai/genkit';
 import {
   GenerateReportInputSchema,
   type GenerateReportInput,
@@ -14,8 +14,13 @@ import {
   type GenerateReportOutput,
 } from '@/ai/flows/schemas/chatbot-generate-report-schema';
 
-export async function generateReport(input: GenerateReportInput): Promise<GenerateReportOutput> {
-  return generateReportFlow(input);
+export async function generateReport(
+  input: GenerateReportInput,
+  {signal}: {signal?: AbortSignal} = {}
+): Promise<GenerateReportOutput> {
+  return runScheduledFlow('report', model =>
+    generateReportFlow(input, {context: {model}, abortSignal: signal})
+  );
 }
 
 const prompt = ai.definePrompt({
@@ -51,8 +56,8 @@ const generateReportFlow = ai.defineFlow(
     inputSchema: GenerateReportInputSchema,
     outputSchema: GenerateReportOutputSchema,
   },
-  async input => {
-    const {output} = await prompt(input);
+  async (input, {context, abortSignal}) => {
+    const {output} = await prompt(input, {model: context?.model, abortSignal});
     return output!;
   }
 );
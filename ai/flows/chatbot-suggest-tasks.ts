@@ -8,7 +8,7 @@
  * - ChatbotSuggestTasksOutput - The return type for the chatbotSuggestTasks function.
  */
 
-import {ai} from '@/ai/genkit';
+import {ai, runScheduledFlow} from '@/ai/genkit';
 import {z} from 'genkit';
 
 const ChatbotSuggestTasksInputSchema = z.object({
@@ -26,7 +26,7 @@ const ChatbotSuggestTasksOutputSchema = z.object({
 export type ChatbotSuggestTasksOutput = z.infer<typeof ChatbotSuggestTasksOutputSchema>;
 
 export async function chatbotSuggestTasks(input: ChatbotSuggestTasksInput): Promise<ChatbotSuggestTasksOutput> {
-  return chatbotSuggestTasksFlow(input);
+  return runScheduledFlow('workflow', model => chatbotSuggestTasksFlow(input, {context: {model}}));
 }
 
 const prompt = ai.definePrompt({
@@ -56,8 +56,8 @@ const chatbotSuggestTasksFlow = ai.defineFlow(
     inputSchema: ChatbotSuggestTasksInputSchema,
     outputSchema: ChatbotSuggestTasksOutputSchema,
   },
-  async input => {
-    const {output} = await prompt(input);
+  async (input, {context}) => {
+    const {output} = await prompt(input, {model: context?.model});
     return output!;
   }
 );
@@ -8,7 +8,7 @@
  * - SummarizeUploadedDataOutput - The return type for the summarizeUploadedData function.
  */
 
-import {ai} from '@/ai/genkit';
+import {ai, runScheduledFlow} from '@/ai/genkit';
 import {z} from 'genkit';
 
 const SummarizeUploadedDataInputSchema = z.object({
@@ -25,7 +25,7 @@ const SummarizeUploadedDataOutputSchema = z.object({
 export type SummarizeUploadedDataOutput = z.infer<typeof SummarizeUploadedDataOutputSchema>;
 
 export async function summarizeUploadedData(input: SummarizeUploadedDataInput): Promise<SummarizeUploadedDataOutput> {
-  return summarizeUploadedDataFlow(input);
+  return runScheduledFlow('workflow', model => summarizeUploadedDataFlow(input, {context: {model}}));
 }
 
 const prompt = ai.definePrompt({
@@ -41,8 +41,8 @@ const summarizeUploadedDataFlow = ai.defineFlow(
     inputSchema: SummarizeUploadedDataInputSchema,
     outputSchema: SummarizeUploadedDataOutputSchema,
   },
-  async input => {
-    const {output} = await prompt(input);
+  async (input, {context}) => {
+    const {output} = await prompt(input, {model: context?.model});
     return output!;
   }
 );
@@ -1,12 +1,32 @@
 import {genkit} from 'genkit';
 import {openAICompatible} from '@genkit-ai/compat-oai';
+import {trackLLMCall} from '@/lib/metrics';
+import {llmScheduler, type LLMPriority} from '@/lib/llm-scheduler';
+
+export const DEFAULT_MODEL = 'gpt-4o-mini';
+
+// Comma-separated models tried in order when the default model's circuit is open
+export const FALLBACK_MODELS = (process.env.LLM_FALLBACK_MODELS || '')
+  .split(',')
+  .map(model => model.trim())
+  .filter(Boolean);
 
 export const ai = genkit({
   plugins: [
     openAICompatible({
       apiKey: process.env.OPENROUTER_API_KEY,
-      baseUrl: 'https://openrouter.ai/api/v1',
+      baseUrl: process.env.OPENROUTER_BASE_URL || 'https://openrouter.ai/api/v1',
     }),
   ],
-  model: 'gpt-4o-mini',
+  model: DEFAULT_MODEL,
 });
+
+/**
+ * Runs a flow call through the shared LLM scheduler, failing over across
+ * DEFAULT_MODEL and FALLBACK_MODELS. The chosen model is passed to `call`.
+ */
+export function runScheduledFlow<T>(priority: LLMPriority, call: (model: string) => Promise<T>): Promise<T> {
+  return llmScheduler.run(priority, [DEFAULT_MODEL, ...FALLBACK_MODELS], model =>
+    trackLLMCall('openrouter', model, () => call(model))
+  );
+}
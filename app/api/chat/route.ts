@@ -0,0 +1,87 @@
+import { createHash } from 'crypto';
+import { NextResponse } from 'next/server';
+import { EnhancedAPIClient, type APIConfig, type ChatCompletionParams } from '@/lib/enhanced-api-client';
+import { withRouteMetrics } from '@/lib/metrics';
+import { CircuitOpenError, QueueTimeoutError, isThrottle } from '@/lib/llm-scheduler';
+import { BodyDecodeError, readRequestBody } from '@/lib/wire-format';
+
+const ROUTE = '/api/chat';
+const ROLES = new Set(['system', 'user', 'assistant']);
+const MAX_CLIENTS = 32;
+
+// One client per key set so the response cache is shared by the tabs using it
+const clients = new Map<string, EnhancedAPIClient>();
+
+function clientFor(req: Request, preferredProvider: unknown): EnhancedAPIClient {
+  const overrides: Partial<APIConfig> = {};
+  const openaiKey = req.headers.get('x-openai-key');
+  const openrouterKey = req.headers.get('x-openrouter-key');
+  if (openaiKey) overrides.openaiKey = openaiKey;
+  if (openrouterKey) overrides.openrouterKey = openrouterKey;
+  if (preferredProvider === 'openai' || preferredProvider === 'openrouter') {
+    overrides.preferredProvider = preferredProvider;
+  }
+
+  const key = createHash('sha256').update(JSON.stringify(overrides)).digest('hex');
+  let client = clients.get(key);
+  if (!client) {
+    if (clients.size >= MAX_CLIENTS) clients.delete(clients.keys().next().value!);
+    client = new EnhancedAPIClient(overrides);
+  } else {
+    clients.delete(key);
+  }
+  clients.set(key, client);
+  return client;
+}
+
+function isMessage(value: unknown): value is ChatCompletionParams['messages'][number] {
+  const message = value as Record<string, unknown>;
+  return !!message && ROLES.has(message.role as string) && typeof message.content === 'string';
+}
+
+// Chat panel turns run through the shared scheduler at 'interactive' priority
+export const POST = withRouteMetrics(ROUTE, async (req: Request) => {
+  try {
+    const { body } = await readRequestBody(req, ROUTE);
+    const { messages, model, temperature, max_tokens, useCache, preferredProvider } = (body ?? {}) as Record<string, unknown>;
+
+    if (
+      !Array.isArray(messages) || messages.length === 0 || !messages.every(isMessage) ||
+      (model !== undefined && typeof model !== 'string') ||
+      (temperature !== undefined && typeof temperature !== 'number') ||
+      (max_tokens !== undefined && typeof max_tokens !== 'number')
+    ) {
+      return NextResponse.json({ error: 'Invalid payload' }, { status: 400 });
+    }
+
+    const completion = await clientFor(req, preferredProvider).createChatCompletion({
+      messages,
+      model: model as string | undefined,
+      temperature: temperature as number | undefined,
+      max_tokens: max_tokens as number | undefined,
+      useCache: useCache !== false,
+      priority: 'interactive',
+    });
+    return NextResponse.json(completion);
+  } catch (err) {
+    if (err instanceof BodyDecodeError) {
+      return NextResponse.json({ error: err.message }, { status: err.status });
+    }
+
+    console.error('chat error:', err);
+
+    if (err instanceof CircuitOpenError || err instanceof QueueTimeoutError) {
+      return NextResponse.json(
+        { error: 'Assistant is temporarily overloaded' },
+        { status: 503, headers: { 'Retry-After': '5' } }
+      );
+    }
+    if (isThrottle(err)) {
+      return NextResponse.json(
+        { error: 'AI provider rate limit reached' },
+        { status: 429, headers: { 'Retry-After': '5' } }
+      );
+    }
+    return NextResponse.json({ error: err instanceof Error ? err.message : 'Chat request failed' }, { status: 502 });
+  }
+});
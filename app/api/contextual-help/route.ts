@@ -0,0 +1,42 @@
+import { NextResponse } from 'next/server';
+import { loadContextualHelp } from '@/ai/flow-loader';
+import { withRouteMetrics } from '@/lib/metrics';
+import { CircuitOpenError, QueueTimeoutError, isThrottle } from '@/lib/llm-scheduler';
+import { BodyDecodeError, negotiatedResponse, readRequestBody } from '@/lib/wire-format';
+
+const ROUTE = '/api/contextual-help';
+
+// Interactive counterpart to /api/generate-report; runs at 'interactive' priority
+export const POST = withRouteMetrics(ROUTE, async (req: Request) => {
+  try {
+    const { body } = await readRequestBody(req, ROUTE);
+    const { businessUnit, lineOfBusiness, query } = (body ?? {}) as Record<string, unknown>;
+
+    if (typeof businessUnit !== 'string' || typeof lineOfBusiness !== 'string' || typeof query !== 'string') {
+      return NextResponse.json({ error: 'Invalid payload' }, { status: 400 });
+    }
+
+    const getContextualHelp = await loadContextualHelp();
+    return negotiatedResponse(req, await getContextualHelp({ businessUnit, lineOfBusiness, query }));
+  } catch (err) {
+    if (err instanceof BodyDecodeError) {
+      return NextResponse.json({ error: err.message }, { status: err.status });
+    }
+
+    console.error('contextual-help error:', err);
+
+    if (err instanceof CircuitOpenError || err instanceof QueueTimeoutError) {
+      return NextResponse.json(
+        { error: 'Assistant is temporarily overloaded' },
+        { status: 503, headers: { 'Retry-After': '5' } }
+      );
+    }
+    if (isThrottle(err)) {
+      return NextResponse.json(
+        { error: 'AI provider rate limit reached' },
+        { status: 429, headers: { 'Retry-After': '5' } }
+      );
+    }
+    return NextResponse.json({ error: 'Failed to get contextual help' }, { status: 500 });
+  }
+});
@@ -1,19 +1,51 @@
 import { NextResponse } from 'next/server';
-import { generateReport } from '@/ai/flows/chatbot-generate-report';
+import { loadGenerateReport } from '@/ai/flow-loader';
+import { withRouteMetrics } from '@/lib/metrics';
+import { CircuitOpenError, QueueTimeoutError, isThrottle } from '@/lib/llm-scheduler';
+import { toReportInput } from '@/lib/report-input';
+import {
+  BodyDecodeError,
+  SUPPORTED_ENCODINGS,
+  negotiatedResponse,
+  readRequestBody,
+  serverTiming,
+} from '@/lib/wire-format';
 
-export async function POST(req: Request) {
+const ROUTE = '/api/generate-report';
+
+export const POST = withRouteMetrics(ROUTE, async (req: Request) => {
   try {
-    const body = await req.json();
-    const { conversationHistory, analysisContext } = body ?? {};
+    const parsed = await readRequestBody(req, ROUTE);
+    const input = toReportInput(parsed.body);
 
-    if (typeof conversationHistory !== 'string' || typeof analysisContext !== 'string') {
+    if (!input) {
       return NextResponse.json({ error: 'Invalid payload' }, { status: 400 });
     }
 
-    const result = await generateReport({ conversationHistory, analysisContext });
-    return NextResponse.json(result);
+    const generateReport = await loadGenerateReport();
+    const result = await generateReport(input);
+    return negotiatedResponse(req, result, { headers: { 'Server-Timing': serverTiming(parsed) } });
   } catch (err) {
+    if (err instanceof BodyDecodeError) {
+      const headers: Record<string, string> = err.status === 415 ? { 'Accept-Encoding': SUPPORTED_ENCODINGS.join(', ') } : {};
+      return NextResponse.json({ error: err.message }, { status: err.status, headers });
+    }
+
     console.error('generate-report error:', err);
+
+    // Overload is reported as retryable instead of a generic 500
+    if (err instanceof CircuitOpenError || err instanceof QueueTimeoutError) {
+      return NextResponse.json(
+        { error: 'Report generation is temporarily overloaded' },
+        { status: 503, headers: { 'Retry-After': '30' } }
+      );
+    }
+    if (isThrottle(err)) {
+      return NextResponse.json(
+        { error: 'AI provider rate limit reached' },
+        { status: 429, headers: { 'Retry-After': '10' } }
+      );
+    }
     return NextResponse.json({ error: 'Failed to generate report' }, { status: 500 });
   }
-}
+});
@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
+import { withRouteMetrics } from '@/lib/metrics';
 
-export async function GET() {
+export const GET = withRouteMetrics('/api/health', async (_req: Request) => {
   try {
     // Basic health check
     const healthCheck = {
@@ -26,4 +27,4 @@ export async function GET() {
       { status: 500 }
     );
   }
-}
\ No newline at end of file
+});
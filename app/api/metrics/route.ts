@@ -0,0 +1,28 @@
+import { NextResponse } from 'next/server';
+import { metricsRegistry } from '@/lib/metrics';
+import { startProcessMetrics } from '@/lib/process-metrics';
+
+export const dynamic = 'force-dynamic';
+
+export async function GET() {
+  try {
+    // instrumentation.ts normally starts these at boot; this covers dev reloads
+    startProcessMetrics();
+
+    return new NextResponse(metricsRegistry.render(), {
+      status: 200,
+      headers: {
+        'Content-Type': 'text/plain; version=0.0.4; charset=utf-8',
+        'Cache-Control': 'no-store',
+      },
+    });
+  } catch (error) {
+    return NextResponse.json(
+      {
+        error: error instanceof Error ? error.message : 'Unknown error',
+        timestamp: new Date().toISOString()
+      },
+      { status: 500 }
+    );
+  }
+}
@@ -0,0 +1,85 @@
+import { NextResponse } from 'next/server';
+import { withRouteMetrics } from '@/lib/metrics';
+import { reportQueue, toJobStatus } from '@/lib/report-queue';
+
+export const dynamic = 'force-dynamic';
+
+// The queue may be shared with other nodes, so state is polled from the store
+const POLL_MS = 500;
+const KEEPALIVE_MS = 15000;
+
+/**
+ * Server-Sent Events stream of a job's state. Emits one event per state change,
+ * named after the status (queued, running, completed, failed), and closes after
+ * a terminal event.
+ */
+export const GET = withRouteMetrics(
+  '/api/report-jobs/[id]/events',
+  async (req: Request, { params }: { params: Promise<{ id: string }> }) => {
+    const { id } = await params;
+    const initial = await reportQueue.get(id);
+
+    if (!initial) {
+      return NextResponse.json({ error: 'Job not found' }, { status: 404 });
+    }
+
+    const encoder = new TextEncoder();
+    let cancelled = false;
+    let pollTimer: ReturnType<typeof setTimeout> | undefined;
+    let wake: (() => void) | undefined;
+    // Interruptible by cancel(), so a disconnected client does not leave a timer behind
+    const sleep = (ms: number) => new Promise<void>(resolve => {
+      wake = resolve;
+      pollTimer = setTimeout(resolve, ms);
+    });
+
+    const stream = new ReadableStream<Uint8Array>({
+      async start(controller) {
+        let lastStatus = '';
+        let lastWrite = Date.now();
+        const write = (chunk: string) => {
+          controller.enqueue(encoder.encode(chunk));
+          lastWrite = Date.now();
+        };
+
+        try {
+          let job = initial;
+          while (!cancelled && !req.signal.aborted) {
+            if (job.status !== lastStatus) {
+              lastStatus = job.status;
+              write(`event: ${job.status}\ndata: ${JSON.stringify(toJobStatus(job))}\n\n`);
+            }
+            if (job.status === 'completed' || job.status === 'failed') break;
+
+            await sleep(POLL_MS);
+            if (cancelled) break;
+            if (Date.now() - lastWrite >= KEEPALIVE_MS) write(': keep-alive\n\n');
+            job = (await reportQueue.get(id)) ?? job;
+          }
+        } catch (error) {
+          console.error(`report-jobs events error for ${id}:`, error);
+        } finally {
+          try {
+            controller.close();
+          } catch {
+            // Already closed by a client disconnect
+          }
+        }
+      },
+      cancel() {
+        cancelled = true;
+        clearTimeout(pollTimer);
+        wake?.();
+      },
+    });
+
+    return new Response(stream, {
+      headers: {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache, no-transform',
+        Connection: 'keep-alive',
+        'X-Accel-Buffering': 'no',
+      },
+    });
+  }
+);
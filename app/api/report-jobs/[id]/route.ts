@@ -0,0 +1,24 @@
+import { NextResponse } from 'next/server';
+import { withRouteMetrics } from '@/lib/metrics';
+import { reportQueue, toJobStatus } from '@/lib/report-queue';
+import { negotiatedResponse } from '@/lib/wire-format';
+
+export const dynamic = 'force-dynamic';
+
+export const GET = withRouteMetrics(
+  '/api/report-jobs/[id]',
+  async (req: Request, { params }: { params: Promise<{ id: string }> }) => {
+    const { id } = await params;
+    const job = await reportQueue.get(id);
+
+    if (!job) {
+      return NextResponse.json({ error: 'Job not found' }, { status: 404 });
+    }
+
+    const pending = job.status === 'queued' || job.status === 'running';
+    return negotiatedResponse(req, toJobStatus(job), {
+      // Hint for polling clients; terminal results never change
+      headers: pending ? { 'Retry-After': '2', 'Cache-Control': 'no-store' } : { 'Cache-Control': 'private, max-age=3600' },
+    });
+  }
+);
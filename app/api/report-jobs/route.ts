@@ -0,0 +1,47 @@
+import { NextResponse } from 'next/server';
+import { withRouteMetrics } from '@/lib/metrics';
+import { toReportInput } from '@/lib/report-input';
+import { reportQueue } from '@/lib/report-queue';
+import { BodyDecodeError, SUPPORTED_ENCODINGS, negotiatedResponse, readRequestBody } from '@/lib/wire-format';
+
+const ROUTE = '/api/report-jobs';
+
+export const dynamic = 'force-dynamic';
+
+// Accepts the same payloads as /api/generate-report and returns immediately
+export const POST = withRouteMetrics(ROUTE, async (req: Request) => {
+  try {
+    const parsed = await readRequestBody(req, ROUTE);
+    const input = toReportInput(parsed.body);
+
+    if (!input) {
+      return NextResponse.json({ error: 'Invalid payload' }, { status: 400 });
+    }
+
+    const job = await reportQueue.enqueue(input);
+    const statusUrl = `${ROUTE}/${job.id}`;
+    return negotiatedResponse(
+      req,
+      { jobId: job.id, status: job.status, statusUrl, eventsUrl: `${statusUrl}/events` },
+      { status: 202, headers: { Location: statusUrl } }
+    );
+  } catch (err) {
+    if (err instanceof BodyDecodeError) {
+      const headers: Record<string, string> = err.status === 415 ? { 'Accept-Encoding': SUPPORTED_ENCODINGS.join(', ') } : {};
+      return NextResponse.json({ error: err.message }, { status: err.status, headers });
+    }
+
+    console.error('report-jobs enqueue error:', err);
+    return NextResponse.json({ error: 'Failed to queue report' }, { status: 500 });
+  }
+});
+
+// Queue depth per state
+export const GET = withRouteMetrics(ROUTE, async (_req: Request) => {
+  try {
+    return NextResponse.json(await reportQueue.stats());
+  } catch (err) {
+    console.error('report-jobs stats error:', err);
+    return NextResponse.json({ error: 'Failed to read queue' }, { status: 500 });
+  }
+});
@@ -5,18 +5,89 @@ Tests the enhanced system with OpenRouter integration and contextual responses
 """
 
 import requests
+import argparse
+import gzip
 import json
+import math
+import os
+import re
+import signal
+import statistics
+import subprocess
+import threading
 import time
 import sys
-from typing import Dict, Any, List
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    from compression import zstd as _zstd  # Python 3.14+
+    zstd_compress = _zstd.compress
+except ImportError:
+    try:
+        import zstandard as _zstd
+        zstd_compress = _zstd.ZstdCompressor().compress
+    except ImportError:
+        zstd_compress = None
+
+METRIC_LINE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})?\s+(\S+)$')
+LABEL_PAIR = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+SERVER_TIMING_PARSE = re.compile(r'\bparse;dur=([0-9.]+)')
+
+
+def parse_prometheus_text(text: str) -> Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float]:
+    """Parse Prometheus text exposition into {(name, sorted label pairs): value}"""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = METRIC_LINE.match(line.strip())
+        if not match:
+            continue
+        name, raw_labels, raw_value = match.groups()
+        labels = tuple(sorted(LABEL_PAIR.findall(raw_labels or "")))
+        try:
+            samples[(name, labels)] = float(raw_value)
+        except ValueError:
+            continue
+    return samples
+
+
+def metric_total(samples: Dict, name: str, **label_filter) -> float:
+    """Sum every sample of a metric whose labels match the given filter"""
+    total = 0.0
+    for (sample_name, labels), value in samples.items():
+        if sample_name != name:
+            continue
+        label_map = dict(labels)
+        if all(label_map.get(key) == wanted for key, wanted in label_filter.items()):
+            total += value
+    return total
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; returns 0.0 for an empty list"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
 
 class BackendTester:
-    def __init__(self):
+    def __init__(self, base_url: str = "http://localhost:3000"):
         # Get the backend URL from environment or use default
-        self.base_url = "http://localhost:3000"  # Next.js default port
+        self.base_url = base_url
         self.api_base = f"{self.base_url}/api"
         self.session = requests.Session()
         self.test_results = []
+        self._thread_local = threading.local()
         
     def log_test(self, test_name: str, success: bool, message: str, details: Dict = None):
         """Log test results"""
@@ -342,6 +413,700 @@ class BackendTester:
                 {"error": str(e)}
             )
 
+    def _thread_session(self) -> requests.Session:
+        """requests.Session is not thread-safe, so each load worker gets its own"""
+        if not hasattr(self._thread_local, "session"):
+            self._thread_local.session = requests.Session()
+        return self._thread_local.session
+
+    def _load_payload(self, index: int) -> Dict[str, str]:
+        """Report payload used by the load runs; the index defeats response caching"""
+        return {
+            "conversationHistory": json.dumps([
+                {"role": "user", "content": f"analyze my data quality (run {index})"},
+                {"role": "assistant", "content": "The dataset shows excellent quality with 94/100 score."}
+            ]),
+            "analysisContext": json.dumps({
+                "selectedBu": {"name": "Sales Department"},
+                "selectedLob": {"name": "Product Sales", "hasData": True, "recordCount": 5000},
+                "userQuery": "analyze my data quality",
+                "queryType": "simple_eda"
+            })
+        }
+
+    def scrape_metrics(self) -> Optional[Dict]:
+        """Fetch and parse /api/metrics; returns None if the endpoint is unreachable"""
+        try:
+            response = self.session.get(f"{self.api_base}/metrics", timeout=5)
+            if response.status_code != 200:
+                return None
+            return parse_prometheus_text(response.text)
+        except requests.exceptions.RequestException:
+            return None
+
+    def _drive_report_load(self, total_requests: int, concurrency: int,
+                           timeout: float) -> Tuple[List[Tuple[float, float, int]], float]:
+        """Send concurrent generate-report requests; returns ([(finished_at, latency_s, status)], elapsed_s)"""
+        client_samples = []
+
+        def send(index: int):
+            started = time.perf_counter()
+            try:
+                response = self._thread_session().post(
+                    f"{self.api_base}/generate-report",
+                    json=self._load_payload(index),
+                    timeout=timeout
+                )
+                status = response.status_code
+            except requests.exceptions.RequestException:
+                status = 0
+            client_samples.append((time.time(), time.perf_counter() - started, status))
+
+        run_started = time.time()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(send, range(total_requests)))
+        return client_samples, time.time() - run_started
+
+    def run_metrics_load(self, total_requests: int = 20, concurrency: int = 4,
+                         scrape_interval: float = 1.0, timeout: float = 30,
+                         chat_requests: int = 12) -> Dict[str, Any]:
+        """
+        Drive /api/generate-report with concurrent clients while scraping /api/metrics,
+        then correlate client-side latency with server-side signals per scrape window.
+        A replay of repeated /api/chat prompts runs alongside so the server-side
+        response cache counters have traffic to count.
+        """
+        print(f"\n📡 Load run with metrics scraping ({total_requests} requests, concurrency {concurrency})...")
+
+        baseline = self.scrape_metrics()
+        if baseline is None:
+            self.log_test("Metrics Scrape", False, "Could not scrape /api/metrics before the load run",
+                          {"url": f"{self.api_base}/metrics"})
+            return {}
+
+        scrapes = [(time.time(), baseline)]
+        stop = threading.Event()
+
+        def scraper():
+            while not stop.wait(scrape_interval):
+                snapshot = self.scrape_metrics()
+                if snapshot is not None:
+                    scrapes.append((time.time(), snapshot))
+
+        chat_samples = []
+        chat_thread = threading.Thread(
+            target=lambda: chat_samples.extend(self._drive_chat_replay(chat_requests, timeout)), daemon=True)
+
+        scrape_thread = threading.Thread(target=scraper, daemon=True)
+        scrape_thread.start()
+        chat_thread.start()
+        client_samples, elapsed = self._drive_report_load(total_requests, concurrency, timeout)
+        chat_thread.join()
+        stop.set()
+        scrape_thread.join()
+
+        final = self.scrape_metrics()
+        if final is not None:
+            scrapes.append((time.time(), final))
+        else:
+            final = scrapes[-1][1]
+
+        report = self._summarize_metrics_load(client_samples, scrapes, baseline, final, elapsed)
+        report["chat"] = {
+            "requests": len(chat_samples),
+            "errors": sum(1 for status, _ in chat_samples if status != 200),
+            "served_from_cache": sum(1 for _, from_cache in chat_samples if from_cache),
+        }
+        self.log_test(
+            "Metrics Load Run",
+            report["client"]["errors"] == 0,
+            f"p50 {report['client']['p50_ms']:.0f}ms, p95 {report['client']['p95_ms']:.0f}ms, "
+            f"{report['client']['throughput_rps']:.2f} req/s, max event-loop lag "
+            f"{report['server']['eventloop_lag_max_ms']:.1f}ms",
+            report
+        )
+        print(json.dumps(report, indent=2))
+        return report
+
+    def run_throttle_load(self, total_requests: int = 20, concurrency: int = 8, stub_port: int = 8081,
+                          stub_capacity: int = 2, stub_latency_ms: float = 1500,
+                          timeout: float = 30) -> Dict[str, Any]:
+        """
+        Load generate-report while the app talks to a throttling local LLM stand-in.
+        The app must be started with OPENROUTER_BASE_URL=http://localhost:<stub_port>/v1;
+        compare runs with different LLM_MAX_CONCURRENCY values to see the scheduler's effect.
+        """
+        from llm_stub_server import start_stub_server
+
+        print(f"\n🚦 Throttled load run ({total_requests} requests, concurrency {concurrency}, "
+              f"stub capacity {stub_capacity})...")
+        print(f"   Expecting the app to use OPENROUTER_BASE_URL=http://localhost:{stub_port}/v1")
+
+        try:
+            server, stub = start_stub_server(stub_port, stub_capacity, stub_latency_ms)
+        except OSError as e:
+            self.log_test("Throttle Load - Stub", False, f"Could not start LLM stand-in: {e}",
+                          {"port": stub_port})
+            return {}
+
+        try:
+            baseline = self.scrape_metrics() or {}
+            client_samples, elapsed = self._drive_report_load(total_requests, concurrency, timeout)
+            final = self.scrape_metrics() or {}
+        finally:
+            server.shutdown()
+
+        latencies = [latency for _, latency, _ in client_samples]
+        status_counts = {}
+        for _, _, status in client_samples:
+            status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+
+        def delta(name, **labels):
+            return metric_total(final, name, **labels) - metric_total(baseline, name, **labels)
+
+        stub_stats = stub.snapshot()
+        report = {
+            "client": {
+                "requests": len(client_samples),
+                "status_counts": status_counts,
+                "throughput_rps": len(client_samples) / elapsed if elapsed > 0 else 0.0,
+                "p50_ms": percentile(latencies, 50) * 1000,
+                "p95_ms": percentile(latencies, 95) * 1000,
+            },
+            "stub": stub_stats,
+            "scheduler": {
+                "concurrency_limit": metric_total(final, "llm_scheduler_concurrency_limit"),
+                "rejected": delta("llm_scheduler_rejected_total"),
+                "failovers": delta("llm_failover_total"),
+                "open_circuits": sum(1 for (name, _), value in final.items()
+                                     if name == "llm_circuit_state" and value == 2),
+            },
+        }
+
+        # Throttling should surface as retryable 429/503s, never as 500s
+        server_errors = status_counts.get("500", 0)
+        self.log_test(
+            "Throttle Load - No 500 Cascade",
+            server_errors == 0,
+            f"{status_counts.get('200', 0)} ok, {server_errors} x 500, stub throttled "
+            f"{stub_stats['throttled']}/{stub_stats['requests']}, max upstream concurrency "
+            f"{stub_stats['max_active']}",
+            report
+        )
+        print(json.dumps(report, indent=2))
+        return report
+
+    def _drive_chat_replay(self, total_requests: int, timeout: float,
+                           distinct_prompts: int = 3) -> List[Tuple[int, bool]]:
+        """Cycle a few chat prompts through /api/chat so repeats can be served from its cache"""
+        samples = []
+        for i in range(total_requests):
+            try:
+                response = self._thread_session().post(
+                    f"{self.api_base}/chat",
+                    json={
+                        "messages": [
+                            {"role": "system", "content": "You are a forecasting assistant."},
+                            {"role": "user", "content": f"Summarize the forecast for segment {i % distinct_prompts}."}
+                        ],
+                        "useCache": True
+                    },
+                    timeout=timeout
+                )
+                from_cache = response.status_code == 200 and bool(response.json().get("fromCache"))
+                samples.append((response.status_code, from_cache))
+            except (requests.exceptions.RequestException, ValueError):
+                samples.append((0, False))
+        return samples
+
+    def _drive_interactive_load(self, total_requests: int, concurrency: int, timeout: float,
+                                think_time: float = 0.5) -> List[Tuple[float, float, int]]:
+        """Chat panel turns via /api/chat; each client pauses between turns like a user would"""
+        samples = []
+        per_client = max(1, total_requests // max(1, concurrency))
+
+        def client(index: int):
+            for turn in range(per_client):
+                started = time.perf_counter()
+                try:
+                    response = self._thread_session().post(
+                        f"{self.api_base}/chat",
+                        json={
+                            "messages": [
+                                {"role": "system", "content": "You are a forecasting assistant."},
+                                {"role": "user",
+                                 "content": f"How do I read the forecast interval? (client {index}, turn {turn})"}
+                            ],
+                            "useCache": False
+                        },
+                        timeout=timeout
+                    )
+                    status = response.status_code
+                except requests.exceptions.RequestException:
+                    status = 0
+                samples.append((time.time(), time.perf_counter() - started, status))
+                time.sleep(think_time)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(client, range(concurrency)))
+        return samples
+
+    def run_priority_mix(self, report_requests: int = 20, interactive_requests: int = 10,
+                         concurrency: int = 8, stub_port: int = 8081, stub_capacity: int = 2,
+                         stub_latency_ms: float = 1500, timeout: float = 60, label: str = "scheduler",
+                         save_path: Optional[str] = None, compare_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Saturate the app with reports while interactive calls arrive, and report
+        latency per priority. Run once as configured and once with the scheduler
+        effectively off (LLM_MAX_CONCURRENCY=1000 LLM_INTERACTIVE_RESERVE=0),
+        saving the first with --save-report and passing it to the second with
+        --compare-report to print both side by side.
+        """
+        from llm_stub_server import start_stub_server
+
+        print(f"\n🎚️  Priority mix run '{label}' ({report_requests} reports at concurrency {concurrency}, "
+              f"{interactive_requests} interactive calls, stub capacity {stub_capacity})...")
+
+        try:
+            server, stub = start_stub_server(stub_port, stub_capacity, stub_latency_ms)
+        except OSError as e:
+            self.log_test("Priority Mix - Stub", False, f"Could not start LLM stand-in: {e}",
+                          {"port": stub_port})
+            return {}
+
+        interactive_samples = []
+
+        def interactive():
+            # Let reports fill the scheduler first so interactive calls meet a busy queue
+            time.sleep(1.0)
+            interactive_samples.extend(
+                self._drive_interactive_load(interactive_requests, min(4, interactive_requests), timeout))
+
+        try:
+            baseline = self.scrape_metrics() or {}
+            interactive_thread = threading.Thread(target=interactive, daemon=True)
+            interactive_thread.start()
+            report_samples, elapsed = self._drive_report_load(report_requests, concurrency, timeout)
+            interactive_thread.join()
+            final = self.scrape_metrics() or {}
+        finally:
+            server.shutdown()
+
+        def delta(name, **labels):
+            return metric_total(final, name, **labels) - metric_total(baseline, name, **labels)
+
+        def summarize(samples, priority):
+            latencies = [latency for _, latency, status in samples if status == 200]
+            status_counts = {}
+            for _, _, status in samples:
+                status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+            waits = delta("llm_scheduler_wait_seconds_count", priority=priority)
+            return {
+                "requests": len(samples),
+                "status_counts": status_counts,
+                "p50_ms": percentile(latencies, 50) * 1000,
+                "p95_ms": percentile(latencies, 95) * 1000,
+                "mean_scheduler_wait_ms": (delta("llm_scheduler_wait_seconds_sum", priority=priority) / waits * 1000
+                                           if waits else 0.0),
+            }
+
+        report = {
+            "label": label,
+            "elapsed_s": elapsed,
+            "report": summarize(report_samples, "report"),
+            "interactive": summarize(interactive_samples, "interactive"),
+            "stub": stub.snapshot(),
+            "concurrency_limit": metric_total(final, "llm_scheduler_concurrency_limit"),
+        }
+
+        interactive_ok = report["interactive"]["status_counts"].get("200", 0)
+        self.log_test(
+            "Priority Mix - Interactive Served",
+            interactive_ok > 0 and report["interactive"]["status_counts"].get("500", 0) == 0,
+            f"interactive p95 {report['interactive']['p95_ms']:.0f} ms vs report p95 "
+            f"{report['report']['p95_ms']:.0f} ms ({interactive_ok}/{len(interactive_samples)} interactive ok)",
+            report
+        )
+        print(json.dumps(report, indent=2))
+
+        if save_path:
+            with open(save_path, "w") as f:
+                json.dump(report, f, indent=2)
+        if compare_path:
+            with open(compare_path) as f:
+                other = json.load(f)
+            print(f"\n   {'':<14}{other.get('label', 'previous'):>16}{label:>16}")
+            for priority in ("interactive", "report"):
+                for stat in ("p50_ms", "p95_ms"):
+                    print(f"   {priority + ' ' + stat[:3]:<14}{other[priority][stat]:>16.0f}{report[priority][stat]:>16.0f}")
+        return report
+
+    def _long_history(self, messages: int) -> List[Dict[str, str]]:
+        """Markdown-heavy transcript, the shape that makes double-encoded payloads grow"""
+        history = []
+        for i in range(messages):
+            if i % 2 == 0:
+                history.append({"role": "user", "content": f"Forecast weekly orders for segment {i} and explain the drivers."})
+            else:
+                history.append({"role": "assistant", "content": (
+                    f"## Analysis {i}\n\n**Summary:** orders grew {i % 17}.{i % 10}% week over week.\n\n"
+                    "| Week | Orders | Change |\n|------|--------|--------|\n"
+                    + "".join(f"| W{w} | {1000 + w * i % 500} | {w % 7}.{i % 9}% |\n" for w in range(1, 6))
+                    + "\n- Strong weekly seasonality with a \"mid-quarter\" peak\n- Outliers in `Orders` capped via IQR\n"
+                )})
+        return history
+
+    def run_wire_format_comparison(self, history_messages: int = 200, repeats: int = 5,
+                                   timeout: float = 60) -> Dict[str, Any]:
+        """
+        Send the same report request in each supported wire format and compare bytes on the
+        wire (request and raw response), client encode time and server parse time
+        (Server-Timing header, falling back to /api/metrics histogram deltas).
+        """
+        print(f"\n📦 Wire format comparison ({history_messages} messages, {repeats} repeats per format)...")
+        history = self._long_history(history_messages)
+        context = {
+            "selectedBu": {"name": "Sales Department"},
+            "selectedLob": {"name": "Product Sales", "hasData": True, "recordCount": 5000},
+            "userQuery": "generate a report",
+            "queryType": "report",
+        }
+        structured = {"conversationHistory": history, "analysisContext": context}
+        legacy = {"conversationHistory": json.dumps(history), "analysisContext": json.dumps(context)}
+        json_headers = {"Content-Type": "application/json"}
+        msgpack_accept = {"Accept": "application/msgpack"}
+
+        # name -> (encode() -> body bytes, request headers, (encoding, format) metric labels)
+        variants = {
+            "string+json (legacy)": (lambda: json.dumps(legacy).encode(), json_headers, ("identity", "json")),
+            "object+json": (lambda: json.dumps(structured).encode(), json_headers, ("identity", "json")),
+            "object+json+gzip": (lambda: gzip.compress(json.dumps(structured).encode()),
+                                 {**json_headers, "Content-Encoding": "gzip"}, ("gzip", "json")),
+            "object+json+gzip, msgpack response": (lambda: gzip.compress(json.dumps(structured).encode()),
+                                                   {**json_headers, **msgpack_accept, "Content-Encoding": "gzip"},
+                                                   ("gzip", "json")),
+        }
+        if zstd_compress:
+            variants["object+json+zstd"] = (lambda: zstd_compress(json.dumps(structured).encode()),
+                                            {**json_headers, "Content-Encoding": "zstd"}, ("zstd", "json"))
+        else:
+            print("   ⚠️  zstd skipped (needs Python 3.14 or the zstandard package)")
+        if msgpack:
+            variants["object+msgpack, msgpack response"] = (
+                lambda: msgpack.packb(structured),
+                {"Content-Type": "application/msgpack", **msgpack_accept}, ("identity", "msgpack"))
+        else:
+            print("   ⚠️  msgpack request body skipped (pip install msgpack)")
+
+        report = {}
+        for name, (encode, headers, (encoding, body_format)) in variants.items():
+            before = self.scrape_metrics() or {}
+            encode_ms, request_bytes, response_bytes, parse_ms, latencies, statuses = [], 0, [], [], [], {}
+            content_type = None
+
+            for _ in range(repeats):
+                started = time.perf_counter()
+                body = encode()
+                encode_ms.append((time.perf_counter() - started) * 1000)
+                request_bytes = len(body)
+
+                started = time.perf_counter()
+                try:
+                    response = self.session.post(f"{self.api_base}/generate-report", data=body,
+                                                 headers=headers, timeout=timeout, stream=True)
+                    raw = response.raw.read(decode_content=False)
+                    status = response.status_code
+                    response.close()
+                except requests.exceptions.RequestException:
+                    statuses["0"] = statuses.get("0", 0) + 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+                response_bytes.append(len(raw))
+                content_type = response.headers.get("Content-Type")
+
+                timing = SERVER_TIMING_PARSE.search(response.headers.get("Server-Timing", ""))
+                if timing:
+                    parse_ms.append(float(timing.group(1)))
+                if status == 200 and msgpack and "msgpack" in (content_type or ""):
+                    decoded = response.headers.get("Content-Encoding")
+                    payload = gzip.decompress(raw) if decoded == "gzip" else raw
+                    if "reportMarkdown" not in msgpack.unpackb(payload):
+                        statuses["bad-msgpack"] = statuses.get("bad-msgpack", 0) + 1
+
+            after = self.scrape_metrics() or {}
+            labels = {"route": "/api/generate-report", "encoding": encoding, "format": body_format}
+            parsed = (metric_total(after, "http_request_parse_duration_seconds_count", **labels)
+                      - metric_total(before, "http_request_parse_duration_seconds_count", **labels))
+            parse_seconds = (metric_total(after, "http_request_parse_duration_seconds_sum", **labels)
+                             - metric_total(before, "http_request_parse_duration_seconds_sum", **labels))
+
+            report[name] = {
+                "status_counts": statuses,
+                "request_bytes": request_bytes,
+                "response_bytes": statistics.median(response_bytes) if response_bytes else None,
+                "response_content_type": content_type,
+                "client_encode_ms": statistics.median(encode_ms),
+                "server_parse_ms": (statistics.median(parse_ms) if parse_ms
+                                    else parse_seconds / parsed * 1000 if parsed else None),
+                "p50_ms": percentile(latencies, 50) * 1000,
+            }
+
+        legacy_bytes = report["string+json (legacy)"]["request_bytes"]
+        for name, result in report.items():
+            ok = set(result["status_counts"]) == {"200"}
+            parse = result["server_parse_ms"]
+            self.log_test(
+                f"Wire Format - {name}",
+                ok,
+                f"{result['request_bytes']:,}B up ({result['request_bytes'] / legacy_bytes:.0%} of legacy), "
+                f"{result['response_bytes'] or 0:,.0f}B down, server parse "
+                f"{'n/a' if parse is None else f'{parse:.2f}ms'}",
+                result
+            )
+
+        print(json.dumps(report, indent=2))
+        return report
+
+    def _start_report_workers(self, count: int, command: str, env: Dict[str, str],
+                              ready_timeout: float = 120) -> List[subprocess.Popen]:
+        """Start worker processes and wait until each has loaded its flows and printed 'ready'"""
+        workers = []
+        for _ in range(count):
+            workers.append(subprocess.Popen(command, shell=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+                                            env={**os.environ, **env}, stdout=subprocess.PIPE,
+                                            stderr=subprocess.STDOUT, text=True, start_new_session=True))
+
+        deadline = time.time() + ready_timeout
+        for worker in workers:
+            ready = False
+            while not ready and time.time() < deadline:
+                line = worker.stdout.readline()
+                if not line:
+                    break  # EOF: the worker exited during startup
+                ready = "ready" in line
+            if not ready:
+                self._stop_report_workers(workers)
+                raise RuntimeError(f"report worker {worker.pid} did not become ready (exit code {worker.poll()})")
+
+        def drain(stream):
+            for _ in stream:
+                pass
+
+        # Keep reading output so workers never block on a full pipe
+        for worker in workers:
+            threading.Thread(target=drain, args=(worker.stdout,), daemon=True).start()
+        return workers
+
+    def _stop_report_workers(self, workers: List[subprocess.Popen]):
+        for worker in workers:
+            try:
+                os.killpg(worker.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for worker in workers:
+            try:
+                worker.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                os.killpg(worker.pid, signal.SIGKILL)
+
+    def _await_job_events(self, job_id: str, timeout: float) -> Optional[str]:
+        """Follow a job over SSE; returns the terminal event name or None"""
+        try:
+            with self.session.get(f"{self.api_base}/report-jobs/{job_id}/events", stream=True,
+                                  timeout=timeout) as response:
+                event = None
+                for line in response.iter_lines(decode_unicode=True):
+                    if line.startswith("event:"):
+                        event = line.split(":", 1)[1].strip()
+                        if event in ("completed", "failed"):
+                            return event
+        except requests.exceptions.RequestException:
+            return None
+        return None
+
+    def run_job_queue_benchmark(self, jobs: int = 40, worker_counts: List[int] = None, worker_slots: int = 2,
+                                worker_command: str = "npx tsx scripts/report-worker.ts",
+                                queue_dir: Optional[str] = None, stub_port: Optional[int] = 8081,
+                                stub_latency_ms: float = 1500, timeout: float = 600) -> Dict[str, Any]:
+        """
+        Measure report job throughput as worker processes are added. The web app only enqueues,
+        so it must share the queue directory (REPORT_QUEUE_DIR) with the workers started here.
+        With stub_port set, workers talk to the local LLM stand-in so upstream capacity is not
+        the bottleneck.
+        """
+        worker_counts = worker_counts or [1, 2, 4]
+        queue_dir = queue_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data", "report-jobs")
+        print(f"\n🏭 Job queue benchmark ({jobs} jobs, workers {worker_counts}, {worker_slots} slots each)...")
+        print(f"   Expecting the app to use REPORT_QUEUE_DIR={queue_dir}")
+
+        worker_env = {"REPORT_QUEUE_DIR": queue_dir, "REPORT_WORKER_CONCURRENCY": str(worker_slots),
+                      "REPORT_WORKER_POLL_MS": "100"}
+        stub_server = None
+        if stub_port:
+            from llm_stub_server import start_stub_server
+            try:
+                stub_server, _ = start_stub_server(stub_port, capacity=max(worker_counts) * worker_slots * 2,
+                                                   latency_ms=stub_latency_ms)
+                worker_env["OPENROUTER_BASE_URL"] = f"http://localhost:{stub_port}/v1"
+                worker_env.setdefault("OPENROUTER_API_KEY", os.environ.get("OPENROUTER_API_KEY", "stub"))
+            except OSError as e:
+                self.log_test("Job Queue - Stub", False, f"Could not start LLM stand-in: {e}", {"port": stub_port})
+                return {}
+
+        def parse_time(value: Optional[str]) -> Optional[float]:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() if value else None
+
+        report = {}
+        try:
+            for count in worker_counts:
+                try:
+                    workers = self._start_report_workers(count, worker_command, worker_env)
+                except RuntimeError as e:
+                    self.log_test(f"Job Queue - {count} workers", False, str(e))
+                    continue
+
+                try:
+                    enqueue_latencies, job_ids = [], []
+                    for index in range(jobs):
+                        started = time.perf_counter()
+                        response = self.session.post(f"{self.api_base}/report-jobs", json=self._load_payload(index),
+                                                     timeout=10)
+                        enqueue_latencies.append(time.perf_counter() - started)
+                        if response.status_code == 202:
+                            job_ids.append(response.json()["jobId"])
+
+                    sse_event = self._await_job_events(job_ids[0], timeout) if job_ids else None
+
+                    # Poll the remaining jobs until all are terminal
+                    finished, deadline = {}, time.time() + timeout
+                    with ThreadPoolExecutor(max_workers=8) as pool:
+                        while len(finished) < len(job_ids) and time.time() < deadline:
+                            pending = [job_id for job_id in job_ids if job_id not in finished]
+                            for job_id, status in zip(pending, pool.map(self._job_status, pending)):
+                                if status and status.get("status") in ("completed", "failed"):
+                                    finished[job_id] = status
+                            if len(finished) < len(job_ids):
+                                time.sleep(0.25)
+                finally:
+                    self._stop_report_workers(workers)
+
+                completed = [s for s in finished.values() if s["status"] == "completed"]
+                created = [parse_time(s["createdAt"]) for s in finished.values()]
+                done = [parse_time(s.get("finishedAt")) for s in finished.values() if s.get("finishedAt")]
+                waits = [parse_time(s["startedAt"]) - parse_time(s["createdAt"]) for s in completed if s.get("startedAt")]
+                runs = [parse_time(s["finishedAt"]) - parse_time(s["startedAt"]) for s in completed
+                        if s.get("startedAt") and s.get("finishedAt")]
+                makespan = (max(done) - min(created)) if done and created else 0.0
+
+                report[count] = {
+                    "jobs": len(job_ids),
+                    "completed": len(completed),
+                    "failed": len(finished) - len(completed),
+                    "unfinished": len(job_ids) - len(finished),
+                    "throughput_jobs_per_s": len(completed) / makespan if makespan > 0 else 0.0,
+                    "enqueue_p95_ms": percentile(enqueue_latencies, 95) * 1000,
+                    "queue_wait_p50_s": percentile(waits, 50),
+                    "run_p50_s": percentile(runs, 50),
+                    "sse_terminal_event": sse_event,
+                }
+                result = report[count]
+                self.log_test(
+                    f"Job Queue - {count} workers",
+                    result["completed"] == jobs and sse_event == "completed",
+                    f"{result['completed']}/{jobs} completed, {result['throughput_jobs_per_s']:.2f} jobs/s, "
+                    f"enqueue p95 {result['enqueue_p95_ms']:.0f}ms, SSE {sse_event}",
+                    result
+                )
+        finally:
+            if stub_server:
+                stub_server.shutdown()
+
+        # Scaling efficiency relative to linear speedup over the smallest pool
+        base_count = min(report, default=None)
+        if base_count and report[base_count]["throughput_jobs_per_s"] > 0:
+            base = report[base_count]["throughput_jobs_per_s"] / base_count
+            for count, result in report.items():
+                result["scaling_efficiency"] = round(result["throughput_jobs_per_s"] / (base * count), 3)
+
+        print(json.dumps(report, indent=2))
+        return report
+
+    def _job_status(self, job_id: str) -> Optional[Dict]:
+        try:
+            response = self._thread_session().get(f"{self.api_base}/report-jobs/{job_id}", timeout=10)
+            return response.json() if response.status_code == 200 else None
+        except (requests.exceptions.RequestException, ValueError):
+            return None
+
+    def _summarize_metrics_load(self, client_samples: List, scrapes: List, baseline: Dict,
+                                final: Dict, elapsed: float) -> Dict[str, Any]:
+        """Combine client latencies with server metric deltas and per-window correlations"""
+        route = "/api/generate-report"
+        latencies = [latency for _, latency, _ in client_samples]
+        errors = sum(1 for _, _, status in client_samples if status != 200)
+
+        def delta(name, **labels):
+            return metric_total(final, name, **labels) - metric_total(baseline, name, **labels)
+
+        server_count = delta("http_request_duration_seconds_count", route=route)
+        upstream_count = delta("llm_upstream_duration_seconds_count")
+
+        # Per scrape window: mean client latency vs. event-loop lag and in-flight LLM calls
+        window_latency, window_lag, window_inflight = [], [], []
+        for (start, _), (end, snapshot) in zip(scrapes, scrapes[1:]):
+            in_window = [latency for finished, latency, _ in client_samples if start < finished <= end]
+            if not in_window:
+                continue
+            window_latency.append(statistics.mean(in_window))
+            window_lag.append(metric_total(snapshot, "nodejs_eventloop_lag_max_seconds"))
+            window_inflight.append(metric_total(snapshot, "llm_requests_in_flight"))
+
+        def correlation(xs, ys):
+            if len(xs) < 3 or len(set(xs)) < 2 or len(set(ys)) < 2:
+                return None
+            return round(statistics.correlation(xs, ys), 3)
+
+        upstream_errors = {}
+        for (name, labels), value in final.items():
+            if name == "llm_upstream_errors_total":
+                key = dict(labels).get("model", "unknown")
+                upstream_errors[key] = upstream_errors.get(key, 0) + value - baseline.get((name, labels), 0)
+
+        return {
+            "client": {
+                "requests": len(client_samples),
+                "errors": errors,
+                "throughput_rps": len(client_samples) / elapsed if elapsed > 0 else 0.0,
+                "p50_ms": percentile(latencies, 50) * 1000,
+                "p95_ms": percentile(latencies, 95) * 1000,
+                "p99_ms": percentile(latencies, 99) * 1000,
+            },
+            "server": {
+                "route_requests": server_count,
+                "route_mean_ms": (delta("http_request_duration_seconds_sum", route=route) / server_count * 1000)
+                                 if server_count else 0.0,
+                "upstream_calls": upstream_count,
+                "upstream_mean_ms": (delta("llm_upstream_duration_seconds_sum") / upstream_count * 1000)
+                                    if upstream_count else 0.0,
+                "upstream_errors_by_model": upstream_errors,
+                "llm_in_flight_max": max(window_inflight, default=0.0),
+                "eventloop_lag_max_ms": max((metric_total(snap, "nodejs_eventloop_lag_max_seconds")
+                                             for _, snap in scrapes), default=0.0) * 1000,
+                "gc_pause_total_ms": delta("nodejs_gc_duration_seconds_sum") * 1000,
+                "cache_hits": delta("api_cache_events_total", event="hit"),
+                # Server-side /api/chat response cache; expired entries are misses too
+                "cache_misses": (delta("api_cache_events_total", event="miss")
+                                 + delta("api_cache_events_total", event="expired")),
+                "cache_evictions": delta("api_cache_events_total", event="eviction"),
+            },
+            "correlation": {
+                "windows": len(window_latency),
+                "latency_vs_eventloop_lag": correlation(window_latency, window_lag),
+                "latency_vs_llm_in_flight": correlation(window_latency, window_inflight),
+            },
+        }
+
     def run_all_tests(self):
         """Run all backend tests"""
         print("🚀 Starting Backend API Testing Suite")
@@ -393,8 +1158,66 @@ class BackendTester:
 
 def main():
     """Main test execution"""
-    tester = BackendTester()
-    results = tester.run_all_tests()
+    parser = argparse.ArgumentParser(description="Backend API testing suite")
+    parser.add_argument("--base-url", default="http://localhost:3000")
+    parser.add_argument("--mode", choices=["test", "metrics-load", "throttle-load", "priority-mix", "wire-format",
+                                           "job-queue"],
+                        default="test",
+                        help="'metrics-load' scrapes /api/metrics during load; "
+                             "'throttle-load' loads the app against a throttling LLM stand-in; "
+                             "'priority-mix' adds interactive calls to that load and reports latency per priority; "
+                             "'wire-format' compares request/response encodings; "
+                             "'job-queue' measures report job throughput as workers are added")
+    parser.add_argument("--requests", type=int, default=20, help="Total requests for load modes")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent clients for load modes")
+    parser.add_argument("--scrape-interval", type=float, default=1.0, help="Seconds between metric scrapes")
+    parser.add_argument("--chat-requests", type=int, default=12,
+                        help="metrics-load: repeated /api/chat prompts replayed to exercise the response cache")
+    parser.add_argument("--stub-port", type=int, default=8081, help="Port for the throttling LLM stand-in")
+    parser.add_argument("--stub-capacity", type=int, default=2, help="Concurrent calls the stand-in admits")
+    parser.add_argument("--interactive-requests", type=int, default=10,
+                        help="priority-mix: interactive calls made during the report load")
+    parser.add_argument("--label", default="scheduler", help="priority-mix: name for this run")
+    parser.add_argument("--save-report", default=None, help="priority-mix: write the run's results to this file")
+    parser.add_argument("--compare-report", default=None,
+                        help="priority-mix: print this saved run next to the current one")
+    parser.add_argument("--history-messages", type=int, default=200,
+                        help="Transcript length for the wire-format comparison")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker process counts for job-queue")
+    parser.add_argument("--worker-slots", type=int, default=2, help="Concurrent jobs per worker process")
+    parser.add_argument("--worker-command", default="npx tsx scripts/report-worker.ts")
+    parser.add_argument("--queue-dir", default=None, help="REPORT_QUEUE_DIR shared with the app")
+    parser.add_argument("--no-stub", action="store_true", help="job-queue: use the real LLM provider")
+    args = parser.parse_args()
+
+    tester = BackendTester(args.base_url)
+    if args.mode == "metrics-load":
+        tester.run_metrics_load(args.requests, args.concurrency, args.scrape_interval,
+                                chat_requests=args.chat_requests)
+        tester.print_summary()
+        results = tester.test_results
+    elif args.mode == "throttle-load":
+        tester.run_throttle_load(args.requests, args.concurrency, args.stub_port, args.stub_capacity)
+        tester.print_summary()
+        results = tester.test_results
+    elif args.mode == "priority-mix":
+        tester.run_priority_mix(args.requests, args.interactive_requests, args.concurrency, args.stub_port,
+                                args.stub_capacity, label=args.label, save_path=args.save_report,
+                                compare_path=args.compare_report)
+        tester.print_summary()
+        results = tester.test_results
+    elif args.mode == "wire-format":
+        tester.run_wire_format_comparison(args.history_messages, max(1, args.requests // 4))
+        tester.print_summary()
+        results = tester.test_results
+    elif args.mode == "job-queue":
+        tester.run_job_queue_benchmark(args.requests, [int(n) for n in args.workers.split(",") if n.strip()],
+                                       args.worker_slots, args.worker_command, args.queue_dir,
+                                       None if args.no_stub else args.stub_port)
+        tester.print_summary()
+        results = tester.test_results
+    else:
+        results = tester.run_all_tests()
     
     # Exit with error code if any tests failed
     failed_count = sum(1 for result in results if not result["success"])
@@ -748,7 +748,7 @@ export default function ChatPanel({ className }: { className?: string }) {
   
   // Visualize click handler
   const handleVisualizeClick = (messageId: string) => {
-    const msg = state.messages.find(m => m.id === messageId);
+    const msg = state.messages.findById(messageId);
     // Map target to expected values to fix type error
     const target = msg?.visualization?.target === "Orders" ? "Orders" : "Value";
     dispatch({ type: 'SET_DATA_PANEL_TARGET', payload: target });
@@ -759,7 +759,7 @@ export default function ChatPanel({ className }: { className?: string }) {
 
   // Generate report handler
   const handleGenerateReport = (messageId: string) => {
-    const msg = state.messages.find(m => m.id === messageId);
+    const msg = state.messages.findById(messageId);
     if (msg?.reportData && msg.agentType) {
       dispatch({ 
         type: 'GENERATE_REPORT', 
@@ -773,7 +773,7 @@ export default function ChatPanel({ className }: { className?: string }) {
     }
   };
 
-  const isAssistantTyping = state.isProcessing || state.messages[state.messages.length - 1]?.isTyping;
+  const isAssistantTyping = state.isProcessing || state.messages.last()?.isTyping;
 
   return (
     <>
@@ -15,7 +15,7 @@ import {
   Workflow, MessageSquare, Globe, Shield
 } from 'lucide-react';
 import { cn } from '@/lib/utils';
-import { enhancedOrchestrator, type EnhancedAgent, type BusinessInsight, type ActionableRecommendation } from '@/ai/enhanced-agent-orchestrator';
+import type { EnhancedAgentOrchestrator, EnhancedAgent, BusinessInsight, ActionableRecommendation } from '@/ai/enhanced-agent-orchestrator';
 
 interface SystemMetrics {
   totalAgents: number;
@@ -46,9 +46,25 @@ export default function EnhancedAgentMonitor({ className }: { className?: string
   const [communications, setCommunications] = useState<AgentCommunication[]>([]);
   const [isRefreshing, setIsRefreshing] = useState(false);
   const [autoRefresh, setAutoRefresh] = useState(true);
+  const [enhancedOrchestrator, setEnhancedOrchestrator] = useState<EnhancedAgentOrchestrator | null>(null);
+
+  // The orchestrator is large, so it is loaded when the monitor first mounts
+  useEffect(() => {
+    let cancelled = false;
+    import('@/ai/enhanced-agent-orchestrator')
+      .then(m => {
+        if (!cancelled) setEnhancedOrchestrator(m.enhancedOrchestrator);
+      })
+      .catch(error => console.error('Failed to load agent orchestrator:', error));
+    return () => {
+      cancelled = true;
+    };
+  }, []);
 
   // Simulated real-time data updates
   useEffect(() => {
+    if (!enhancedOrchestrator) return;
+
     const updateData = () => {
       // Get agent status from orchestrator
       const agentStatus = enhancedOrchestrator.getAgentStatus();
@@ -132,7 +148,7 @@ export default function EnhancedAgentMonitor({ className }: { className?: string
     return () => {
       if (interval) clearInterval(interval);
     };
-  }, [autoRefresh]);
+  }, [autoRefresh, enhancedOrchestrator]);
 
   const refreshData = async () => {
     setIsRefreshing(true);
@@ -140,8 +156,9 @@ export default function EnhancedAgentMonitor({ className }: { className?: string
     await new Promise(resolve => setTimeout(resolve, 1000));
     
     // Trigger data update
-    const agentStatus = enhancedOrchestrator.getAgentStatus();
-    setAgents(agentStatus);
+    if (enhancedOrchestrator) {
+      setAgents(enhancedOrchestrator.getAgentStatus());
+    }
     
     setIsRefreshing(false);
   };
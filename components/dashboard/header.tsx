@@ -15,11 +15,14 @@ import { Settings, User, Bot, BarChart, Sun, Moon, FileText, Printer, UploadClou
 import placeholderImages from '@/lib/placeholder-images.json';
 import { useApp } from "@/components/dashboard/app-provider";
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogFooter } from '@/components/ui/dialog';
-import EnhancedAgentMonitor from './enhanced-agent-monitor';
 import ReportViewer from './report-viewer';
 import BuLobSelector from './bu-lob-selector';
 import { Input } from '@/components/ui/input';
 import { Label } from '@/components/ui/label';
+import dynamic from 'next/dynamic';
+
+// Loaded on demand: pulls in the agent orchestrator, which is only needed once the monitor opens
+const EnhancedAgentMonitor = dynamic(() => import('./enhanced-agent-monitor'), { ssr: false });
 
 const ThemeToggle = () => {
     const [theme, setTheme] = React.useState('light');
@@ -183,13 +186,19 @@ export default function Header({ onLogout }: HeaderProps = {}) {
             Line of Business: ${selectedLob?.name}
             Data Summary: ${selectedLob?.recordCount} records, completeness ${selectedLob?.dataQuality?.completeness}%, ${selectedLob?.dataQuality?.outliers} outliers.
         `;
-      const history = JSON.stringify(messages.map(m => ({ role: m.role, content: m.content })));
+      // Structured history: the route serializes it once for the prompt
+      const history = messages.map(m => ({ role: m.role, content: m.content }));
+      const body = JSON.stringify({ conversationHistory: history, analysisContext: context });
+      const headers: Record<string, string> = { 'Content-Type': 'application/json' };
+      let payload: BodyInit = body;
+
+      // Long Markdown transcripts compress well; small bodies are not worth the CPU
+      if (body.length > 32 * 1024 && typeof CompressionStream !== 'undefined') {
+        payload = await new Response(new Blob([body]).stream().pipeThrough(new CompressionStream('gzip'))).blob();
+        headers['Content-Encoding'] = 'gzip';
+      }
 
-      const res = await fetch('/api/generate-report', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ conversationHistory: history, analysisContext: context })
-      });
+      const res = await fetch('/api/generate-report', { method: 'POST', headers, body: payload });
 
       if (!res.ok) {
         throw new Error(`HTTP ${res.status}`);
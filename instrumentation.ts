@@ -0,0 +1,30 @@
+/**
+ * Next.js server startup hook
+ *
+ * AI_WARMUP=true preloads Genkit flows in the background after boot;
+ * AI_WARMUP=blocking finishes preloading before the server takes traffic.
+ * REPORT_WORKERS=n runs n report job slots inside this server; by default the
+ * web tier only enqueues and scripts/report-worker.ts processes do the work.
+ */
+
+export async function register() {
+  if (process.env.NEXT_RUNTIME === 'nodejs') {
+    const { startProcessMetrics } = await import('@/lib/process-metrics');
+    startProcessMetrics();
+
+    const warmup = process.env.AI_WARMUP;
+    if (warmup === 'true' || warmup === 'blocking') {
+      const { warmUpFlows } = await import('@/ai/flow-loader');
+      const pending = warmUpFlows({ includeOrchestrators: process.env.AI_WARMUP_ORCHESTRATORS === 'true' });
+      if (warmup === 'blocking') await pending;
+    }
+
+    const reportWorkers = Number(process.env.REPORT_WORKERS) || 0;
+    if (reportWorkers > 0) {
+      const { runReportWorker } = await import('@/lib/report-worker');
+      runReportWorker({ concurrency: reportWorkers }).catch(error => {
+        console.error('In-process report worker stopped:', error);
+      });
+    }
+  }
+}
@@ -0,0 +1,74 @@
+/**
+ * Cached Markdown-to-HTML rendering for chat bubbles
+ *
+ * Agent responses are long and the regex pipeline below is run per bubble, so
+ * results are memoized per message id. A message whose content changes while
+ * it streams replaces its own entry instead of adding one per partial.
+ */
+
+const MAX_CACHE_ENTRIES = 500;
+
+const htmlCache = new Map<string, { content: string; html: string }>();
+let cacheHits = 0;
+let cacheMisses = 0;
+
+function renderUncached(content: string): string {
+  return content
+    .replace(/\[WORKFLOW_PLAN\][\s\S]*?\[\/WORKFLOW_PLAN\]/, '')
+    .replace(/\[REPORT_DATA\][\s\S]*?\[\/REPORT_DATA\]/, '')
+    // Headers
+    .replace(/### (.*?)$/gm, '<h4 class="text-sm font-semibold mt-3 mb-2 text-foreground">$1</h4>')
+    .replace(/## (.*?)$/gm, '<h3 class="text-base font-semibold mt-4 mb-2 text-foreground">$1</h3>')
+    .replace(/# (.*?)$/gm, '<h2 class="text-lg font-bold mt-4 mb-3 text-foreground">$1</h2>')
+    // Bold text
+    .replace(/\*\*(.*?)\*\*/g, '<strong class="font-semibold text-foreground">$1</strong>')
+    // Tables - convert simple markdown tables
+    .replace(/\|(.*?)\|/g, (match, content: string) => {
+      const cells = content.split('|').map(cell => `<td class="border px-2 py-1 text-xs">${cell.trim()}</td>`).join('');
+      return `<tr>${cells}</tr>`;
+    })
+    // Numbered lists
+    .replace(/^(\d+)\.\s+(.*?)$/gm, '<div class="flex gap-2 my-1"><span class="text-primary font-medium min-w-[20px]">$1.</span><span>$2</span></div>')
+    // Bullet points - better formatting
+    .replace(/^[•\-\*]\s+(.*?)$/gm, '<div class="flex gap-2 my-1"><span class="text-primary">•</span><span>$1</span></div>')
+    // Nested bullet points
+    .replace(/^\s+[•\-\*]\s+(.*?)$/gm, '<div class="flex gap-2 my-1 ml-4"><span class="text-muted-foreground">◦</span><span class="text-sm">$1</span></div>')
+    // Code blocks
+    .replace(/`([^`]+)`/g, '<code class="bg-muted px-1 py-0.5 rounded text-xs font-mono">$1</code>')
+    // Percentages and numbers highlighting
+    .replace(/(\d+\.?\d*%)/g, '<span class="font-semibold text-green-600 dark:text-green-400">$1</span>')
+    .replace(/(\$[\d,]+)/g, '<span class="font-semibold text-blue-600 dark:text-blue-400">$1</span>')
+    // Line breaks
+    .replace(/\n\n/g, '</p><p class="mb-2">')
+    .replace(/\n/g, '<br />')
+    // Wrap in paragraphs
+    .replace(/^/, '<p class="mb-2">')
+    .replace(/$/, '</p>');
+}
+
+export function renderChatMarkdown(messageId: string, content: string): string {
+  const cached = htmlCache.get(messageId);
+  // Refresh recency so long sessions keep the visible window cached
+  htmlCache.delete(messageId);
+  if (cached?.content === content) {
+    cacheHits++;
+    htmlCache.set(messageId, cached);
+    return cached.html;
+  }
+
+  cacheMisses++;
+  const html = renderUncached(content);
+  if (htmlCache.size >= MAX_CACHE_ENTRIES) {
+    htmlCache.delete(htmlCache.keys().next().value as string);
+  }
+  htmlCache.set(messageId, { content, html });
+  return html;
+}
+
+export function renderChatMarkdownUncached(content: string): string {
+  return renderUncached(content);
+}
+
+export function getChatMarkdownCacheStats() {
+  return { size: htmlCache.size, hits: cacheHits, misses: cacheMisses };
+}
@@ -0,0 +1,175 @@
+/**
+ * Persistent chat message storage with structural sharing
+ *
+ * Messages are kept in fixed-size immutable chunks. Appending or updating a
+ * message copies one chunk and the (short) chunk spine, so every reducer
+ * update costs O(CHUNK_SIZE + n / CHUNK_SIZE) instead of copying the whole
+ * transcript, and unchanged messages keep their object identity for memoized
+ * rendering.
+ */
+
+import type { ChatMessage } from '@/lib/types';
+
+const CHUNK_SIZE = 64;
+
+type Chunk = readonly ChatMessage[];
+
+export class MessageList implements Iterable<ChatMessage> {
+  private constructor(
+    private readonly chunks: readonly Chunk[],
+    readonly length: number,
+    private readonly typingCount: number,
+    // Shared, append-only id -> index hints; always verified before use
+    private readonly idHints: Map<string, number>
+  ) {}
+
+  static empty(): MessageList {
+    return new MessageList([], 0, 0, new Map());
+  }
+
+  static from(messages: readonly ChatMessage[]): MessageList {
+    const chunks: Chunk[] = [];
+    const idHints = new Map<string, number>();
+    let typingCount = 0;
+
+    for (let i = 0; i < messages.length; i += CHUNK_SIZE) {
+      chunks.push(Object.freeze(messages.slice(i, i + CHUNK_SIZE)));
+    }
+    messages.forEach((message, index) => {
+      idHints.set(message.id, index);
+      if (message.isTyping) typingCount++;
+    });
+
+    return new MessageList(chunks, messages.length, typingCount, idHints);
+  }
+
+  at(index: number): ChatMessage | undefined {
+    if (index < 0) index += this.length;
+    if (index < 0 || index >= this.length) return undefined;
+    return this.chunks[Math.floor(index / CHUNK_SIZE)][index % CHUNK_SIZE];
+  }
+
+  last(): ChatMessage | undefined {
+    return this.at(this.length - 1);
+  }
+
+  indexOfId(id: string): number {
+    const hint = this.idHints.get(id);
+    if (hint !== undefined && this.at(hint)?.id === id) return hint;
+
+    // Hints can be stale after a branch dropped typing messages; scan from the tail
+    for (let i = this.length - 1; i >= 0; i--) {
+      if (this.at(i)!.id === id) return i;
+    }
+    return -1;
+  }
+
+  findById(id: string): ChatMessage | undefined {
+    const index = this.indexOfId(id);
+    return index === -1 ? undefined : this.at(index);
+  }
+
+  push(message: ChatMessage): MessageList {
+    const chunks = this.chunks.slice();
+    const lastChunk = chunks[chunks.length - 1];
+
+    if (lastChunk && lastChunk.length < CHUNK_SIZE) {
+      chunks[chunks.length - 1] = Object.freeze([...lastChunk, message]);
+    } else {
+      chunks.push(Object.freeze([message]));
+    }
+
+    this.idHints.set(message.id, this.length);
+    return new MessageList(chunks, this.length + 1, this.typingCount + (message.isTyping ? 1 : 0), this.idHints);
+  }
+
+  updateAt(index: number, update: (message: ChatMessage) => ChatMessage): MessageList {
+    const current = this.at(index);
+    if (!current) return this;
+    if (index < 0) index += this.length;
+
+    const next = update(current);
+    if (next === current) return this;
+
+    const chunkIndex = Math.floor(index / CHUNK_SIZE);
+    const chunk = this.chunks[chunkIndex].slice();
+    chunk[index % CHUNK_SIZE] = next;
+
+    const chunks = this.chunks.slice();
+    chunks[chunkIndex] = Object.freeze(chunk);
+
+    const typingCount = this.typingCount - (current.isTyping ? 1 : 0) + (next.isTyping ? 1 : 0);
+    if (next.id !== current.id) this.idHints.set(next.id, index);
+    return new MessageList(chunks, this.length, typingCount, this.idHints);
+  }
+
+  updateById(id: string, update: (message: ChatMessage) => ChatMessage): MessageList {
+    const index = this.indexOfId(id);
+    return index === -1 ? this : this.updateAt(index, update);
+  }
+
+  updateLast(update: (message: ChatMessage) => ChatMessage): MessageList {
+    return this.length === 0 ? this : this.updateAt(this.length - 1, update);
+  }
+
+  /**
+   * Drops typing placeholders. They normally sit at the tail, which is a
+   * cheap pop; anything else falls back to a rebuild.
+   */
+  withoutTyping(): MessageList {
+    if (this.typingCount === 0) return this;
+
+    let list: MessageList = this;
+    while (list.typingCount > 0 && list.last()?.isTyping) {
+      list = list.pop();
+    }
+    return list.typingCount === 0 ? list : MessageList.from(list.toArray().filter(m => !m.isTyping));
+  }
+
+  slice(start?: number, end?: number): ChatMessage[] {
+    const from = start === undefined ? 0 : start < 0 ? Math.max(0, this.length + start) : Math.min(start, this.length);
+    const to = end === undefined ? this.length : end < 0 ? Math.max(0, this.length + end) : Math.min(end, this.length);
+    const result: ChatMessage[] = [];
+    for (let i = from; i < to; i++) result.push(this.at(i)!);
+    return result;
+  }
+
+  find(predicate: (message: ChatMessage, index: number) => boolean): ChatMessage | undefined {
+    let index = 0;
+    for (const message of this) {
+      if (predicate(message, index++)) return message;
+    }
+    return undefined;
+  }
+
+  map<T>(mapper: (message: ChatMessage, index: number) => T): T[] {
+    const result: T[] = [];
+    let index = 0;
+    for (const message of this) result.push(mapper(message, index++));
+    return result;
+  }
+
+  toArray(): ChatMessage[] {
+    return this.slice();
+  }
+
+  *[Symbol.iterator](): Iterator<ChatMessage> {
+    for (const chunk of this.chunks) {
+      yield* chunk;
+    }
+  }
+
+  private pop(): MessageList {
+    if (this.length === 0) return this;
+    const removed = this.last()!;
+    const chunks = this.chunks.slice();
+    const lastChunk = chunks[chunks.length - 1];
+
+    if (lastChunk.length === 1) {
+      chunks.pop();
+    } else {
+      chunks[chunks.length - 1] = Object.freeze(lastChunk.slice(0, -1));
+    }
+    return new MessageList(chunks, this.length - 1, this.typingCount - (removed.isTyping ? 1 : 0), this.idHints);
+  }
+}
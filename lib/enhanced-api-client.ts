@@ -3,26 +3,42 @@
  */
 
 import OpenAI from 'openai';
+import { apiCacheEvents, trackLLMCall } from '@/lib/metrics';
+import { CircuitOpenError, QueueTimeoutError, llmScheduler, type LLMPriority } from '@/lib/llm-scheduler';
 
 // API Configuration
-interface APIConfig {
+export interface APIConfig {
   openaiKey: string;
   openrouterKey: string;
   preferredProvider: 'openai' | 'openrouter';
   model: string;
 }
-// Default configuration - Using OpenRouter as primary since it's working
+// Default configuration - Using OpenRouter as primary since it's working.
+// Server-only variables are undefined in the browser bundle.
 const DEFAULT_CONFIG: APIConfig = {
-  openaiKey: process.env.NEXT_PUBLIC_OPENAI_API_KEY || '',
-  openrouterKey: '',
+  openaiKey: process.env.OPENAI_API_KEY || process.env.NEXT_PUBLIC_OPENAI_API_KEY || '',
+  openrouterKey: process.env.OPENROUTER_API_KEY || '',
   preferredProvider: 'openrouter',
   model: 'gpt-4o-mini'
 };
 
 const OPENROUTER_MODEL = 'meta-llama/llama-4-maverick-17b-128e-instruct:free';
-const OPENROUTER_BASE_URL = 'https://openrouter.ai/api/v1';
+const OPENROUTER_BASE_URL = process.env.OPENROUTER_BASE_URL || 'https://openrouter.ai/api/v1';
+
+// Browser chat turns are sent here so they queue in the server's shared scheduler
+export const CHAT_API_PATH = '/api/chat';
+
+export type ChatCompletionParams = {
+  model?: string;
+  messages: Array<{ role: 'system' | 'user' | 'assistant'; content: string }>;
+  temperature?: number;
+  max_tokens?: number;
+  useCache?: boolean;
+  retryWithFallback?: boolean;
+  priority?: LLMPriority;
+};
 
-// Cache implementation
+// Cache implementation; runs on the server behind /api/chat, where its events reach /api/metrics
 interface CacheEntry<T> {
   data: T;
   timestamp: number;
@@ -33,11 +49,14 @@ class APICache {
   private cache = new Map<string, CacheEntry<any>>();
   private maxSize = 100;
   private defaultTTL = 5 * 60 * 1000; // 5 minutes
+  private stats = { hits: 0, misses: 0, evictions: 0 };
 
   set<T>(key: string, data: T, ttl = this.defaultTTL): void {
-    if (this.cache.size >= this.maxSize) {
+    if (this.cache.size >= this.maxSize && !this.cache.has(key)) {
       const firstKey = this.cache.keys().next().value;
       this.cache.delete(firstKey);
+      this.stats.evictions++;
+      apiCacheEvents.inc({ event: 'eviction' });
     }
 
     this.cache.set(key, {
@@ -49,31 +68,60 @@ class APICache {
 
   get<T>(key: string): T | null {
     const entry = this.cache.get(key);
-    if (!entry) return null;
+    if (!entry) {
+      this.stats.misses++;
+      apiCacheEvents.inc({ event: 'miss' });
+      return null;
+    }
     
     if (Date.now() > entry.expires) {
       this.cache.delete(key);
+      this.stats.misses++;
+      apiCacheEvents.inc({ event: 'expired' });
       return null;
     }
     
+    this.stats.hits++;
+    apiCacheEvents.inc({ event: 'hit' });
     return entry.data;
   }
 
   clear(): void {
     this.cache.clear();
+    this.stats = { hits: 0, misses: 0, evictions: 0 };
+  }
+
+  /** Tallies a lookup answered by the server-side cache (browser only; not exported as a metric) */
+  recordRemote(hit: boolean): void {
+    if (hit) this.stats.hits++;
+    else this.stats.misses++;
   }
 
   getCacheStats() {
     const now = Date.now();
     const valid = Array.from(this.cache.values()).filter(entry => now < entry.expires);
+    const lookups = this.stats.hits + this.stats.misses;
     return {
       total: this.cache.size,
       valid: valid.length,
-      hitRate: valid.length / Math.max(this.cache.size, 1)
+      hits: this.stats.hits,
+      misses: this.stats.misses,
+      evictions: this.stats.evictions,
+      hitRate: lookups > 0 ? this.stats.hits / lookups : 0
     };
   }
 }
 
+// 32-bit FNV-1a over UTF-16 code units, as hex
+function fnv1a(text: string, seed: number): string {
+  let hash = seed;
+  for (let i = 0; i < text.length; i++) {
+    hash ^= text.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return (hash >>> 0).toString(16).padStart(8, '0');
+}
+
 // Rate limiter
 class RateLimiter {
   private requests = new Map<string, number[]>();
@@ -110,13 +158,11 @@ export class EnhancedAPIClient {
   private openrouterClient: OpenAI | null = null;
   private cache = new APICache();
   private rateLimiter = new RateLimiter();
-  private requestQueue: Array<() => Promise<void>> = [];
-  private processing = false;
   private listeners: Array<(config: APIConfig) => void> = [];
 
-  constructor() {
+  constructor(overrides: Partial<APIConfig> = {}) {
     // Load config from localStorage or use defaults
-    this.config = this.loadConfig();
+    this.config = { ...this.loadConfig(), ...overrides };
     this.initializeClients();
   }
 
@@ -215,38 +261,26 @@ export class EnhancedAPIClient {
   }
 
   private generateCacheKey(messages: any[], model: string, temperature: number): string {
-    const content = messages.map(m => m.content).join('|');
-    return `chat:${model}:${temperature}:${btoa(content).slice(0, 50)}`;
+    // Keyed on the whole conversation: the cache is shared by every tab on the server
+    const content = JSON.stringify(messages.map(m => [m.role, m.content]));
+    return `chat:${model}:${temperature}:${content.length}:${fnv1a(content, 0x811c9dc5)}${fnv1a(content, 0x01000193)}`;
   }
 
-  private async processQueue(): Promise<void> {
-    if (this.processing) return;
-    this.processing = true;
-
-    while (this.requestQueue.length > 0) {
-      const request = this.requestQueue.shift()!;
-      await request();
-      await new Promise(resolve => setTimeout(resolve, 100));
+  async createChatCompletion(params: ChatCompletionParams): Promise<any> {
+    // A browser tab's scheduler would never see server-side report traffic,
+    // so chat turns are scheduled on the server alongside it
+    if (typeof window !== 'undefined') {
+      return this.createChatCompletionOnServer(params);
     }
 
-    this.processing = false;
-  }
-
-  async createChatCompletion(params: {
-    model?: string;
-    messages: Array<{ role: 'system' | 'user' | 'assistant'; content: string }>;
-    temperature?: number;
-    max_tokens?: number;
-    useCache?: boolean;
-    retryWithFallback?: boolean;
-  }): Promise<any> {
     const {
       model,
       messages,
       temperature = 0.7,
       max_tokens = 800,
       useCache = true,
-      retryWithFallback = true
+      retryWithFallback = true,
+      priority = 'interactive'
     } = params;
 
     // Check cache first
@@ -265,7 +299,8 @@ export class EnhancedAPIClient {
         model: model || this.config.model,
         messages,
         temperature,
-        max_tokens
+        max_tokens,
+        priority
       });
 
       if (useCache) {
@@ -288,7 +323,8 @@ export class EnhancedAPIClient {
             model: fallbackModel,
             messages,
             temperature,
-            max_tokens
+            max_tokens,
+            priority
           });
 
           if (useCache) {
@@ -306,14 +342,39 @@ export class EnhancedAPIClient {
     }
   }
 
+  private async createChatCompletionOnServer(params: ChatCompletionParams): Promise<any> {
+    // The user's own keys, if configured, are passed per request and never persisted by the server
+    const headers: Record<string, string> = { 'Content-Type': 'application/json' };
+    if (this.config.openaiKey) headers['X-OpenAI-Key'] = this.config.openaiKey;
+    if (this.config.openrouterKey) headers['X-OpenRouter-Key'] = this.config.openrouterKey;
+
+    const response = await fetch(CHAT_API_PATH, {
+      method: 'POST',
+      headers,
+      body: JSON.stringify({
+        ...params,
+        model: params.model || this.config.model,
+        preferredProvider: this.config.preferredProvider,
+      }),
+    });
+    const body = await response.json().catch(() => ({}));
+    if (!response.ok) {
+      throw new Error(body.error || `Chat request failed with status ${response.status}`);
+    }
+
+    this.cache.recordRemote(Boolean(body.fromCache));
+    return body;
+  }
+
   private async makeRequest(params: {
     provider: 'openai' | 'openrouter';
     model: string;
     messages: Array<{ role: 'system' | 'user' | 'assistant'; content: string }>;
     temperature: number;
     max_tokens: number;
+    priority: LLMPriority;
   }): Promise<any> {
-    const { provider, model, messages, temperature, max_tokens } = params;
+    const { provider, model, messages, temperature, max_tokens, priority } = params;
     
     const client = provider === 'openai' ? this.openaiClient : this.openrouterClient;
     if (!client) {
@@ -326,38 +387,35 @@ export class EnhancedAPIClient {
       throw new Error('Rate limit exceeded. Please wait before making another request.');
     }
 
-    return new Promise((resolve, reject) => {
-      const request = async () => {
-        try {
-          this.rateLimiter.recordRequest(identifier);
-          
-          const completion = await client.chat.completions.create({
-            model,
-            messages,
-            temperature,
-            max_tokens,
-          });
-
-          const response = {
-            id: completion.id,
-            choices: completion.choices,
-            usage: completion.usage,
-            model: completion.model,
-            provider
-          };
-
-          resolve(response);
-        } catch (error) {
-          reject(error);
-        }
+    // The scheduler bounds concurrency, orders by priority and fails over to
+    // the provider's default model when the requested one is throttled
+    const defaultModel = provider === 'openrouter' ? OPENROUTER_MODEL : 'gpt-4o-mini';
+
+    return llmScheduler.run(priority, [model, defaultModel], async candidate => {
+      this.rateLimiter.recordRequest(identifier);
+
+      const completion = await trackLLMCall(provider, candidate, () =>
+        client.chat.completions.create({
+          model: candidate,
+          messages,
+          temperature,
+          max_tokens,
+        })
+      );
+
+      return {
+        id: completion.id,
+        choices: completion.choices,
+        usage: completion.usage,
+        model: completion.model,
+        provider
       };
-
-      this.requestQueue.push(request);
-      this.processQueue();
     });
   }
 
   private handleError(error: any): Error {
+    // Overload errors keep their type so routes can answer 503
+    if (error instanceof CircuitOpenError || error instanceof QueueTimeoutError) return error;
     if (error.status === 429) {
       return new Error('Rate limit exceeded. Please wait a moment before trying again.');
     } else if (error.status === 401) {
@@ -380,7 +438,11 @@ export class EnhancedAPIClient {
   }
 
   getQueueSize(): number {
-    return this.requestQueue.length;
+    return llmScheduler.getQueueSize();
+  }
+
+  getSchedulerStats() {
+    return llmScheduler.getStats();
   }
 
   // Health check for both providers
@@ -0,0 +1,430 @@
+/**
+ * Priority-aware scheduler for outbound LLM calls
+ *
+ * - Bounded concurrency with an adaptive limit (AIMD on 429s and latency);
+ *   429s back off the limit but never open a circuit
+ * - Strict priority between interactive chat, workflow agents and reports,
+ *   with slots reserved for interactive calls (LLM_INTERACTIVE_RESERVE)
+ * - Per-model circuit breaker with failover to the next candidate model
+ */
+
+import { metricsRegistry } from '@/lib/metrics';
+
+export type LLMPriority = 'interactive' | 'workflow' | 'report';
+
+const PRIORITY_ORDER: LLMPriority[] = ['interactive', 'workflow', 'report'];
+
+export interface LLMSchedulerConfig {
+  maxConcurrency: number;
+  minConcurrency: number;
+  // Latency above baseline * tolerance counts as congestion
+  latencyTolerance: number;
+  // Consecutive failures that open a model's circuit
+  failureThreshold: number;
+  // How long an open circuit rejects calls before a half-open probe
+  openDurationMs: number;
+  // Maximum time a call may wait in the queue before being rejected
+  queueTimeoutMs: number;
+  // Slots kept for interactive calls even when reports saturate the limit
+  interactiveReserve: number;
+  // Recent successes per priority and model that form the latency baseline
+  baselineWindow: number;
+}
+
+function envNumber(name: string, fallback: number): number {
+  const raw = typeof process !== 'undefined' ? process.env?.[name] : undefined;
+  const value = raw ? Number(raw) : NaN;
+  return Number.isFinite(value) && value > 0 ? value : fallback;
+}
+
+const DEFAULT_SCHEDULER_CONFIG: LLMSchedulerConfig = {
+  maxConcurrency: envNumber('LLM_MAX_CONCURRENCY', 8),
+  minConcurrency: 1,
+  latencyTolerance: 2.5,
+  failureThreshold: envNumber('LLM_BREAKER_FAILURES', 3),
+  openDurationMs: envNumber('LLM_BREAKER_OPEN_MS', 30000),
+  queueTimeoutMs: envNumber('LLM_QUEUE_TIMEOUT_MS', 60000),
+  interactiveReserve: envNumber('LLM_INTERACTIVE_RESERVE', 1),
+  baselineWindow: 50,
+};
+
+export class CircuitOpenError extends Error {
+  constructor(readonly models: string[]) {
+    super(`All candidate models are unavailable (circuit open): ${models.join(', ')}`);
+    this.name = 'CircuitOpenError';
+  }
+}
+
+export class QueueTimeoutError extends Error {
+  constructor(readonly priority: LLMPriority, waitedMs: number) {
+    super(`LLM call (${priority}) waited ${Math.round(waitedMs)}ms in queue and was dropped`);
+    this.name = 'QueueTimeoutError';
+  }
+}
+
+// OpenAI SDK errors carry HTTP statuses; Genkit errors carry gRPC-style names
+export function isThrottle(error: any): boolean {
+  return error?.status === 429 ||
+    error?.status === 'RESOURCE_EXHAUSTED' ||
+    /\b429\b|rate limit/i.test(String(error?.message ?? ''));
+}
+
+// Errors that say the model/provider is unhealthy, as opposed to a bad request.
+// Throttles are not failures: the provider is up, and the adaptive limit backs off.
+function isUpstreamFailure(error: any): boolean {
+  if (['UNAVAILABLE', 'DEADLINE_EXCEEDED', 'INTERNAL'].includes(error?.status)) return true;
+  const status = Number(error?.status);
+  if (Number.isFinite(status)) return status >= 500 || status === 408;
+  return ['ETIMEDOUT', 'ECONNRESET', 'ECONNREFUSED', 'ENOTFOUND'].includes(error?.code);
+}
+
+type CircuitState = 'closed' | 'open' | 'half-open';
+
+class CircuitBreaker {
+  state: CircuitState = 'closed';
+  private failures = 0;
+  private openedAt = 0;
+  private probeInFlight = false;
+
+  constructor(private threshold: number, private openDurationMs: number) {}
+
+  /**
+   * Claims permission to call the model. In half-open exactly one caller gets
+   * the probe; it must settle it with onSuccess, onFailure, onNeutral or
+   * releaseProbe.
+   */
+  tryAcquire(now = Date.now()): boolean {
+    if (this.state === 'closed') return true;
+    if (this.state === 'open' && now - this.openedAt >= this.openDurationMs) {
+      this.state = 'half-open';
+    }
+    if (this.state !== 'half-open' || this.probeInFlight) return false;
+    this.probeInFlight = true;
+    return true;
+  }
+
+  /** Gives the probe back unused, e.g. when the call timed out in the queue */
+  releaseProbe(): void {
+    this.probeInFlight = false;
+  }
+
+  /** The provider answered but the call failed for its own reasons (bad request, schema) */
+  onNeutral(): void {
+    this.probeInFlight = false;
+    if (this.state === 'half-open') this.onSuccess();
+  }
+
+  onSuccess(): void {
+    this.failures = 0;
+    this.probeInFlight = false;
+    this.state = 'closed';
+  }
+
+  onFailure(): void {
+    this.failures++;
+    this.probeInFlight = false;
+    if (this.state === 'half-open' || this.failures >= this.threshold) {
+      this.state = 'open';
+      this.openedAt = Date.now();
+    }
+  }
+}
+
+/** Windowed minimum of recent latencies, so the baseline can rise again */
+class LatencyBaseline {
+  private samples: number[] = [];
+  private next = 0;
+
+  constructor(private size: number) {}
+
+  add(latencyMs: number): void {
+    if (this.samples.length < this.size) {
+      this.samples.push(latencyMs);
+    } else {
+      this.samples[this.next] = latencyMs;
+      this.next = (this.next + 1) % this.size;
+    }
+  }
+
+  // Too few samples to judge congestion yet
+  get warm(): boolean {
+    return this.samples.length >= Math.min(5, this.size);
+  }
+
+  get value(): number {
+    return this.samples.length ? Math.min(...this.samples) : 0;
+  }
+}
+
+interface QueuedCall {
+  priority: LLMPriority;
+  enqueuedAt: number;
+  start: () => void;
+  reject: (error: Error) => void;
+}
+
+const schedulerLimit = metricsRegistry.gauge(
+  'llm_scheduler_concurrency_limit',
+  'Current adaptive concurrency limit for outbound LLM calls.'
+);
+const schedulerActive = metricsRegistry.gauge(
+  'llm_scheduler_active',
+  'Outbound LLM calls currently holding a scheduler slot.'
+);
+const schedulerQueued = metricsRegistry.gauge(
+  'llm_scheduler_queued',
+  'Outbound LLM calls waiting for a scheduler slot, by priority.'
+);
+const schedulerWait = metricsRegistry.histogram(
+  'llm_scheduler_wait_seconds',
+  'Time outbound LLM calls spent queued before starting, by priority.'
+);
+const schedulerRejected = metricsRegistry.counter(
+  'llm_scheduler_rejected_total',
+  'Outbound LLM calls rejected by the scheduler, by priority and reason.'
+);
+const breakerState = metricsRegistry.gauge(
+  'llm_circuit_state',
+  'Circuit breaker state per model (0 closed, 1 half-open, 2 open).'
+);
+const failoverTotal = metricsRegistry.counter(
+  'llm_failover_total',
+  'Calls that failed over from one model to the next, by source model.'
+);
+
+export class LLMScheduler {
+  private config: LLMSchedulerConfig;
+  private limit: number;
+  private active = 0;
+  private activeByPriority: Record<LLMPriority, number> = { interactive: 0, workflow: 0, report: 0 };
+  private queues: Record<LLMPriority, QueuedCall[]> = { interactive: [], workflow: [], report: [] };
+  private breakers = new Map<string, CircuitBreaker>();
+  // Reports are routinely slower than chat turns, so each class is judged against itself
+  private baselines = new Map<string, LatencyBaseline>();
+  private successesSinceIncrease = 0;
+  // Calls already in flight at a decrease saw the old limit; their signals are not new
+  private lastDecreaseAt = -Infinity;
+
+  constructor(config: Partial<LLMSchedulerConfig> = {}) {
+    this.config = { ...DEFAULT_SCHEDULER_CONFIG, ...config };
+    this.limit = this.config.maxConcurrency;
+    schedulerLimit.set(this.limit);
+  }
+
+  /**
+   * Runs `call` for the first candidate model whose circuit is closed, failing
+   * over to the next model when the provider throttles or errors.
+   */
+  async run<T>(priority: LLMPriority, models: string[], call: (model: string) => Promise<T>): Promise<T> {
+    const candidates = models.filter((model, index) => model && models.indexOf(model) === index);
+    let lastError: unknown = null;
+
+    for (let i = 0; i < candidates.length; i++) {
+      const model = candidates[i];
+      const breaker = this.getBreaker(model);
+      if (!breaker.tryAcquire()) continue;
+
+      try {
+        return await this.runWithSlot(priority, model, breaker, () => call(model));
+      } catch (error) {
+        lastError = error;
+        if (error instanceof QueueTimeoutError || !(isThrottle(error) || isUpstreamFailure(error))) throw error;
+        if (i < candidates.length - 1) failoverTotal.inc({ model });
+      }
+    }
+
+    if (lastError) throw lastError;
+    schedulerRejected.inc({ priority, reason: 'circuit_open' });
+    throw new CircuitOpenError(candidates);
+  }
+
+  getStats() {
+    return {
+      limit: this.limit,
+      active: this.active,
+      queued: PRIORITY_ORDER.reduce((acc, p) => ({ ...acc, [p]: this.queues[p].length }), {} as Record<LLMPriority, number>),
+      activeByPriority: { ...this.activeByPriority },
+      baselineLatencyMs: Object.fromEntries(
+        Array.from(this.baselines.entries()).map(([key, b]) => [key, Math.round(b.value)])
+      ),
+      circuits: Object.fromEntries(Array.from(this.breakers.entries()).map(([model, b]) => [model, b.state])),
+    };
+  }
+
+  getQueueSize(): number {
+    return PRIORITY_ORDER.reduce((sum, p) => sum + this.queues[p].length, 0);
+  }
+
+  private async runWithSlot<T>(
+    priority: LLMPriority,
+    model: string,
+    breaker: CircuitBreaker,
+    call: () => Promise<T>
+  ): Promise<T> {
+    try {
+      await this.acquire(priority);
+    } catch (error) {
+      breaker.releaseProbe();
+      throw error;
+    }
+    this.updateBreakerMetric(model, breaker);
+    const started = performance.now();
+
+    // Every path settles the breaker, so a half-open probe can never stay claimed
+    try {
+      const result = await call();
+      breaker.onSuccess();
+      this.onCallSucceeded(priority, model, started);
+      return result;
+    } catch (error) {
+      if (isUpstreamFailure(error)) {
+        breaker.onFailure();
+      } else {
+        breaker.onNeutral();
+      }
+      if (isThrottle(error)) this.decreaseLimit(started);
+      throw error;
+    } finally {
+      this.updateBreakerMetric(model, breaker);
+      this.release(priority);
+    }
+  }
+
+  /**
+   * Interactive calls may always use their reserved slots, even above the
+   * limit; other classes leave the reserve free.
+   */
+  private canStart(priority: LLMPriority): boolean {
+    const reserve = this.config.interactiveReserve;
+    if (priority === 'interactive') {
+      return this.active < this.limit || this.activeByPriority.interactive < reserve;
+    }
+    const background = this.active - this.activeByPriority.interactive;
+    return this.active < this.limit && background < Math.max(1, this.limit - reserve);
+  }
+
+  private startSlot(priority: LLMPriority): void {
+    this.active++;
+    this.activeByPriority[priority]++;
+    schedulerActive.set(this.active);
+  }
+
+  private acquire(priority: LLMPriority): Promise<void> {
+    const rank = PRIORITY_ORDER.indexOf(priority);
+    const aheadInQueue = PRIORITY_ORDER.slice(0, rank + 1).some(p => this.queues[p].length > 0);
+    if (!aheadInQueue && this.canStart(priority)) {
+      this.startSlot(priority);
+      schedulerWait.observe(0, { priority });
+      return Promise.resolve();
+    }
+
+    return new Promise((resolve, reject) => {
+      const entry: QueuedCall = {
+        priority,
+        enqueuedAt: performance.now(),
+        start: () => {
+          clearTimeout(timer);
+          schedulerWait.observe((performance.now() - entry.enqueuedAt) / 1000, { priority });
+          resolve();
+        },
+        reject,
+      };
+      const timer = setTimeout(() => {
+        const queue = this.queues[priority];
+        const index = queue.indexOf(entry);
+        if (index === -1) return;
+        queue.splice(index, 1);
+        this.updateQueueMetrics();
+        schedulerRejected.inc({ priority, reason: 'queue_timeout' });
+        reject(new QueueTimeoutError(priority, performance.now() - entry.enqueuedAt));
+      }, this.config.queueTimeoutMs);
+
+      this.queues[priority].push(entry);
+      this.updateQueueMetrics();
+    });
+  }
+
+  private release(priority: LLMPriority): void {
+    this.active--;
+    this.activeByPriority[priority]--;
+    this.drain();
+  }
+
+  private drain(): void {
+    let started = true;
+    while (started) {
+      started = false;
+      for (const priority of PRIORITY_ORDER) {
+        if (this.queues[priority].length > 0 && this.canStart(priority)) {
+          this.queues[priority].shift()!.start();
+          this.startSlot(priority);
+          started = true;
+          break;
+        }
+      }
+    }
+    schedulerActive.set(this.active);
+    this.updateQueueMetrics();
+  }
+
+  private onCallSucceeded(priority: LLMPriority, model: string, started: number): void {
+    const latencyMs = performance.now() - started;
+    const key = `${priority}:${model}`;
+    let baseline = this.baselines.get(key);
+    if (!baseline) {
+      baseline = new LatencyBaseline(this.config.baselineWindow);
+      this.baselines.set(key, baseline);
+    }
+
+    const congested = baseline.warm && latencyMs > baseline.value * this.config.latencyTolerance;
+    baseline.add(latencyMs);
+    if (congested) {
+      this.decreaseLimit(started, 0.9);
+      return;
+    }
+
+    // Additive increase: one extra slot per `limit` healthy completions
+    this.successesSinceIncrease++;
+    if (this.successesSinceIncrease >= this.limit && this.limit < this.config.maxConcurrency) {
+      this.successesSinceIncrease = 0;
+      this.setLimit(this.limit + 1);
+    }
+  }
+
+  /** Multiplicative decrease, at most once per round of calls started before it */
+  private decreaseLimit(callStartedAt: number, factor = 0.5): void {
+    if (callStartedAt < this.lastDecreaseAt) return;
+    this.lastDecreaseAt = performance.now();
+    this.successesSinceIncrease = 0;
+    this.setLimit(Math.max(this.config.minConcurrency, Math.floor(this.limit * factor)));
+  }
+
+  private setLimit(limit: number): void {
+    this.limit = limit;
+    schedulerLimit.set(limit);
+    this.drain();
+  }
+
+  private getBreaker(model: string): CircuitBreaker {
+    let breaker = this.breakers.get(model);
+    if (!breaker) {
+      breaker = new CircuitBreaker(this.config.failureThreshold, this.config.openDurationMs);
+      this.breakers.set(model, breaker);
+    }
+    return breaker;
+  }
+
+  private updateBreakerMetric(model: string, breaker: CircuitBreaker): void {
+    breakerState.set({ closed: 0, 'half-open': 1, open: 2 }[breaker.state], { model });
+  }
+
+  private updateQueueMetrics(): void {
+    PRIORITY_ORDER.forEach(p => schedulerQueued.set(this.queues[p].length, { priority: p }));
+  }
+}
+
+const globalForScheduler = globalThis as typeof globalThis & { __biLLMScheduler?: LLMScheduler };
+
+// Shared by server flows; the browser gets its own instance per tab
+export const llmScheduler = globalForScheduler.__biLLMScheduler ?? new LLMScheduler();
+globalForScheduler.__biLLMScheduler = llmScheduler;
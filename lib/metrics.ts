@@ -0,0 +1,288 @@
+/**
+ * In-process metrics registry with Prometheus text exposition
+ *
+ * Counters, gauges and histograms are kept per label set and rendered by
+ * /api/metrics. The registry lives on globalThis so route modules, flows and
+ * the API client share one instance even when Next.js loads them separately.
+ */
+
+type Labels = Record<string, string>;
+
+// Default latency buckets in seconds, tuned for LLM-backed routes
+const DEFAULT_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60];
+
+function labelKey(labels: Labels): string {
+  return Object.keys(labels)
+    .sort()
+    .map(name => `${name}=${labels[name]}`)
+    .join(',');
+}
+
+function escapeLabelValue(value: string): string {
+  return value.replace(/\\/g, '\\\\').replace(/\n/g, '\\n').replace(/"/g, '\\"');
+}
+
+function formatLabels(labels: Labels, extra?: Labels): string {
+  const merged = { ...labels, ...extra };
+  const names = Object.keys(merged);
+  if (names.length === 0) return '';
+  return `{${names.map(name => `${name}="${escapeLabelValue(merged[name])}"`).join(',')}}`;
+}
+
+function formatValue(value: number): string {
+  if (value === Infinity) return '+Inf';
+  if (value === -Infinity) return '-Inf';
+  return Number.isFinite(value) ? String(value) : 'NaN';
+}
+
+abstract class Metric {
+  constructor(
+    readonly name: string,
+    readonly help: string,
+    readonly type: 'counter' | 'gauge' | 'histogram'
+  ) {}
+
+  abstract render(): string[];
+
+  protected header(): string[] {
+    return [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} ${this.type}`];
+  }
+}
+
+export class Counter extends Metric {
+  private values = new Map<string, { labels: Labels; value: number }>();
+
+  constructor(name: string, help: string) {
+    super(name, help, 'counter');
+  }
+
+  inc(labels: Labels = {}, amount = 1): void {
+    const key = labelKey(labels);
+    const entry = this.values.get(key);
+    if (entry) {
+      entry.value += amount;
+    } else {
+      this.values.set(key, { labels: { ...labels }, value: amount });
+    }
+  }
+
+  get(labels: Labels = {}): number {
+    return this.values.get(labelKey(labels))?.value ?? 0;
+  }
+
+  render(): string[] {
+    const lines = this.header();
+    this.values.forEach(({ labels, value }) => {
+      lines.push(`${this.name}${formatLabels(labels)} ${formatValue(value)}`);
+    });
+    return lines;
+  }
+}
+
+export class Gauge extends Metric {
+  private values = new Map<string, { labels: Labels; value: number }>();
+
+  constructor(name: string, help: string) {
+    super(name, help, 'gauge');
+  }
+
+  set(value: number, labels: Labels = {}): void {
+    this.values.set(labelKey(labels), { labels: { ...labels }, value });
+  }
+
+  inc(labels: Labels = {}, amount = 1): void {
+    this.set(this.get(labels) + amount, labels);
+  }
+
+  dec(labels: Labels = {}, amount = 1): void {
+    this.set(this.get(labels) - amount, labels);
+  }
+
+  get(labels: Labels = {}): number {
+    return this.values.get(labelKey(labels))?.value ?? 0;
+  }
+
+  render(): string[] {
+    const lines = this.header();
+    this.values.forEach(({ labels, value }) => {
+      lines.push(`${this.name}${formatLabels(labels)} ${formatValue(value)}`);
+    });
+    return lines;
+  }
+}
+
+interface HistogramSeries {
+  labels: Labels;
+  buckets: number[];
+  sum: number;
+  count: number;
+}
+
+export class Histogram extends Metric {
+  private series = new Map<string, HistogramSeries>();
+
+  constructor(name: string, help: string, private bounds: number[] = DEFAULT_BUCKETS) {
+    super(name, help, 'histogram');
+  }
+
+  observe(value: number, labels: Labels = {}): void {
+    const key = labelKey(labels);
+    let entry = this.series.get(key);
+    if (!entry) {
+      entry = { labels: { ...labels }, buckets: new Array(this.bounds.length).fill(0), sum: 0, count: 0 };
+      this.series.set(key, entry);
+    }
+
+    for (let i = 0; i < this.bounds.length; i++) {
+      if (value <= this.bounds[i]) entry.buckets[i]++;
+    }
+    entry.sum += value;
+    entry.count++;
+  }
+
+  /** Starts a timer; calling the returned function records the elapsed seconds. */
+  startTimer(labels: Labels = {}): (extraLabels?: Labels) => number {
+    const start = performance.now();
+    return (extraLabels?: Labels) => {
+      const seconds = (performance.now() - start) / 1000;
+      this.observe(seconds, { ...labels, ...extraLabels });
+      return seconds;
+    };
+  }
+
+  render(): string[] {
+    const lines = this.header();
+    this.series.forEach(({ labels, buckets, sum, count }) => {
+      this.bounds.forEach((bound, i) => {
+        lines.push(`${this.name}_bucket${formatLabels(labels, { le: formatValue(bound) })} ${buckets[i]}`);
+      });
+      lines.push(`${this.name}_bucket${formatLabels(labels, { le: '+Inf' })} ${count}`);
+      lines.push(`${this.name}_sum${formatLabels(labels)} ${formatValue(sum)}`);
+      lines.push(`${this.name}_count${formatLabels(labels)} ${count}`);
+    });
+    return lines;
+  }
+}
+
+class MetricsRegistry {
+  private metrics = new Map<string, Metric>();
+  private collectors: Array<() => void> = [];
+
+  counter(name: string, help: string): Counter {
+    return this.getOrCreate(name, () => new Counter(name, help));
+  }
+
+  gauge(name: string, help: string): Gauge {
+    return this.getOrCreate(name, () => new Gauge(name, help));
+  }
+
+  histogram(name: string, help: string, buckets?: number[]): Histogram {
+    return this.getOrCreate(name, () => new Histogram(name, help, buckets));
+  }
+
+  /** Registers a callback run right before each scrape, e.g. to sample memory. */
+  addCollector(collect: () => void): void {
+    this.collectors.push(collect);
+  }
+
+  render(): string {
+    this.collectors.forEach(collect => {
+      try {
+        collect();
+      } catch (error) {
+        console.warn('Metrics collector failed:', error);
+      }
+    });
+
+    const lines: string[] = [];
+    this.metrics.forEach(metric => lines.push(...metric.render()));
+    return lines.join('\n') + '\n';
+  }
+
+  private getOrCreate<T extends Metric>(name: string, create: () => T): T {
+    const existing = this.metrics.get(name);
+    if (existing) return existing as T;
+    const metric = create();
+    this.metrics.set(name, metric);
+    return metric;
+  }
+}
+
+const globalForMetrics = globalThis as typeof globalThis & { __biMetricsRegistry?: MetricsRegistry };
+
+export const metricsRegistry = globalForMetrics.__biMetricsRegistry ?? new MetricsRegistry();
+globalForMetrics.__biMetricsRegistry = metricsRegistry;
+
+// Shared metric definitions
+export const httpRequestsTotal = metricsRegistry.counter(
+  'http_requests_total',
+  'Total HTTP requests handled, by route, method and status code.'
+);
+export const httpRequestDuration = metricsRegistry.histogram(
+  'http_request_duration_seconds',
+  'HTTP request latency in seconds, by route, method and status code.'
+);
+export const llmInFlight = metricsRegistry.gauge(
+  'llm_requests_in_flight',
+  'Outbound LLM calls currently awaiting a provider response.'
+);
+export const llmRequestDuration = metricsRegistry.histogram(
+  'llm_upstream_duration_seconds',
+  'Upstream LLM provider latency in seconds, by provider, model and outcome.'
+);
+export const llmErrorsTotal = metricsRegistry.counter(
+  'llm_upstream_errors_total',
+  'Upstream LLM provider errors, by provider, model and status.'
+);
+export const apiCacheEvents = metricsRegistry.counter(
+  'api_cache_events_total',
+  'Server-side chat response cache (/api/chat) lookups and evictions, by event (hit, miss, expired, eviction).'
+);
+
+/**
+ * Wraps a Next.js route handler so every call is counted and timed.
+ */
+export function withRouteMetrics<Args extends [Request, ...any[]]>(
+  route: string,
+  handler: (...args: Args) => Promise<Response>
+): (...args: Args) => Promise<Response> {
+  return async (...args: Args) => {
+    const method = args[0]?.method ?? 'GET';
+    const stopTimer = httpRequestDuration.startTimer({ route, method });
+    let status = '500';
+
+    try {
+      const response = await handler(...args);
+      status = String(response.status);
+      return response;
+    } finally {
+      stopTimer({ status });
+      httpRequestsTotal.inc({ route, method, status });
+    }
+  };
+}
+
+/**
+ * Tracks one outbound LLM call: in-flight gauge, latency histogram and error counter.
+ */
+export async function trackLLMCall<T>(
+  provider: string,
+  model: string,
+  call: () => Promise<T>
+): Promise<T> {
+  const labels = { provider, model };
+  const stopTimer = llmRequestDuration.startTimer(labels);
+  llmInFlight.inc();
+
+  try {
+    const result = await call();
+    stopTimer({ outcome: 'success' });
+    return result;
+  } catch (error: any) {
+    stopTimer({ outcome: 'error' });
+    llmErrorsTotal.inc({ ...labels, status: String(error?.status ?? error?.code ?? 'unknown') });
+    throw error;
+  } finally {
+    llmInFlight.dec();
+  }
+}
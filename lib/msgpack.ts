@@ -0,0 +1,246 @@
+/**
+ * Minimal MessagePack codec for API payloads
+ *
+ * Covers the JSON data model plus binary: nil, booleans, integers, float64,
+ * strings, bin, arrays and maps. Extension types are rejected. Values are
+ * encoded the way JSON.stringify would see them (toJSON is honoured, undefined
+ * object members are skipped).
+ */
+
+const textEncoder = new TextEncoder();
+const textDecoder = new TextDecoder();
+
+class Writer {
+  private buffer = new Uint8Array(1024);
+  private view = new DataView(this.buffer.buffer);
+  length = 0;
+
+  private ensure(extra: number): void {
+    if (this.length + extra <= this.buffer.length) return;
+    let size = this.buffer.length * 2;
+    while (size < this.length + extra) size *= 2;
+    const next = new Uint8Array(size);
+    next.set(this.buffer.subarray(0, this.length));
+    this.buffer = next;
+    this.view = new DataView(next.buffer);
+  }
+
+  u8(value: number): void {
+    this.ensure(1);
+    this.buffer[this.length++] = value;
+  }
+
+  u16(value: number): void {
+    this.ensure(2);
+    this.view.setUint16(this.length, value);
+    this.length += 2;
+  }
+
+  u32(value: number): void {
+    this.ensure(4);
+    this.view.setUint32(this.length, value);
+    this.length += 4;
+  }
+
+  f64(value: number): void {
+    this.ensure(8);
+    this.view.setFloat64(this.length, value);
+    this.length += 8;
+  }
+
+  bytes(bytes: Uint8Array): void {
+    this.ensure(bytes.length);
+    this.buffer.set(bytes, this.length);
+    this.length += bytes.length;
+  }
+
+  result(): Uint8Array {
+    return this.buffer.slice(0, this.length);
+  }
+}
+
+function writeHeader(writer: Writer, size: number, fix: number | null, fixLimit: number, codes: [number, number, number]): void {
+  if (fix !== null && size < fixLimit) {
+    writer.u8(fix | size);
+  } else if (size <= 0xff && codes[0] !== 0) {
+    writer.u8(codes[0]);
+    writer.u8(size);
+  } else if (size <= 0xffff) {
+    writer.u8(codes[1]);
+    writer.u16(size);
+  } else {
+    writer.u8(codes[2]);
+    writer.u32(size);
+  }
+}
+
+function encodeNumber(writer: Writer, value: number): void {
+  if (!Number.isInteger(value) || Math.abs(value) > 0xffffffff) {
+    // Non-finite numbers become null, as in JSON
+    if (!Number.isFinite(value)) return writer.u8(0xc0);
+    writer.u8(0xcb);
+    return writer.f64(value);
+  }
+
+  if (value >= 0) {
+    if (value < 0x80) return writer.u8(value);
+    if (value <= 0xff) { writer.u8(0xcc); return writer.u8(value); }
+    if (value <= 0xffff) { writer.u8(0xcd); return writer.u16(value); }
+    writer.u8(0xce);
+    return writer.u32(value);
+  }
+
+  if (value >= -32) return writer.u8(value & 0xff);
+  if (value >= -0x80) { writer.u8(0xd0); return writer.u8(value & 0xff); }
+  if (value >= -0x8000) { writer.u8(0xd1); return writer.u16(value & 0xffff); }
+  if (value >= -0x80000000) { writer.u8(0xd2); return writer.u32(value >>> 0); }
+  writer.u8(0xcb);
+  writer.f64(value);
+}
+
+function encodeValue(writer: Writer, value: unknown, depth: number): void {
+  if (depth > 512) throw new Error('MessagePack encode: maximum nesting depth exceeded');
+
+  if (value !== null && typeof value === 'object' && typeof (value as any).toJSON === 'function') {
+    value = (value as any).toJSON();
+  }
+
+  if (value === null || value === undefined || typeof value === 'function' || typeof value === 'symbol') {
+    writer.u8(0xc0);
+  } else if (typeof value === 'boolean') {
+    writer.u8(value ? 0xc3 : 0xc2);
+  } else if (typeof value === 'number') {
+    encodeNumber(writer, value);
+  } else if (typeof value === 'bigint') {
+    encodeNumber(writer, Number(value));
+  } else if (typeof value === 'string') {
+    const bytes = textEncoder.encode(value);
+    writeHeader(writer, bytes.length, 0xa0, 32, [0xd9, 0xda, 0xdb]);
+    writer.bytes(bytes);
+  } else if (value instanceof Uint8Array) {
+    writeHeader(writer, value.length, null, 0, [0xc4, 0xc5, 0xc6]);
+    writer.bytes(value);
+  } else if (Array.isArray(value)) {
+    writeHeader(writer, value.length, 0x90, 16, [0, 0xdc, 0xdd]);
+    for (const item of value) encodeValue(writer, item, depth + 1);
+  } else {
+    const entries = Object.entries(value as Record<string, unknown>).filter(
+      ([, v]) => v !== undefined && typeof v !== 'function' && typeof v !== 'symbol'
+    );
+    writeHeader(writer, entries.length, 0x80, 16, [0, 0xde, 0xdf]);
+    for (const [key, item] of entries) {
+      encodeValue(writer, key, depth + 1);
+      encodeValue(writer, item, depth + 1);
+    }
+  }
+}
+
+export function encodeMsgpack(value: unknown): Uint8Array {
+  const writer = new Writer();
+  encodeValue(writer, value, 0);
+  return writer.result();
+}
+
+class Reader {
+  private view: DataView;
+  offset = 0;
+
+  constructor(private bytes: Uint8Array) {
+    this.view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+  }
+
+  private need(size: number): number {
+    if (this.offset + size > this.bytes.length) throw new Error('MessagePack decode: unexpected end of input');
+    const start = this.offset;
+    this.offset += size;
+    return start;
+  }
+
+  u8(): number { return this.view.getUint8(this.need(1)); }
+  u16(): number { return this.view.getUint16(this.need(2)); }
+  u32(): number { return this.view.getUint32(this.need(4)); }
+  i8(): number { return this.view.getInt8(this.need(1)); }
+  i16(): number { return this.view.getInt16(this.need(2)); }
+  i32(): number { return this.view.getInt32(this.need(4)); }
+  u64(): number { return Number(this.view.getBigUint64(this.need(8))); }
+  i64(): number { return Number(this.view.getBigInt64(this.need(8))); }
+  f32(): number { return this.view.getFloat32(this.need(4)); }
+  f64(): number { return this.view.getFloat64(this.need(8)); }
+
+  str(size: number): string {
+    const start = this.need(size);
+    return textDecoder.decode(this.bytes.subarray(start, start + size));
+  }
+
+  bin(size: number): Uint8Array {
+    const start = this.need(size);
+    return this.bytes.slice(start, start + size);
+  }
+
+  get done(): boolean {
+    return this.offset >= this.bytes.length;
+  }
+}
+
+function decodeValue(reader: Reader, depth: number): unknown {
+  if (depth > 512) throw new Error('MessagePack decode: maximum nesting depth exceeded');
+  const code = reader.u8();
+
+  if (code <= 0x7f) return code;
+  if (code >= 0xe0) return code - 0x100;
+  if ((code & 0xe0) === 0xa0) return reader.str(code & 0x1f);
+  if ((code & 0xf0) === 0x90) return decodeArray(reader, code & 0x0f, depth);
+  if ((code & 0xf0) === 0x80) return decodeMap(reader, code & 0x0f, depth);
+
+  switch (code) {
+    case 0xc0: return null;
+    case 0xc2: return false;
+    case 0xc3: return true;
+    case 0xc4: return reader.bin(reader.u8());
+    case 0xc5: return reader.bin(reader.u16());
+    case 0xc6: return reader.bin(reader.u32());
+    case 0xca: return reader.f32();
+    case 0xcb: return reader.f64();
+    case 0xcc: return reader.u8();
+    case 0xcd: return reader.u16();
+    case 0xce: return reader.u32();
+    case 0xcf: return reader.u64();
+    case 0xd0: return reader.i8();
+    case 0xd1: return reader.i16();
+    case 0xd2: return reader.i32();
+    case 0xd3: return reader.i64();
+    case 0xd9: return reader.str(reader.u8());
+    case 0xda: return reader.str(reader.u16());
+    case 0xdb: return reader.str(reader.u32());
+    case 0xdc: return decodeArray(reader, reader.u16(), depth);
+    case 0xdd: return decodeArray(reader, reader.u32(), depth);
+    case 0xde: return decodeMap(reader, reader.u16(), depth);
+    case 0xdf: return decodeMap(reader, reader.u32(), depth);
+    default:
+      throw new Error(`MessagePack decode: unsupported type 0x${code.toString(16)}`);
+  }
+}
+
+function decodeArray(reader: Reader, size: number, depth: number): unknown[] {
+  const result = new Array(size);
+  for (let i = 0; i < size; i++) result[i] = decodeValue(reader, depth + 1);
+  return result;
+}
+
+function decodeMap(reader: Reader, size: number, depth: number): Record<string, unknown> {
+  const result: Record<string, unknown> = {};
+  for (let i = 0; i < size; i++) {
+    const key = String(decodeValue(reader, depth + 1));
+    const value = decodeValue(reader, depth + 1);
+    // Plain assignment would let "__proto__" keys rewrite the prototype
+    Object.defineProperty(result, key, { value, enumerable: true, writable: true, configurable: true });
+  }
+  return result;
+}
+
+export function decodeMsgpack(bytes: Uint8Array): unknown {
+  const reader = new Reader(bytes);
+  const value = decodeValue(reader, 0);
+  if (!reader.done) throw new Error('MessagePack decode: trailing bytes after value');
+  return value;
+}
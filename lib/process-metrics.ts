@@ -0,0 +1,74 @@
+/**
+ * Node-only process collectors for the metrics registry
+ *
+ * Kept apart from lib/metrics.ts so client bundles that record metrics never
+ * pull in perf_hooks.
+ */
+
+import { monitorEventLoopDelay, PerformanceObserver, constants } from 'node:perf_hooks';
+import { metricsRegistry } from '@/lib/metrics';
+
+const globalForProcessMetrics = globalThis as typeof globalThis & { __biProcessMetricsStarted?: boolean };
+
+/**
+ * Starts Node-only collectors: event-loop lag, GC pauses, memory and uptime.
+ * Safe to call repeatedly; only the first call installs the observers.
+ */
+export function startProcessMetrics(): void {
+  if (globalForProcessMetrics.__biProcessMetricsStarted) return;
+  globalForProcessMetrics.__biProcessMetricsStarted = true;
+
+  const eventLoopLag = metricsRegistry.gauge(
+    'nodejs_eventloop_lag_seconds',
+    'Event-loop delay since the previous scrape, by quantile.'
+  );
+  const eventLoopLagMax = metricsRegistry.gauge(
+    'nodejs_eventloop_lag_max_seconds',
+    'Maximum event-loop delay since the previous scrape.'
+  );
+  const gcDuration = metricsRegistry.histogram(
+    'nodejs_gc_duration_seconds',
+    'Garbage collection pause duration in seconds, by kind.',
+    [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1]
+  );
+  const heapUsed = metricsRegistry.gauge('nodejs_heap_used_bytes', 'V8 heap used in bytes.');
+  const heapTotal = metricsRegistry.gauge('nodejs_heap_total_bytes', 'V8 heap total in bytes.');
+  const residentMemory = metricsRegistry.gauge('process_resident_memory_bytes', 'Resident set size in bytes.');
+  const uptime = metricsRegistry.gauge('process_uptime_seconds', 'Process uptime in seconds.');
+
+  const histogram = monitorEventLoopDelay({ resolution: 10 });
+  histogram.enable();
+
+  const gcKinds: Record<number, string> = {
+    [constants.NODE_PERFORMANCE_GC_MAJOR]: 'major',
+    [constants.NODE_PERFORMANCE_GC_MINOR]: 'minor',
+    [constants.NODE_PERFORMANCE_GC_INCREMENTAL]: 'incremental',
+    [constants.NODE_PERFORMANCE_GC_WEAKCB]: 'weakcb',
+  };
+
+  try {
+    const observer = new PerformanceObserver(list => {
+      list.getEntries().forEach(entry => {
+        const kind = (entry as any).detail?.kind ?? (entry as any).kind;
+        gcDuration.observe(entry.duration / 1000, { kind: gcKinds[kind] ?? 'unknown' });
+      });
+    });
+    observer.observe({ entryTypes: ['gc'] });
+  } catch (error) {
+    console.warn('GC metrics unavailable:', error);
+  }
+
+  metricsRegistry.addCollector(() => {
+    // perf_hooks reports nanoseconds; reset so each scrape covers one interval
+    eventLoopLag.set(histogram.percentile(50) / 1e9, { quantile: '0.5' });
+    eventLoopLag.set(histogram.percentile(99) / 1e9, { quantile: '0.99' });
+    eventLoopLagMax.set(histogram.max / 1e9);
+    histogram.reset();
+
+    const memory = process.memoryUsage();
+    heapUsed.set(memory.heapUsed);
+    heapTotal.set(memory.heapTotal);
+    residentMemory.set(memory.rss);
+    uptime.set(process.uptime());
+  });
+}
@@ -0,0 +1,23 @@
+/**
+ * Normalizes report request bodies into the generateReport flow input
+ */
+
+import type { GenerateReportInput } from '@/ai/flows/schemas/chatbot-generate-report-schema';
+
+/**
+ * Fields may be JSON strings (legacy clients) or structured values. Strings are
+ * passed to the prompt untouched; structured values are serialized exactly once.
+ */
+function promptField(value: unknown): string | null {
+  if (typeof value === 'string') return value;
+  if (value !== null && typeof value === 'object') return JSON.stringify(value);
+  return null;
+}
+
+export function toReportInput(body: unknown): GenerateReportInput | null {
+  const { conversationHistory, analysisContext } = (body ?? {}) as Record<string, unknown>;
+  const history = promptField(conversationHistory);
+  const context = promptField(analysisContext);
+  if (history === null || context === null) return null;
+  return { conversationHistory: history, analysisContext: context };
+}
@@ -0,0 +1,484 @@
+/**
+ * Durable file-backed queue for asynchronous report jobs (Node runtime)
+ *
+ * Each job is a JSON file that moves between state directories with atomic
+ * rename(), so any number of worker processes - on this host, or on other
+ * nodes sharing REPORT_QUEUE_DIR over a POSIX filesystem - can claim jobs
+ * without a broker:
+ *
+ *   pending/ -> running/ -> done/ | failed/
+ *
+ * Job ids are time-ordered, so pending/ sorts in submission order. Running
+ * jobs are leased: workers refresh the file's mtime while they work, and a job
+ * whose lease expires (the worker died) is returned to pending/ by the next
+ * reaper, up to maxAttempts.
+ *
+ * A claim renames the job to running/<id>.<token>.json with a fresh random
+ * token, so a worker whose job was reclaimed (and perhaps claimed again) can
+ * no longer heartbeat, complete or fail it. Every transition out of running/
+ * first renames the file into tmp/ (which also settles ownership), rewrites
+ * it there and then moves it to its new state with a single rename; a crash
+ * mid-way leaves a tmp/*.moving file that recoverStranded() finishes. Writes
+ * are fsynced, file and directory, before they are renamed into place.
+ *
+ * Finished jobs are kept for retentionMs and then deleted by pruneFinished(),
+ * which the worker's reaper runs.
+ */
+
+import { randomBytes } from 'node:crypto';
+import { mkdir, open, readFile, readdir, rename, stat, unlink, utimes } from 'node:fs/promises';
+import path from 'node:path';
+import type { GenerateReportInput, GenerateReportOutput } from '@/ai/flows/schemas/chatbot-generate-report-schema';
+import { metricsRegistry } from '@/lib/metrics';
+
+export type ReportJobStatus = 'queued' | 'running' | 'completed' | 'failed';
+
+export interface ReportJob {
+  id: string;
+  status: ReportJobStatus;
+  input: GenerateReportInput;
+  attempts: number;
+  createdAt: string;
+  startedAt?: string;
+  finishedAt?: string;
+  workerId?: string;
+  // Names this claim's running/ file; never sent to clients
+  claimToken?: string;
+  result?: GenerateReportOutput;
+  error?: string;
+}
+
+export interface ReportQueueConfig {
+  dir: string;
+  // A running job whose file is not refreshed within this window is reclaimed
+  leaseMs: number;
+  maxAttempts: number;
+  // Completed and failed jobs are deleted this long after they finish
+  retentionMs: number;
+}
+
+const STATE_DIRS: Record<ReportJobStatus, string> = {
+  queued: 'pending',
+  running: 'running',
+  completed: 'done',
+  failed: 'failed',
+};
+
+// Lookup order follows the forward path, so a job moving on is still found
+const LOOKUP_ORDER: ReportJobStatus[] = ['queued', 'running', 'completed', 'failed'];
+
+const JOB_ID = /^[0-9a-z]{10}-[0-9a-f]{12}$/;
+
+function envNumber(name: string, fallback: number): number {
+  const value = Number(process.env[name]);
+  return Number.isFinite(value) && value > 0 ? value : fallback;
+}
+
+const DEFAULT_QUEUE_CONFIG: ReportQueueConfig = {
+  dir: process.env.REPORT_QUEUE_DIR || path.join(process.cwd(), '.data', 'report-jobs'),
+  leaseMs: envNumber('REPORT_JOB_LEASE_MS', 120000),
+  maxAttempts: envNumber('REPORT_JOB_MAX_ATTEMPTS', 3),
+  retentionMs: envNumber('REPORT_JOB_RETENTION_MS', 24 * 60 * 60 * 1000),
+};
+
+// Depth counts older than this are refreshed before being reported
+const DEPTH_MAX_AGE_MS = 2000;
+
+let jobSequence = 0;
+
+function newJobId(): string {
+  // Fixed-width base36 timestamp plus a per-process sequence keeps lexical
+  // order equal to submission order; the random tail avoids cross-node clashes
+  const sequence = (jobSequence++ & 0xffff).toString(16).padStart(4, '0');
+  return `${Date.now().toString(36).padStart(10, '0')}-${sequence}${randomBytes(4).toString('hex')}`;
+}
+
+function isMissing(error: any): boolean {
+  return error?.code === 'ENOENT';
+}
+
+function idOf(name: string): string {
+  return name.slice(0, name.indexOf('.'));
+}
+
+/** Makes renames into `dir` durable; a no-op where directories cannot be fsynced */
+async function syncDir(dir: string): Promise<void> {
+  let handle;
+  try {
+    handle = await open(dir, 'r');
+    await handle.sync();
+  } catch (error: any) {
+    if (!['EISDIR', 'EPERM', 'EINVAL', 'EBADF'].includes(error?.code)) throw error;
+  } finally {
+    await handle?.close();
+  }
+}
+
+const jobEvents = metricsRegistry.counter(
+  'report_jobs_total',
+  'Report job lifecycle events (enqueued, claimed, completed, retried, failed, reclaimed, recovered, superseded, pruned).'
+);
+const jobWait = metricsRegistry.histogram(
+  'report_job_wait_seconds',
+  'Time report jobs spent queued before a worker claimed them.'
+);
+const jobRun = metricsRegistry.histogram(
+  'report_job_run_seconds',
+  'Time workers spent generating a report, by outcome.'
+);
+const queueDepth = metricsRegistry.gauge(
+  'report_queue_jobs',
+  'Report jobs currently in each queue state.'
+);
+
+/** Client-facing view of a job; the input is never echoed back */
+export function toJobStatus(job: ReportJob) {
+  const { input: _input, claimToken: _claimToken, ...status } = job;
+  return status;
+}
+
+export class FileReportQueue {
+  readonly config: ReportQueueConfig;
+  private ready: Promise<void> | null = null;
+  private depth: { counts: Record<ReportJobStatus, number>; at: number } | null = null;
+  private depthRefresh: Promise<Record<ReportJobStatus, number>> | null = null;
+
+  constructor(config: Partial<ReportQueueConfig> = {}) {
+    this.config = { ...DEFAULT_QUEUE_CONFIG, ...config };
+  }
+
+  async enqueue(input: GenerateReportInput): Promise<ReportJob> {
+    await this.ensureDirs();
+    const job: ReportJob = {
+      id: newJobId(),
+      status: 'queued',
+      input,
+      attempts: 0,
+      createdAt: new Date().toISOString(),
+    };
+    await this.write(this.jobPath('queued', job.id), job);
+    jobEvents.inc({ event: 'enqueued' });
+    return job;
+  }
+
+  async get(id: string): Promise<ReportJob | null> {
+    if (!JOB_ID.test(id)) return null;
+    await this.ensureDirs();
+
+    // Two passes cover a job that was reclaimed (moved backwards) mid-lookup
+    for (let pass = 0; pass < 2; pass++) {
+      for (const status of LOOKUP_ORDER) {
+        const file = status === 'running' ? await this.findFile('running', id) : this.jobPath(status, id);
+        const job = file && await this.read(file);
+        if (job) return { ...job, status };
+      }
+    }
+
+    // Between states: parked in tmp/ for a move
+    const moving = await this.findFile('tmp', id, '.moving');
+    return moving ? this.read(moving) : null;
+  }
+
+  /** Claims the oldest pending job for `workerId`, or returns null if none is available. */
+  async claim(workerId: string): Promise<ReportJob | null> {
+    await this.ensureDirs();
+    const names = (await readdir(this.stateDir('queued'))).filter(name => name.endsWith('.json')).sort();
+
+    for (const name of names) {
+      const from = path.join(this.stateDir('queued'), name);
+      const claimToken = randomBytes(6).toString('hex');
+      const to = this.runningPath(idOf(name), claimToken);
+      try {
+        // Touch first: rename keeps mtime, and an old mtime would look like an expired lease
+        const now = new Date();
+        await utimes(from, now, now);
+        await rename(from, to);
+      } catch (error) {
+        if (isMissing(error)) continue; // Another worker won this job
+        throw error;
+      }
+
+      const job = await this.read(to);
+      if (!job) continue;
+
+      const claimed: ReportJob = {
+        ...job,
+        status: 'running',
+        attempts: job.attempts + 1,
+        startedAt: new Date().toISOString(),
+        workerId,
+        claimToken,
+      };
+      await this.write(to, claimed);
+      jobEvents.inc({ event: 'claimed' });
+      jobWait.observe((Date.now() - Date.parse(job.createdAt)) / 1000);
+      return claimed;
+    }
+    return null;
+  }
+
+  /** Extends the lease on this claim; false means the job was reclaimed and may belong to another worker. */
+  async heartbeat(job: ReportJob): Promise<boolean> {
+    if (!job.claimToken) return false;
+    try {
+      const now = new Date();
+      await utimes(this.runningPath(job.id, job.claimToken), now, now);
+      return true;
+    } catch (error) {
+      if (isMissing(error)) return false;
+      throw error;
+    }
+  }
+
+  /** Stores the result; null means this claim was superseded and the result was dropped. */
+  async complete(job: ReportJob, result: GenerateReportOutput): Promise<ReportJob | null> {
+    const finished: ReportJob = {
+      ...job, status: 'completed', result, error: undefined, claimToken: undefined, finishedAt: new Date().toISOString(),
+    };
+    if (!await this.finish(job, finished)) return null;
+    jobEvents.inc({ event: 'completed' });
+    return finished;
+  }
+
+  /**
+   * Requeues retryable failures until maxAttempts, otherwise marks the job
+   * failed. Returns null if this claim was superseded.
+   */
+  async fail(job: ReportJob, error: unknown, retryable: boolean): Promise<ReportJob | null> {
+    const message = error instanceof Error ? error.message : String(error);
+    const retry = retryable && job.attempts < this.config.maxAttempts;
+    const next: ReportJob = retry
+      ? { ...job, status: 'queued', error: message, workerId: undefined, claimToken: undefined }
+      : { ...job, status: 'failed', error: message, claimToken: undefined, finishedAt: new Date().toISOString() };
+
+    if (!await this.finish(job, next)) return null;
+    jobEvents.inc({ event: retry ? 'retried' : 'failed' });
+    return next;
+  }
+
+  /** Returns jobs with expired leases to pending/ (or failed/ once out of attempts). */
+  async reclaimExpired(): Promise<number> {
+    await this.ensureDirs();
+    const runningDir = this.stateDir('running');
+    let reclaimed = 0;
+
+    for (const name of await readdir(runningDir)) {
+      if (!name.endsWith('.json')) continue;
+      const current = path.join(runningDir, name);
+      try {
+        if (Date.now() - (await stat(current)).mtimeMs < this.config.leaseMs) continue;
+        // Move aside first so concurrent reapers (and the late owner) cannot both act on the job
+        const moving = await this.moveAside(current, idOf(name), 'reap');
+        const job = await this.read(moving);
+        if (job) {
+          await this.settle(moving, this.expired(job));
+          jobEvents.inc({ event: 'reclaimed' });
+          reclaimed++;
+        }
+      } catch (error) {
+        if (!isMissing(error)) throw error;
+      }
+    }
+    return reclaimed;
+  }
+
+  /**
+   * Finishes moves interrupted by a crash and removes abandoned temp files.
+   * Only entries older than the lease are touched, so moves in flight in
+   * other processes are left alone. Call once when a worker starts.
+   */
+  async recoverStranded(): Promise<number> {
+    await this.ensureDirs();
+    const tmpDir = path.join(this.config.dir, 'tmp');
+    let recovered = 0;
+
+    for (const name of await readdir(tmpDir)) {
+      const file = path.join(tmpDir, name);
+      try {
+        if (Date.now() - (await stat(file)).mtimeMs < this.config.leaseMs) continue;
+        if (!name.endsWith('.moving')) {
+          await unlink(file);
+          continue;
+        }
+        const job = await this.read(file);
+        if (!job) continue;
+        // Still the running copy: the move stopped before its rewrite
+        await this.settle(file, job.status === 'running' ? this.expired(job) : job);
+        jobEvents.inc({ event: 'recovered' });
+        recovered++;
+      } catch (error) {
+        if (!isMissing(error)) throw error;
+      }
+    }
+    return recovered;
+  }
+
+  /** Deletes completed and failed jobs that finished more than retentionMs ago. */
+  async pruneFinished(): Promise<number> {
+    await this.ensureDirs();
+    const cutoff = Date.now() - this.config.retentionMs;
+    // Ids lead with their creation time, which never postdates the finish,
+    // so younger jobs are skipped without a stat
+    const cutoffId = cutoff.toString(36).padStart(10, '0');
+    let pruned = 0;
+
+    for (const status of ['completed', 'failed'] as const) {
+      const dir = this.stateDir(status);
+      for (const name of await readdir(dir)) {
+        if (!name.endsWith('.json') || name >= cutoffId) continue;
+        const file = path.join(dir, name);
+        try {
+          if ((await stat(file)).mtimeMs >= cutoff) continue;
+          await unlink(file);
+          pruned++;
+        } catch (error) {
+          if (!isMissing(error)) throw error;
+        }
+      }
+    }
+    if (pruned > 0) jobEvents.inc({ event: 'pruned' }, pruned);
+    return pruned;
+  }
+
+  /** Jobs per state, at most DEPTH_MAX_AGE_MS old */
+  async stats(): Promise<Record<ReportJobStatus, number>> {
+    if (this.depth && Date.now() - this.depth.at < DEPTH_MAX_AGE_MS) return { ...this.depth.counts };
+    return { ...await this.refreshDepth() };
+  }
+
+  /**
+   * Metrics collector hook. Collectors are synchronous, so the gauges carry
+   * the last counts and a stale sample is refreshed in the background.
+   */
+  sampleDepth(): void {
+    if (this.depth && Date.now() - this.depth.at < DEPTH_MAX_AGE_MS) return;
+    this.refreshDepth().catch(error => console.warn('Report queue depth refresh failed:', error));
+  }
+
+  /** Counts every state directory; concurrent callers share one pass */
+  private refreshDepth(): Promise<Record<ReportJobStatus, number>> {
+    if (!this.depthRefresh) {
+      this.depthRefresh = (async () => {
+        await this.ensureDirs();
+        const counts = {} as Record<ReportJobStatus, number>;
+        for (const status of LOOKUP_ORDER) {
+          counts[status] = (await readdir(this.stateDir(status))).filter(name => name.endsWith('.json')).length;
+          queueDepth.set(counts[status], { state: status });
+        }
+        this.depth = { counts, at: Date.now() };
+        return counts;
+      })().finally(() => {
+        this.depthRefresh = null;
+      });
+    }
+    return this.depthRefresh;
+  }
+
+  /** Moves this claim's job to `next`; false if the claim no longer owns it */
+  private async finish(previous: ReportJob, next: ReportJob): Promise<boolean> {
+    if (!previous.claimToken) return false;
+    let moving: string;
+    try {
+      moving = await this.moveAside(this.runningPath(previous.id, previous.claimToken), previous.id, 'finish');
+    } catch (error) {
+      if (!isMissing(error)) throw error;
+      jobEvents.inc({ event: 'superseded' });
+      return false;
+    }
+
+    await this.settle(moving, next);
+    if (previous.startedAt) {
+      jobRun.observe((Date.now() - Date.parse(previous.startedAt)) / 1000, { outcome: next.status });
+    }
+    return true;
+  }
+
+  private expired(job: ReportJob): ReportJob {
+    const exhausted = job.attempts >= this.config.maxAttempts;
+    return {
+      ...job,
+      status: exhausted ? 'failed' : 'queued',
+      error: `Worker ${job.workerId ?? 'unknown'} lease expired`,
+      claimToken: undefined,
+      ...(exhausted ? { finishedAt: new Date().toISOString() } : { workerId: undefined }),
+    };
+  }
+
+  /** Renames a job into tmp/ for a move; only one caller can win the rename */
+  private async moveAside(file: string, id: string, reason: string): Promise<string> {
+    const moving = path.join(
+      this.config.dir, 'tmp', `${id}.${reason}-${process.pid}-${randomBytes(3).toString('hex')}.moving`
+    );
+    await rename(file, moving);
+    // rename keeps the old mtime, which recoverStranded() would read as abandoned
+    const now = new Date();
+    await utimes(moving, now, now);
+    return moving;
+  }
+
+  /** Rewrites a parked job as `next`, then publishes it with a single rename */
+  private async settle(moving: string, next: ReportJob): Promise<void> {
+    await this.write(moving, next);
+    await rename(moving, this.jobPath(next.status, next.id));
+    await syncDir(this.stateDir(next.status));
+  }
+
+  private stateDir(status: ReportJobStatus): string {
+    return path.join(this.config.dir, STATE_DIRS[status]);
+  }
+
+  private jobPath(status: ReportJobStatus, id: string): string {
+    return path.join(this.stateDir(status), `${id}.json`);
+  }
+
+  private runningPath(id: string, claimToken: string): string {
+    return path.join(this.stateDir('running'), `${id}.${claimToken}.json`);
+  }
+
+  private async findFile(dir: ReportJobStatus | 'tmp', id: string, suffix = '.json'): Promise<string | null> {
+    const base = dir === 'tmp' ? path.join(this.config.dir, 'tmp') : this.stateDir(dir);
+    const name = (await readdir(base)).find(entry => entry.startsWith(`${id}.`) && entry.endsWith(suffix));
+    return name ? path.join(base, name) : null;
+  }
+
+  /** Writes via an fsynced temp file and rename so readers never see a partial job */
+  private async write(file: string, job: ReportJob): Promise<void> {
+    const temp = path.join(this.config.dir, 'tmp', `${job.id}.${process.pid}.${randomBytes(3).toString('hex')}`);
+    const handle = await open(temp, 'w');
+    try {
+      await handle.writeFile(JSON.stringify(job));
+      await handle.sync();
+    } finally {
+      await handle.close();
+    }
+    await rename(temp, file);
+    await syncDir(path.dirname(file));
+  }
+
+  private async read(file: string): Promise<ReportJob | null> {
+    try {
+      return JSON.parse(await readFile(file, 'utf8'));
+    } catch (error) {
+      if (isMissing(error)) return null;
+      throw error;
+    }
+  }
+
+  private ensureDirs(): Promise<void> {
+    if (!this.ready) {
+      this.ready = Promise.all(
+        [...Object.values(STATE_DIRS), 'tmp'].map(dir => mkdir(path.join(this.config.dir, dir), { recursive: true }))
+      ).then(() => undefined);
+    }
+    return this.ready;
+  }
+}
+
+const globalForQueue = globalThis as typeof globalThis & { __biReportQueue?: FileReportQueue };
+
+export const reportQueue = globalForQueue.__biReportQueue ?? (() => {
+  const queue = new FileReportQueue();
+  metricsRegistry.addCollector(() => queue.sampleDepth());
+  return queue;
+})();
+globalForQueue.__biReportQueue = reportQueue;
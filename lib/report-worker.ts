@@ -0,0 +1,108 @@
+/**
+ * Report job worker loop
+ *
+ * Claims jobs from the file queue and runs the generateReport flow, keeping
+ * each job's lease alive while the LLM call is in flight. Runs inside a
+ * dedicated process (scripts/report-worker.ts) or, for single-node setups,
+ * inside the web server (REPORT_WORKERS in instrumentation.ts).
+ */
+
+import { hostname } from 'node:os';
+import { loadGenerateReport } from '@/ai/flow-loader';
+import { CircuitOpenError, QueueTimeoutError, isThrottle } from '@/lib/llm-scheduler';
+import { type FileReportQueue, reportQueue } from '@/lib/report-queue';
+
+export interface ReportWorkerOptions {
+  // Jobs processed concurrently by this process
+  concurrency?: number;
+  // Idle poll interval when the queue is empty
+  pollMs?: number;
+  queue?: FileReportQueue;
+  signal?: AbortSignal;
+}
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+function isRetryable(error: unknown): boolean {
+  return error instanceof CircuitOpenError || error instanceof QueueTimeoutError || isThrottle(error);
+}
+
+/** Settles with `promise`, or rejects as soon as `signal` aborts */
+function untilAborted<T>(promise: Promise<T>, signal: AbortSignal): Promise<T> {
+  return new Promise((resolve, reject) => {
+    const onAbort = () => reject(signal.reason);
+    signal.addEventListener('abort', onAbort, { once: true });
+    promise.then(resolve, reject).finally(() => signal.removeEventListener('abort', onAbort));
+  });
+}
+
+/** Resolves once `signal` aborts and in-flight jobs have finished. */
+export async function runReportWorker({
+  concurrency = 1,
+  pollMs = 500,
+  queue = reportQueue,
+  signal,
+}: ReportWorkerOptions = {}): Promise<void> {
+  const workerId = `${hostname()}:${process.pid}`;
+  const generateReport = await loadGenerateReport();
+  const leaseMs = queue.config.leaseMs;
+
+  const recovered = await queue.recoverStranded();
+  if (recovered > 0) console.log(`Recovered ${recovered} report job(s) stranded by an earlier crash`);
+
+  const reaper = setInterval(() => {
+    queue.reclaimExpired()
+      .then(() => queue.pruneFinished())
+      .catch(error => console.warn('Report job reaper failed:', error));
+  }, Math.max(1000, leaseMs / 2));
+
+  const slot = async (index: number) => {
+    const slotId = `${workerId}#${index}`;
+    while (!signal?.aborted) {
+      const job = await queue.claim(slotId).catch(error => {
+        console.warn('Report job claim failed:', error);
+        return null;
+      });
+      if (!job) {
+        await sleep(pollMs);
+        continue;
+      }
+
+      // A reclaimed job may already be running elsewhere, so this copy stops
+      // spending provider capacity as soon as a heartbeat finds it gone
+      const leaseLost = new AbortController();
+      const lease = setInterval(() => {
+        queue.heartbeat(job)
+          .then(held => {
+            if (!held) leaseLost.abort(new Error(`Report job ${job.id} lost its lease`));
+          })
+          .catch(error => console.warn(`Heartbeat failed for ${job.id}:`, error));
+      }, Math.max(500, leaseMs / 3));
+
+      try {
+        const result = await untilAborted(generateReport(job.input, { signal: leaseLost.signal }), leaseLost.signal);
+        // A reclaimed job belongs to another worker now; its result is dropped
+        if (!await queue.complete(job, result)) {
+          console.warn(`Report job ${job.id} was reclaimed before it finished; result dropped`);
+        }
+      } catch (error) {
+        if (leaseLost.signal.aborted) {
+          console.warn(`Report job ${job.id} was reclaimed while running; abandoned`);
+        } else {
+          console.error(`Report job ${job.id} failed (attempt ${job.attempts}):`, error);
+          const next = await queue.fail(job, error, isRetryable(error));
+          // Back off so a throttled provider is not hammered by immediate retries
+          if (next?.status === 'queued') await sleep(pollMs * 4);
+        }
+      } finally {
+        clearInterval(lease);
+      }
+    }
+  };
+
+  try {
+    await Promise.all(Array.from({ length: concurrency }, (_, i) => slot(i)));
+  } finally {
+    clearInterval(reaper);
+  }
+}
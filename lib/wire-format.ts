@@ -0,0 +1,147 @@
+/**
+ * Request decoding and response negotiation for API routes (Node runtime)
+ *
+ * Request bodies may be JSON or MessagePack, optionally gzip/deflate/br/zstd
+ * compressed via Content-Encoding. Responses are MessagePack when the client's
+ * Accept header asks for it and JSON otherwise. Decode time is exported as a
+ * histogram and echoed in a Server-Timing header.
+ */
+
+import { promisify } from 'node:util';
+import * as zlib from 'node:zlib';
+import { NextResponse } from 'next/server';
+import { metricsRegistry } from '@/lib/metrics';
+import { decodeMsgpack, encodeMsgpack } from '@/lib/msgpack';
+
+export const MSGPACK_CONTENT_TYPE = 'application/msgpack';
+
+// Applies to the bytes on the wire and again after decompression (compression bombs)
+const MAX_BODY_BYTES = Number(process.env.API_MAX_BODY_BYTES) || 10 * 1024 * 1024;
+
+type Decompress = (buffer: Buffer, options: zlib.ZlibOptions) => Promise<Buffer>;
+
+const decompressors: Record<string, Decompress> = {
+  gzip: promisify(zlib.gunzip),
+  'x-gzip': promisify(zlib.gunzip),
+  deflate: promisify(zlib.inflate),
+  br: promisify(zlib.brotliDecompress) as Decompress,
+};
+
+// zlib gained zstd in Node 22.15 / 23.8; older runtimes answer 415 for it
+if (typeof (zlib as any).zstdDecompress === 'function') {
+  decompressors.zstd = promisify((zlib as any).zstdDecompress) as Decompress;
+}
+
+export const SUPPORTED_ENCODINGS = ['identity', ...Object.keys(decompressors)];
+
+export class BodyDecodeError extends Error {
+  constructor(readonly status: 400 | 413 | 415, message: string) {
+    super(message);
+    this.name = 'BodyDecodeError';
+  }
+}
+
+export interface DecodedBody {
+  body: unknown;
+  encoding: string;
+  format: 'json' | 'msgpack';
+  wireBytes: number;
+  decodedBytes: number;
+  parseMs: number;
+}
+
+const bodyParseDuration = metricsRegistry.histogram(
+  'http_request_parse_duration_seconds',
+  'Time spent decompressing and decoding request bodies, by route, encoding and format.',
+  [0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25]
+);
+const bodyBytes = metricsRegistry.counter(
+  'http_request_body_bytes_total',
+  'Request body bytes, on the wire and after decompression, by route and encoding.'
+);
+
+/**
+ * Reads the raw body, refusing it as soon as it is known to exceed the cap:
+ * up front from Content-Length, otherwise while streaming, so an oversized
+ * upload is never buffered whole.
+ */
+async function readWireBody(req: Request): Promise<Buffer> {
+  const declared = Number(req.headers.get('content-length'));
+  if (declared > MAX_BODY_BYTES) throw new BodyDecodeError(413, 'Request body too large');
+  if (!req.body) return Buffer.alloc(0);
+
+  const reader = req.body.getReader();
+  const chunks: Uint8Array[] = [];
+  let size = 0;
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    size += value.byteLength;
+    if (size > MAX_BODY_BYTES) {
+      await reader.cancel().catch(() => undefined);
+      throw new BodyDecodeError(413, 'Request body too large');
+    }
+    chunks.push(value);
+  }
+  return Buffer.concat(chunks, size);
+}
+
+export async function readRequestBody(req: Request, route: string): Promise<DecodedBody> {
+  const encoding = (req.headers.get('content-encoding') || 'identity').trim().toLowerCase();
+  const contentType = (req.headers.get('content-type') || '').toLowerCase();
+  const format = contentType.includes('msgpack') ? 'msgpack' : 'json';
+
+  if (encoding !== 'identity' && !decompressors[encoding]) {
+    throw new BodyDecodeError(415, `Unsupported Content-Encoding: ${encoding}`);
+  }
+
+  const wire = await readWireBody(req);
+  // Timed from the last received byte, so slow uploads don't count as parse cost
+  const started = performance.now();
+  let raw = wire;
+  if (encoding !== 'identity') {
+    try {
+      raw = await decompressors[encoding](wire, { maxOutputLength: MAX_BODY_BYTES });
+    } catch (error: any) {
+      if (error?.code === 'ERR_BUFFER_TOO_LARGE') throw new BodyDecodeError(413, 'Request body too large');
+      throw new BodyDecodeError(400, `Malformed ${encoding} body`);
+    }
+  }
+
+  let body: unknown;
+  try {
+    body = format === 'msgpack' ? decodeMsgpack(raw) : JSON.parse(raw.toString('utf8'));
+  } catch {
+    throw new BodyDecodeError(400, `Malformed ${format} body`);
+  }
+
+  const parseMs = performance.now() - started;
+  bodyParseDuration.observe(parseMs / 1000, { route, encoding, format });
+  bodyBytes.inc({ route, encoding, stage: 'wire' }, wire.length);
+  bodyBytes.inc({ route, encoding, stage: 'decoded' }, raw.length);
+
+  return { body, encoding, format, wireBytes: wire.length, decodedBytes: raw.length, parseMs };
+}
+
+export function acceptsMsgpack(req: Request): boolean {
+  const accept = (req.headers.get('accept') || '').toLowerCase();
+  return accept.includes(MSGPACK_CONTENT_TYPE) || accept.includes('application/x-msgpack');
+}
+
+/**
+ * JSON or MessagePack response depending on the request's Accept header.
+ * Response compression is left to Next.js / the reverse proxy.
+ */
+export function negotiatedResponse(req: Request, data: unknown, init: ResponseInit = {}): Response {
+  const headers = new Headers(init.headers);
+  headers.append('Vary', 'Accept');
+
+  if (!acceptsMsgpack(req)) return NextResponse.json(data, { ...init, headers });
+
+  headers.set('Content-Type', MSGPACK_CONTENT_TYPE);
+  return new NextResponse(encodeMsgpack(data), { ...init, headers });
+}
+
+export function serverTiming(parsed: DecodedBody): string {
+  return `parse;dur=${parsed.parseMs.toFixed(3)};desc="${parsed.format}+${parsed.encoding}"`;
+}
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Throttling OpenAI-compatible LLM stand-in
+Serves /v1/chat/completions with configurable latency and a concurrency cap that
+answers 429 when exceeded, so the outbound scheduler can be load tested locally.
+
+Point the app at it with OPENROUTER_BASE_URL=http://localhost:8081/v1
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+
+class StubState:
+    def __init__(self, capacity: int, latency_ms: float, jitter_ms: float,
+                 model_capacity: Optional[Dict[str, int]] = None):
+        self.capacity = capacity
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.model_capacity = model_capacity or {}
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.active = 0
+            self.active_by_model = {}
+            self.max_active = 0
+            self.requests = 0
+            self.throttled = 0
+            self.by_model = {}
+
+    def try_acquire(self, model: str) -> bool:
+        """Admit a request unless the global or per-model cap is reached"""
+        with self.lock:
+            self.requests += 1
+            model_stats = self.by_model.setdefault(model, {"requests": 0, "throttled": 0})
+            model_stats["requests"] += 1
+
+            model_active = self.active_by_model.get(model, 0)
+            model_cap = self.model_capacity.get(model, self.capacity)
+            if self.active >= self.capacity or model_active >= model_cap:
+                self.throttled += 1
+                model_stats["throttled"] += 1
+                return False
+
+            self.active += 1
+            self.active_by_model[model] = model_active + 1
+            self.max_active = max(self.max_active, self.active)
+            return True
+
+    def release(self, model: str):
+        with self.lock:
+            self.active -= 1
+            self.active_by_model[model] -= 1
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "active": self.active,
+                "max_active": self.max_active,
+                "capacity": self.capacity,
+                "by_model": {model: dict(stats) for model, stats in self.by_model.items()},
+            }
+
+
+def make_handler(state: StubState):
+    class StubHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/stats":
+                self._send_json(200, state.snapshot())
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b"{}"
+
+            if self.path.rstrip("/") == "/stats/reset":
+                state.reset()
+                self._send_json(200, {"reset": True})
+                return
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": "not found"})
+                return
+
+            try:
+                request = json.loads(raw or b"{}")
+            except json.JSONDecodeError:
+                self._send_json(400, {"error": {"message": "invalid JSON"}})
+                return
+
+            model = request.get("model", "unknown")
+            if not state.try_acquire(model):
+                self._send_json(
+                    429,
+                    {"error": {"message": "Rate limit exceeded (stub)", "type": "rate_limit_exceeded", "code": 429}},
+                    {"Retry-After": "1"}
+                )
+                return
+
+            try:
+                delay = max(0.0, state.latency_ms + random.uniform(-state.jitter_ms, state.jitter_ms))
+                time.sleep(delay / 1000)
+                # One body satisfies both the report and the contextual-help output schemas
+                content = json.dumps({
+                    "reportMarkdown": f"# Stub Report\n\nGenerated by the throttling stand-in for `{model}`.",
+                    "helpText": f"Stub help from the throttling stand-in for `{model}`."
+                })
+                self._send_json(200, {
+                    "id": f"stub-{int(time.time() * 1000)}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop"
+                    }],
+                    "usage": {"prompt_tokens": length // 4, "completion_tokens": len(content) // 4,
+                              "total_tokens": (length + len(content)) // 4}
+                })
+            finally:
+                state.release(model)
+
+    return StubHandler
+
+
+def start_stub_server(port: int = 8081, capacity: int = 2, latency_ms: float = 1500,
+                      jitter_ms: float = 250, model_capacity: Optional[Dict[str, int]] = None):
+    """Start the stand-in on a background thread; returns (server, state)"""
+    state = StubState(capacity, latency_ms, jitter_ms, model_capacity)
+    server = ThreadingHTTPServer(("0.0.0.0", port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throttling OpenAI-compatible LLM stand-in")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--capacity", type=int, default=2, help="Concurrent requests admitted before 429")
+    parser.add_argument("--latency-ms", type=float, default=1500)
+    parser.add_argument("--jitter-ms", type=float, default=250)
+    parser.add_argument("--model-capacity", action="append", default=[], metavar="MODEL=N",
+                        help="Per-model concurrency cap, e.g. gpt-4o-mini=1 (repeatable)")
+    args = parser.parse_args()
+
+    model_capacity = {}
+    for entry in args.model_capacity:
+        model, _, cap = entry.partition("=")
+        model_capacity[model] = int(cap)
+
+    server, _ = start_stub_server(args.port, args.capacity, args.latency_ms, args.jitter_ms, model_capacity)
+    print(f"🧪 LLM stand-in listening on http://localhost:{args.port}/v1 (capacity {args.capacity})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
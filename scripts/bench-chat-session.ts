@@ -0,0 +1,204 @@
+/**
+ * Replays a long analyst chat session against the legacy array reducer and the
+ * structurally shared MessageList, reporting per-message update and render time.
+ *
+ * Usage: npx tsx scripts/bench-chat-session.ts [messages=2000] [legacyRenderEvery=50]
+ *
+ * "Render" is the Markdown-to-HTML work a transcript re-render performs: the
+ * legacy panel re-rendered every bubble uncached on each update, the windowed
+ * panel renders only the last TRANSCRIPT_WINDOW bubbles whose message changed,
+ * through the content cache. Legacy rendering is sampled every N messages
+ * because a full replay is quadratic.
+ */
+
+import { performance } from 'node:perf_hooks';
+import type { ChatMessage } from '../lib/types';
+import { MessageList } from '../lib/chat-message-store';
+import { renderChatMarkdown, renderChatMarkdownUncached, getChatMarkdownCacheStats } from '../lib/chat-markdown';
+
+const TOTAL_MESSAGES = Number(process.argv[2] ?? 2000);
+const LEGACY_RENDER_EVERY = Number(process.argv[3] ?? 50);
+const TRANSCRIPT_WINDOW = 50;
+const STREAM_CHUNKS = 6;
+
+type Action =
+  | { type: 'ADD_MESSAGE'; payload: ChatMessage }
+  | { type: 'UPDATE_LAST_MESSAGE'; payload: Partial<ChatMessage> }
+  | { type: 'STREAM_UPDATE_LAST_MESSAGE'; payload: { contentChunk: string } };
+
+// Legacy reducer as it shipped in app-provider.tsx
+function legacyReducer(messages: ChatMessage[], action: Action): ChatMessage[] {
+  switch (action.type) {
+    case 'ADD_MESSAGE': {
+      const kept = messages.filter(m => !m.isTyping || action.payload.isTyping);
+      return [...kept, action.payload];
+    }
+    case 'UPDATE_LAST_MESSAGE': {
+      const updated = [...messages];
+      const last = updated.length - 1;
+      if (last >= 0) updated[last] = { ...updated[last], ...action.payload };
+      return updated;
+    }
+    case 'STREAM_UPDATE_LAST_MESSAGE': {
+      const updated = [...messages];
+      const last = updated.length - 1;
+      if (last >= 0) updated[last] = { ...updated[last], content: updated[last].content + action.payload.contentChunk };
+      return updated;
+    }
+  }
+}
+
+function storeReducer(messages: MessageList, action: Action): MessageList {
+  switch (action.type) {
+    case 'ADD_MESSAGE':
+      return (action.payload.isTyping ? messages : messages.withoutTyping()).push(action.payload);
+    case 'UPDATE_LAST_MESSAGE':
+      return messages.updateLast(m => ({ ...m, ...action.payload }));
+    case 'STREAM_UPDATE_LAST_MESSAGE':
+      return messages.updateLast(m => ({ ...m, content: m.content + action.payload.contentChunk }));
+  }
+}
+
+// Deterministic PRNG so runs are comparable
+function mulberry32(seed: number) {
+  return () => {
+    seed |= 0;
+    seed = (seed + 0x6d2b79f5) | 0;
+    let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+const random = mulberry32(42);
+
+function agentResponse(index: number): string {
+  const rows = Array.from({ length: 4 }, (_, i) =>
+    `| Week ${i + 1} | ${(random() * 1000).toFixed(0)} | ${(random() * 20).toFixed(1)}% |`
+  ).join('\n');
+  return [
+    `## Analysis ${index}`,
+    `**Summary:** revenue grew ${(random() * 15).toFixed(1)}% with $${Math.round(random() * 90000)} incremental orders.`,
+    '### Key Findings',
+    '- Strong weekly seasonality with a mid-quarter peak',
+    '- Outliers detected in `Orders` around holiday weeks',
+    '  - Adjusted using IQR capping',
+    '1. Validate data quality',
+    '2. Fit Prophet and XGBoost models',
+    rows,
+    `Forecast MAPE is ${(random() * 10).toFixed(2)}% on the holdout period.`,
+  ].join('\n');
+}
+
+function buildSession(total: number): Action[][] {
+  const session: Action[][] = [];
+  for (let i = 0; i < total; i++) {
+    if (i % 2 === 0) {
+      session.push([{ type: 'ADD_MESSAGE', payload: { id: `m-${i}`, role: 'user', content: `Question ${i}: forecast next 30 days?` } }]);
+      continue;
+    }
+
+    const full = agentResponse(i);
+    const chunkSize = Math.ceil(full.length / STREAM_CHUNKS);
+    const actions: Action[] = [
+      { type: 'ADD_MESSAGE', payload: { id: `typing-${i}`, role: 'assistant', content: '', isTyping: true } },
+      { type: 'ADD_MESSAGE', payload: { id: `m-${i}`, role: 'assistant', content: '', agentType: 'forecasting' } },
+    ];
+    for (let c = 0; c < STREAM_CHUNKS; c++) {
+      actions.push({ type: 'STREAM_UPDATE_LAST_MESSAGE', payload: { contentChunk: full.slice(c * chunkSize, (c + 1) * chunkSize) } });
+    }
+    actions.push({ type: 'UPDATE_LAST_MESSAGE', payload: { suggestions: ['Explain the forecast', 'Generate report'] } });
+    session.push(actions);
+  }
+  return session;
+}
+
+function percentile(values: number[], pct: number): number {
+  if (values.length === 0) return 0;
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.min(sorted.length - 1, Math.max(0, Math.ceil((pct / 100) * sorted.length) - 1))];
+}
+
+function summarize(label: string, values: number[]) {
+  const total = values.reduce((sum, v) => sum + v, 0);
+  console.log(
+    `  ${label.padEnd(28)} p50 ${percentile(values, 50).toFixed(3).padStart(9)}ms` +
+    `  p95 ${percentile(values, 95).toFixed(3).padStart(9)}ms` +
+    `  max ${Math.max(0, ...values).toFixed(3).padStart(9)}ms` +
+    `  total ${total.toFixed(1).padStart(9)}ms`
+  );
+}
+
+function run() {
+  console.log(`=== Chat Session Replay: ${TOTAL_MESSAGES} messages ===\n`);
+  const session = buildSession(TOTAL_MESSAGES);
+
+  // Legacy: array copies, full uncached transcript render per update
+  let legacy: ChatMessage[] = [];
+  const legacyUpdate: number[] = [];
+  const legacyRender: number[] = [];
+  session.forEach((actions, index) => {
+    let updateMs = 0;
+    let renderMs = 0;
+    const sampleRender = index % LEGACY_RENDER_EVERY === 0;
+    for (const action of actions) {
+      const start = performance.now();
+      legacy = legacyReducer(legacy, action);
+      updateMs += performance.now() - start;
+
+      if (sampleRender) {
+        const renderStart = performance.now();
+        for (const message of legacy) if (!message.isTyping) renderChatMarkdownUncached(message.content);
+        renderMs += performance.now() - renderStart;
+      }
+    }
+    legacyUpdate.push(updateMs);
+    if (sampleRender) legacyRender.push(renderMs);
+  });
+
+  // Store: structural sharing, windowed render of changed bubbles through the cache
+  let store = MessageList.empty();
+  let rendered = new Map<string, ChatMessage>();
+  const storeUpdate: number[] = [];
+  const storeRender: number[] = [];
+  session.forEach(actions => {
+    let updateMs = 0;
+    let renderMs = 0;
+    for (const action of actions) {
+      const start = performance.now();
+      store = storeReducer(store, action);
+      updateMs += performance.now() - start;
+
+      const renderStart = performance.now();
+      const next = new Map<string, ChatMessage>();
+      for (const message of store.slice(-TRANSCRIPT_WINDOW)) {
+        // Memoized bubbles skip messages whose identity did not change
+        if (rendered.get(message.id) !== message && !message.isTyping) renderChatMarkdown(message.id, message.content);
+        next.set(message.id, message);
+      }
+      rendered = next;
+      renderMs += performance.now() - renderStart;
+    }
+    storeUpdate.push(updateMs);
+    storeRender.push(renderMs);
+  });
+
+  if (store.length !== legacy.length || store.last()?.content !== legacy[legacy.length - 1]?.content) {
+    throw new Error('MessageList replay diverged from the legacy reducer');
+  }
+
+  console.log(`Legacy array reducer (render sampled every ${LEGACY_RENDER_EVERY} messages):`);
+  summarize('update per message', legacyUpdate);
+  summarize('render per message', legacyRender);
+  console.log('\nMessageList + windowed cached render:');
+  summarize('update per message', storeUpdate);
+  summarize('render per message', storeRender);
+
+  const tail = (values: number[]) => percentile(values.slice(-Math.max(1, Math.floor(values.length / 10))), 50);
+  console.log('\nLast 10% of session (p50):');
+  console.log(`  update: legacy ${tail(legacyUpdate).toFixed(3)}ms vs store ${tail(storeUpdate).toFixed(3)}ms`);
+  console.log(`  render: legacy ${tail(legacyRender).toFixed(3)}ms vs store ${tail(storeRender).toFixed(3)}ms`);
+  console.log(`\nMarkdown cache: ${JSON.stringify(getChatMarkdownCacheStats())}`);
+}
+
+run();
@@ -0,0 +1,39 @@
+/**
+ * Standalone report worker process
+ *
+ * Usage: npx tsx scripts/report-worker.ts
+ *
+ * Scale by starting more processes, on this host or on any node that mounts
+ * the same REPORT_QUEUE_DIR. Each process runs REPORT_WORKER_CONCURRENCY job
+ * slots (default 2) through its own LLM scheduler. SIGTERM/SIGINT stop
+ * claiming new jobs and exit once in-flight jobs finish.
+ */
+
+import { loadGenerateReport } from '../ai/flow-loader';
+import { reportQueue } from '../lib/report-queue';
+import { runReportWorker } from '../lib/report-worker';
+
+const concurrency = Number(process.env.REPORT_WORKER_CONCURRENCY) || 2;
+const pollMs = Number(process.env.REPORT_WORKER_POLL_MS) || 500;
+const controller = new AbortController();
+
+for (const signal of ['SIGTERM', 'SIGINT'] as const) {
+  process.on(signal, () => {
+    console.log(`Report worker ${process.pid}: ${signal}, draining in-flight jobs`);
+    controller.abort();
+  });
+}
+
+async function main() {
+  // Load Genkit before announcing readiness so startup is not counted as job time
+  await loadGenerateReport();
+  console.log(`Report worker ${process.pid}: ready (${concurrency} slots, queue ${reportQueue.config.dir})`);
+  await runReportWorker({ concurrency, pollMs, signal: controller.signal });
+}
+
+main()
+  .then(() => process.exit(0))
+  .catch(error => {
+    console.error('Report worker crashed:', error);
+    process.exit(1);
+  });
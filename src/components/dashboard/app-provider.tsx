@@ -3,6 +3,7 @@
 import React, { createContext, useContext, useReducer } from 'react';
 import type { BusinessUnit, LineOfBusiness, ChatMessage, WorkflowStep, BUCreationData, LOBCreationData, DateRange } from '@/lib/types';
 import { mockBusinessUnits } from '@/lib/data';
+import { MessageList } from '@/lib/chat-message-store';
 import type { AgentMonitorProps } from '@/lib/types';
 
 type AppState = {
@@ -10,7 +11,7 @@ type AppState = {
   businessUnits: BusinessUnit[];
   selectedBu: BusinessUnit | null;
   selectedLob: LineOfBusiness | null;
-  messages: ChatMessage[];
+  messages: MessageList;
   workflow: WorkflowStep[];
   isProcessing: boolean;
   thinkingSteps: string[];
@@ -46,6 +47,7 @@ type Action =
   | { type: 'SET_SELECTED_LOB'; payload: LineOfBusiness | null }
   | { type: 'ADD_MESSAGE'; payload: ChatMessage }
   | { type: 'UPDATE_LAST_MESSAGE'; payload: Partial<ChatMessage> }
+  | { type: 'UPDATE_MESSAGE'; payload: { id: string; changes: Partial<ChatMessage> } }
   | { type: 'STREAM_UPDATE_LAST_MESSAGE'; payload: { contentChunk: string } }
   | { type: 'SET_PROCESSING'; payload: boolean }
   | { type: 'SET_THINKING_STEPS'; payload: string[] }
@@ -84,14 +86,14 @@ const initialState: AppState = {
   businessUnits: mockBusinessUnits,
   selectedBu: null,
   selectedLob: null,
-  messages: [
+  messages: MessageList.from([
     {
       id: '1',
       role: 'assistant',
       content: "Hello! I'm your BI forecasting assistant. Select a Business Unit and Line of Business to get started.",
       suggestions: ['Compare LOB performance', 'Summarize the key business drivers', 'Upload new data']
     },
-  ],
+  ]),
   workflow: [],
   isProcessing: false,
   thinkingSteps: [],
@@ -160,27 +162,22 @@ function appReducer(state: AppState, action: Action): AppState {
             }
         };
     case 'ADD_MESSAGE': {
-      const messages = state.messages.filter(m => !m.isTyping || action.payload.isTyping);
-      return { ...state, messages: [...messages, action.payload] };
+      const messages = action.payload.isTyping ? state.messages : state.messages.withoutTyping();
+      return { ...state, messages: messages.push(action.payload) };
     }
     case 'UPDATE_LAST_MESSAGE':
-        const updatedMessages = [...state.messages];
-        const lastMessageIndex = updatedMessages.length - 1;
-        if(lastMessageIndex >= 0) {
-            updatedMessages[lastMessageIndex] = { ...updatedMessages[lastMessageIndex], ...action.payload };
-        }
-        return { ...state, messages: updatedMessages };
+        return { ...state, messages: state.messages.updateLast(message => ({ ...message, ...action.payload })) };
+    case 'UPDATE_MESSAGE':
+        return {
+            ...state,
+            messages: state.messages.updateById(action.payload.id, message => ({ ...message, ...action.payload.changes }))
+        };
     case 'STREAM_UPDATE_LAST_MESSAGE': {
-        const updatedMessages = [...state.messages];
-        const lastMessageIndex = updatedMessages.length - 1;
-        if(lastMessageIndex >= 0) {
-            const lastMessage = updatedMessages[lastMessageIndex];
-            updatedMessages[lastMessageIndex] = {
-                 ...lastMessage,
-                 content: lastMessage.content + action.payload.contentChunk,
-            };
-        }
-        return { ...state, messages: updatedMessages };
+        const messages = state.messages.updateLast(lastMessage => ({
+            ...lastMessage,
+            content: lastMessage.content + action.payload.contentChunk,
+        }));
+        return { ...state, messages };
     }
     case 'SET_PROCESSING':
       return { ...state, isProcessing: action.payload };
@@ -280,7 +277,7 @@ function appReducer(state: AppState, action: Action): AppState {
         return { 
             ...state, 
             businessUnits: [...state.businessUnits, newBu],
-            messages: [...state.messages, successMessage]
+            messages: state.messages.push(successMessage)
         };
     }
     case 'ADD_LOB': {
@@ -321,7 +318,7 @@ function appReducer(state: AppState, action: Action): AppState {
                     ? { ...bu, lobs: [...bu.lobs, newLob], updatedDate: now }
                     : bu
             ),
-            messages: [...state.messages, successMessage]
+            messages: state.messages.push(successMessage)
         };
     }
     case 'UPLOAD_DATA': {
@@ -347,9 +344,9 @@ function appReducer(state: AppState, action: Action): AppState {
           )
         }));
         const updatedLob = businessUnitsWithData.flatMap(bu => bu.lobs).find(lob => lob.id === action.payload.lobId);
-        const newMessages: ChatMessage[] = [...state.messages];
+        let newMessages = state.messages;
         if (updatedLob) {
-            newMessages.push({
+            newMessages = newMessages.push({
                 id: crypto.randomUUID(),
                 role: 'assistant',
                 content: `I've uploaded "${action.payload.file.name}" and analyzed the data for the ${updatedLob.name} LOB. It contains ${updatedLob.recordCount} records.`,
@@ -361,8 +358,8 @@ function appReducer(state: AppState, action: Action): AppState {
     case 'TOGGLE_VISUALIZATION': {
       return {
         ...state,
-        messages: state.messages.map(msg => {
-          if (msg.id === action.payload.messageId && msg.visualization) {
+        messages: state.messages.updateById(action.payload.messageId, msg => {
+          if (msg.visualization) {
             return { ...msg, visualization: { ...msg.visualization, isShowing: !msg.visualization.isShowing } };
           }
           return msg;
@@ -843,7 +843,7 @@ export default function ChatPanel({ className }: { className?: string }) {
     }
   };
 
-  const isAssistantTyping = state.isProcessing || state.messages[state.messages.length - 1]?.isTyping;
+  const isAssistantTyping = state.isProcessing || state.messages.last()?.isTyping;
 
   return (
     <>
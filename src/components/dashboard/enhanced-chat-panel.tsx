@@ -1,6 +1,6 @@
 'use client';
 
-import React, { FormEvent, useEffect, useRef, useState } from 'react';
+import React, { FormEvent, memo, useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import { Avatar, AvatarFallback } from '@/components/ui/avatar';
 import { Button } from '@/components/ui/button';
 import { Card, CardContent } from '@/components/ui/card';
@@ -23,6 +23,7 @@ import FollowUpQuestionsDialog from './follow-up-questions-dialog';
 import APISettingsDialog from './api-settings-dialog';
 import { chatCommandProcessor } from '@/lib/chat-command-processor';
 import { agentResponseGenerator } from '@/lib/agent-response-generator';
+import { renderChatMarkdown } from '@/lib/chat-markdown';
 
 type AgentConfig = {
   name: string;
@@ -810,22 +811,35 @@ Leverage your expertise to provide deep, meaningful, and statistically sound ins
 
 let enhancedChatHandler: EnhancedMultiAgentChatHandler | null = null;
 
+// Number of most recent messages rendered; older ones load on demand
+const TRANSCRIPT_WINDOW = 50;
+
+type EnhancedChatBubbleProps = {
+  message: ChatMessage;
+  onSuggestionClick: (suggestion: string) => void;
+  onVisualizeClick: (messageId: string) => void;
+  onGenerateReport?: (messageId: string) => void;
+  thinkingSteps: string[];
+  performance?: any;
+};
+
+// Bubbles only re-render when their own message changes; thinking steps matter
+// only while typing. Handlers are stable refs owned by the panel.
+function areBubblePropsEqual(prev: EnhancedChatBubbleProps, next: EnhancedChatBubbleProps): boolean {
+  return prev.message === next.message &&
+    prev.performance === next.performance &&
+    (!next.message.isTyping || prev.thinkingSteps === next.thinkingSteps);
+}
+
 // Enhanced Chat Bubble with performance indicators
-function EnhancedChatBubble({ 
+const EnhancedChatBubble = memo(function EnhancedChatBubble({ 
   message, 
   onSuggestionClick, 
   onVisualizeClick,
   onGenerateReport,
   thinkingSteps,
   performance
-}: { 
-  message: ChatMessage;
-  onSuggestionClick: (suggestion: string) => void;
-  onVisualizeClick: (messageId: string) => void;
-  onGenerateReport?: (messageId: string) => void;
-  thinkingSteps: string[];
-  performance?: any;
-}) {
+}: EnhancedChatBubbleProps) {
   const isUser = message.role === 'user';
   const agentInfo = message.agentType ? ENHANCED_AGENTS[message.agentType as keyof typeof ENHANCED_AGENTS] : null;
   const [showPerformance, setShowPerformance] = useState(false);
@@ -934,41 +948,7 @@ function EnhancedChatBubble({
               )}
             </div>
           ) : (
-            <div 
-              dangerouslySetInnerHTML={{ 
-                __html: message.content
-                  .replace(/\[WORKFLOW_PLAN\][\s\S]*?\[\/WORKFLOW_PLAN\]/, '')
-                  .replace(/\[REPORT_DATA\][\s\S]*?\[\/REPORT_DATA\]/, '')
-                  // Headers
-                  .replace(/### (.*?)$/gm, '<h4 class="text-sm font-semibold mt-3 mb-2 text-foreground">$1</h4>')
-                  .replace(/## (.*?)$/gm, '<h3 class="text-base font-semibold mt-4 mb-2 text-foreground">$1</h3>')
-                  .replace(/# (.*?)$/gm, '<h2 class="text-lg font-bold mt-4 mb-3 text-foreground">$1</h2>')
-                  // Bold text
-                  .replace(/\*\*(.*?)\*\*/g, '<strong class="font-semibold text-foreground">$1</strong>')
-                  // Tables - convert simple markdown tables
-                  .replace(/\|(.*?)\|/g, (match, content) => {
-                    const cells = content.split('|').map(cell => `<td class="border px-2 py-1 text-xs">${cell.trim()}</td>`).join('');
-                    return `<tr>${cells}</tr>`;
-                  })
-                  // Numbered lists
-                  .replace(/^(\d+)\.\s+(.*?)$/gm, '<div class="flex gap-2 my-1"><span class="text-primary font-medium min-w-[20px]">$1.</span><span>$2</span></div>')
-                  // Bullet points - better formatting
-                  .replace(/^[•\-\*]\s+(.*?)$/gm, '<div class="flex gap-2 my-1"><span class="text-primary">•</span><span>$1</span></div>')
-                  // Nested bullet points
-                  .replace(/^\s+[•\-\*]\s+(.*?)$/gm, '<div class="flex gap-2 my-1 ml-4"><span class="text-muted-foreground">◦</span><span class="text-sm">$1</span></div>')
-                  // Code blocks
-                  .replace(/`([^`]+)`/g, '<code class="bg-muted px-1 py-0.5 rounded text-xs font-mono">$1</code>')
-                  // Percentages and numbers highlighting
-                  .replace(/(\d+\.?\d*%)/g, '<span class="font-semibold text-green-600 dark:text-green-400">$1</span>')
-                  .replace(/(\$[\d,]+)/g, '<span class="font-semibold text-blue-600 dark:text-blue-400">$1</span>')
-                  // Line breaks
-                  .replace(/\n\n/g, '</p><p class="mb-2">')
-                  .replace(/\n/g, '<br />')
-                  // Wrap in paragraphs
-                  .replace(/^/, '<p class="mb-2">')
-                  .replace(/$/, '</p>')
-              }} 
-            />
+            <div dangerouslySetInnerHTML={{ __html: renderChatMarkdown(message.id, message.content) }} />
           )}
         </div>
         
@@ -1069,7 +1049,7 @@ function EnhancedChatBubble({
       )}
     </div>
   );
-}
+}, areBubblePropsEqual);
 
 // Main Enhanced Chat Panel Component
 export default function EnhancedChatPanel({ className }: { className?: string }) {
@@ -1082,6 +1062,7 @@ export default function EnhancedChatPanel({ className }: { className?: string })
   const [followUpRequirements, setFollowUpRequirements] = useState<AnalysisRequirements | null>(null);
   const [pendingUserMessage, setPendingUserMessage] = useState<string>('');
   const [questionResponses, setQuestionResponses] = useState<Map<string, any>>(new Map());
+  const [visibleCount, setVisibleCount] = useState(TRANSCRIPT_WINDOW);
 
   // Initialize enhanced chat handler
   if (!enhancedChatHandler) {
@@ -1755,7 +1736,7 @@ Ready to customize, or should I proceed with intelligent defaults?`,
   };
   
   const handleVisualizeClick = (messageId: string) => {
-    const msg = state.messages.find(m => m.id === messageId);
+    const msg = state.messages.findById(messageId);
     const target = msg?.visualization?.target === "Orders" ? "revenue" : "units";
     dispatch({ type: 'SET_DATA_PANEL_TARGET', payload: target });
     dispatch({ type: 'SET_DATA_PANEL_MODE', payload: 'chart' });
@@ -1764,7 +1745,7 @@ Ready to customize, or should I proceed with intelligent defaults?`,
   };
 
   const handleGenerateReport = (messageId: string) => {
-    const msg = state.messages.find(m => m.id === messageId);
+    const msg = state.messages.findById(messageId);
     if (msg?.reportData && msg.agentType) {
       dispatch({ 
         type: 'GENERATE_REPORT', 
@@ -1778,7 +1759,18 @@ Ready to customize, or should I proceed with intelligent defaults?`,
     }
   };
 
-  const isAssistantTyping = state.isProcessing || state.messages[state.messages.length - 1]?.isTyping;
+  const isAssistantTyping = state.isProcessing || state.messages.last()?.isTyping;
+
+  // Memoized bubbles compare handler identity, so route them through a ref
+  // that always points at this render's closures
+  const handlersRef = useRef({ handleSuggestionClick, handleVisualizeClick, handleGenerateReport });
+  handlersRef.current = { handleSuggestionClick, handleVisualizeClick, handleGenerateReport };
+  const onSuggestionClick = useCallback((suggestion: string) => handlersRef.current.handleSuggestionClick(suggestion), []);
+  const onVisualizeClick = useCallback((messageId: string) => handlersRef.current.handleVisualizeClick(messageId), []);
+  const onGenerateReport = useCallback((messageId: string) => handlersRef.current.handleGenerateReport(messageId), []);
+
+  const windowStart = Math.max(0, state.messages.length - visibleCount);
+  const visibleMessages = useMemo(() => state.messages.slice(windowStart), [state.messages, windowStart]);
 
   return (
     <>
@@ -1787,16 +1779,32 @@ Ready to customize, or should I proceed with intelligent defaults?`,
           <div className="flex flex-col h-full">
             <ScrollArea className="flex-1" ref={scrollAreaRef}>
               <div className="p-6 space-y-6">
-                {state.messages.map(message => (
-                  <EnhancedChatBubble 
-                    key={message.id} 
-                    message={message} 
-                    onSuggestionClick={handleSuggestionClick}
-                    onVisualizeClick={() => handleVisualizeClick(message.id)}
-                    onGenerateReport={handleGenerateReport}
-                    thinkingSteps={state.thinkingSteps}
-                    performance={performance}
-                  />
+                {windowStart > 0 && (
+                  <div className="flex justify-center">
+                    <Button
+                      variant="ghost"
+                      size="sm"
+                      type="button"
+                      onClick={() => setVisibleCount(count => count + TRANSCRIPT_WINDOW)}
+                    >
+                      Show {Math.min(windowStart, TRANSCRIPT_WINDOW)} earlier messages
+                    </Button>
+                  </div>
+                )}
+                {visibleMessages.map(message => (
+                  <div
+                    key={message.id}
+                    style={{ contentVisibility: 'auto', containIntrinsicSize: 'auto 160px' }}
+                  >
+                    <EnhancedChatBubble 
+                      message={message} 
+                      onSuggestionClick={onSuggestionClick}
+                      onVisualizeClick={onVisualizeClick}
+                      onGenerateReport={onGenerateReport}
+                      thinkingSteps={state.thinkingSteps}
+                      performance={performance}
+                    />
+                  </div>
                 ))}
               </div>
             </ScrollArea>
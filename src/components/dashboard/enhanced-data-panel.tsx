@@ -127,7 +127,7 @@ export default function EnhancedDataPanel({ className }: { className?: string })
     try {
       const sessionData = {
         businessUnits: state.businessUnits,
-        messages: state.messages,
+        messages: state.messages.toArray(),
         selectedBuId: state.selectedBu?.id || null,
         selectedLobId: state.selectedLob?.id || null,
         hasAnalyzedData: state.analyzedData.hasEDA || state.analyzedData.hasInsights,
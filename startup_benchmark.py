@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the built Next.js server
+Launches the production server, polls /api/health until ready, then times the
+first /api/generate-report. Reports time-to-ready, first-request latency and
+resident memory at idle, optionally comparing AI_WARMUP modes.
+
+Build first with `npm run build`; the standalone server is used by default.
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+DEFAULT_COMMAND = "node .next/standalone/server.js"
+
+
+def find_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def process_tree_rss_bytes(root_pid: int) -> Optional[int]:
+    """Sum VmRSS over a process and its descendants (Linux /proc); None elsewhere"""
+    if not os.path.isdir("/proc"):
+        return None
+
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # Field 4 is the parent pid; the command name may contain spaces
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            children.setdefault(ppid, []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+
+class StartupBenchmark:
+    def __init__(self, command: str, cwd: str, ready_timeout: float = 120, request_timeout: float = 60):
+        self.command = command
+        self.cwd = cwd
+        self.ready_timeout = ready_timeout
+        self.request_timeout = request_timeout
+        self.test_results = []
+
+    def log_test(self, test_name: str, success: bool, message: str, details: Dict = None):
+        """Log test results"""
+        result = {
+            "test": test_name,
+            "success": success,
+            "message": message,
+            "details": details or {},
+            "timestamp": time.time()
+        }
+        self.test_results.append(result)
+        status = "✅ PASS" if success else "❌ FAIL"
+        print(f"{status} {test_name}: {message}")
+        if details and not success:
+            print(f"   Details: {json.dumps(details, indent=2)}")
+
+    def _report_payload(self) -> Dict[str, str]:
+        return {
+            "conversationHistory": json.dumps([
+                {"role": "user", "content": "analyze my data quality"},
+                {"role": "assistant", "content": "The dataset shows excellent quality with 94/100 score."}
+            ]),
+            "analysisContext": json.dumps({
+                "selectedBu": {"name": "Sales Department"},
+                "selectedLob": {"name": "Product Sales", "hasData": True, "recordCount": 5000},
+                "userQuery": "analyze my data quality",
+                "queryType": "simple_eda"
+            })
+        }
+
+    def run_once(self, env_overrides: Dict[str, str], idle_seconds: float = 3.0) -> Optional[Dict]:
+        """Start the server, measure readiness, idle RSS and the first report request, then stop it"""
+        port = find_free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        env = {**os.environ, "PORT": str(port), "HOSTNAME": "127.0.0.1", "NODE_ENV": "production",
+               "NEXT_TELEMETRY_DISABLED": "1", **env_overrides}
+
+        # A file, not a pipe: nobody reads stderr while the server runs, and a full
+        # pipe buffer would block the server's writes
+        stderr_log = tempfile.TemporaryFile()
+        started = time.perf_counter()
+        process = subprocess.Popen(self.command, shell=True, cwd=self.cwd, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=stderr_log,
+                                   start_new_session=True)
+        try:
+            ready_at = self._wait_until_ready(base_url, process, started)
+            if ready_at is None:
+                stderr_log.seek(0)
+                stderr = stderr_log.read().decode(errors="replace")[-2000:]
+                self.log_test("Server Ready", False, "Server did not become ready", {"stderr": stderr})
+                return None
+
+            time_to_ready = ready_at - started
+            time.sleep(idle_seconds)
+            idle_rss = process_tree_rss_bytes(process.pid)
+
+            request_started = time.perf_counter()
+            try:
+                response = requests.post(f"{base_url}/api/generate-report", json=self._report_payload(),
+                                         timeout=self.request_timeout)
+                first_status = response.status_code
+            except requests.exceptions.RequestException as e:
+                first_status = f"error: {e.__class__.__name__}"
+            first_request = time.perf_counter() - request_started
+
+            second_started = time.perf_counter()
+            try:
+                requests.post(f"{base_url}/api/generate-report", json=self._report_payload(),
+                              timeout=self.request_timeout)
+            except requests.exceptions.RequestException:
+                pass
+            second_request = time.perf_counter() - second_started
+
+            return {
+                "time_to_ready_s": time_to_ready,
+                "idle_rss_mb": idle_rss / 1024 / 1024 if idle_rss is not None else None,
+                "first_request_s": first_request,
+                "first_request_status": first_status,
+                "second_request_s": second_request,
+                "post_request_rss_mb": (process_tree_rss_bytes(process.pid) or 0) / 1024 / 1024,
+            }
+        finally:
+            self._stop(process)
+            stderr_log.close()
+
+    def _wait_until_ready(self, base_url: str, process: subprocess.Popen, started: float) -> Optional[float]:
+        while time.perf_counter() - started < self.ready_timeout:
+            if process.poll() is not None:
+                return None
+            try:
+                response = requests.get(f"{base_url}/api/health", timeout=1)
+                if response.status_code == 200:
+                    return time.perf_counter()
+            except requests.exceptions.RequestException:
+                pass
+            time.sleep(0.05)
+        return None
+
+    def _stop(self, process: subprocess.Popen):
+        if process.poll() is not None:
+            return
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            process.wait(timeout=10)
+        except (ProcessLookupError, subprocess.TimeoutExpired):
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    def run(self, modes: List[str], iterations: int) -> Dict[str, Dict]:
+        print("🚀 Starting Cold-Start Benchmark")
+        print("=" * 50)
+        summary = {}
+
+        for mode in modes:
+            env = {} if mode == "off" else {"AI_WARMUP": mode}
+            print(f"\n⏱️  AI_WARMUP={mode} ({iterations} runs)...")
+            runs = [r for r in (self.run_once(env) for _ in range(iterations)) if r]
+            if not runs:
+                continue
+
+            def median(key):
+                values = [r[key] for r in runs if isinstance(r.get(key), (int, float))]
+                return statistics.median(values) if values else None
+
+            summary[mode] = {
+                "runs": len(runs),
+                "time_to_ready_s": median("time_to_ready_s"),
+                "first_request_s": median("first_request_s"),
+                "second_request_s": median("second_request_s"),
+                "idle_rss_mb": median("idle_rss_mb"),
+                "post_request_rss_mb": median("post_request_rss_mb"),
+                "first_request_statuses": sorted({str(r["first_request_status"]) for r in runs}),
+            }
+            result = summary[mode]
+            self.log_test(
+                f"Cold Start - AI_WARMUP={mode}",
+                True,
+                f"ready {result['time_to_ready_s']:.2f}s, first report {result['first_request_s']:.2f}s, "
+                f"idle RSS {result['idle_rss_mb'] or 0:.0f}MB",
+                result
+            )
+
+        print("\n" + "=" * 50)
+        print(json.dumps(summary, indent=2))
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for the built server")
+    parser.add_argument("--command", default=DEFAULT_COMMAND, help="Command that starts the built server")
+    parser.add_argument("--cwd", default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--modes", default="off,true",
+                        help="Comma-separated AI_WARMUP modes to compare: off, true, blocking")
+    parser.add_argument("--ready-timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    benchmark = StartupBenchmark(args.command, args.cwd, args.ready_timeout)
+    summary = benchmark.run([m.strip() for m in args.modes.split(",") if m.strip()], args.iterations)
+    sys.exit(0 if summary else 1)
+
+
+if __name__ == "__main__":
+    main()
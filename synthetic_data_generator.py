@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Seeded synthetic BU/LOB dataset generator
+Emits time series in the Date,Value,Orders,Forecast upload template produced by
+DataValidationEngine.generateTemplate, as CSV, Excel and/or Parquet, with
+injected data-quality issues and a ground-truth label file for each series.
+
+Excel output needs openpyxl and Parquet output needs pyarrow; CSV is stdlib only.
+Rows are generated and written in chunks, so tens of millions of rows stream
+with flat memory.
+"""
+
+import argparse
+import csv
+import importlib.util
+import json
+import math
+import os
+import random
+import sys
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+TEMPLATE_HEADER = ["Date", "Value", "Orders", "Forecast"]
+EXCEL_MAX_ROWS = 1_048_576
+CHUNK_ROWS = 50_000
+
+FREQUENCIES = {
+    "minute": (timedelta(minutes=1), "%Y-%m-%d %H:%M"),
+    "hour": (timedelta(hours=1), "%Y-%m-%d %H:%M"),
+    "day": (timedelta(days=1), "%Y-%m-%d"),
+    "week": (timedelta(weeks=1), "%Y-%m-%d"),
+}
+
+# Seasonal periods in steps, per frequency: (period, relative amplitude)
+DEFAULT_SEASONS = {
+    "minute": [(1440, 0.3), (10080, 0.15)],
+    "hour": [(24, 0.3), (168, 0.15)],
+    "day": [(7, 0.2), (365.25, 0.15)],
+    "week": [(52.18, 0.2)],
+}
+
+# Values new Date() rejects in every engine, so validation must flag them
+BAD_DATES = ["2024-13-45", "not-a-date", "32/13/2024", "2024/00/00", "N/A", "??"]
+
+# Optional packages behind each non-CSV format
+FORMAT_DEPENDENCIES = {"xlsx": "openpyxl", "parquet": "pyarrow"}
+
+# Label kinds, in the order they are drawn for each row
+ANOMALY_KINDS = ("gap", "bad_date", "missing", "outlier", "negative")
+
+
+class RunningStats:
+    """Welford mean/variance with min/max, for ground-truth summary statistics"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def to_dict(self) -> Dict:
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0,
+            "min": self.min,
+            "max": self.max,
+        }
+
+
+class SeriesConfig:
+    def __init__(self, name: str, rows: int, seed: int, start: datetime, freq: str,
+                 base: float, trend: float, seasons: List[Tuple[float, float]], noise: float,
+                 rates: Dict[str, float], outlier_scale: float):
+        self.name = name
+        self.rows = rows
+        self.seed = seed
+        self.start = start
+        self.freq = freq
+        self.base = base
+        self.trend = trend
+        self.seasons = seasons
+        self.noise = noise
+        self.rates = rates
+        self.outlier_scale = outlier_scale
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "rows": self.rows,
+            "seed": self.seed,
+            "start": self.start.strftime(FREQUENCIES[self.freq][1]),
+            "freq": self.freq,
+            "base": self.base,
+            "trend": self.trend,
+            "seasons": [{"period": p, "amplitude": a} for p, a in self.seasons],
+            "noise": self.noise,
+            "rates": self.rates,
+            "outlier_scale": self.outlier_scale,
+        }
+
+
+class SeriesGenerator:
+    """
+    Generates one series as chunks of template rows plus ground-truth labels.
+
+    `rows` counts time steps; steps labelled "gap" are dropped from the output,
+    so the written row count is rows minus gaps. Label rows use the same
+    spreadsheet row numbers (header is row 1) that DataValidationEngine reports.
+    """
+
+    def __init__(self, config: SeriesConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.step, self.date_format = FREQUENCIES[config.freq]
+        self.counts = {kind: 0 for kind in ANOMALY_KINDS}
+        self.clean_stats = RunningStats()
+        self.written_stats = RunningStats()
+        self.rows_written = 0
+
+        if (datetime.max - config.start) < self.step * max(config.rows - 1, 0):
+            raise ValueError(f"{config.rows} {config.freq} steps from {config.start:%Y-%m-%d} overflow year 9999; "
+                             f"use a finer --freq")
+
+    def signal(self, t: int) -> float:
+        """Noise-free level at step t: linear trend times multiplicative seasonality"""
+        level = self.config.base * (1 + self.config.trend * t / max(self.config.rows, 1))
+        for period, amplitude in self.config.seasons:
+            level *= 1 + amplitude * math.sin(2 * math.pi * t / period)
+        return level
+
+    def _draw_anomaly(self) -> Optional[str]:
+        draw = self.rng.random()
+        for kind in ANOMALY_KINDS:
+            rate = self.config.rates.get(kind, 0.0)
+            if draw < rate:
+                return kind
+            draw -= rate
+        return None
+
+    def chunks(self) -> Iterator[Tuple[List[List], List[List]]]:
+        """Yield (rows, labels) chunks; rows follow TEMPLATE_HEADER"""
+        rng = self.rng
+        config = self.config
+        rows: List[List] = []
+        labels: List[List] = []
+
+        for t in range(config.rows):
+            # Computed per step so the last row never steps past datetime.max
+            date_text = (config.start + t * self.step).strftime(self.date_format)
+
+            true_value = max(0.0, self.signal(t) * (1 + rng.gauss(0, config.noise)))
+            true_value = round(true_value, 2)
+            orders = int(round(true_value * rng.uniform(0.08, 0.12)))
+            self.clean_stats.add(true_value)
+
+            kind = self._draw_anomaly()
+            value: Optional[float] = true_value
+            written_date = date_text
+
+            if kind == "gap":
+                self.counts[kind] += 1
+                labels.append([None, date_text, kind, true_value, None])
+                continue
+            if kind == "bad_date":
+                written_date = rng.choice(BAD_DATES)
+            elif kind == "missing":
+                value = None
+            elif kind == "outlier":
+                factor = config.outlier_scale if rng.random() < 0.5 else 1 / config.outlier_scale
+                value = round(true_value * factor * rng.uniform(0.9, 1.1), 2)
+            elif kind == "negative":
+                value = round(-max(true_value, 1.0) * rng.uniform(0.1, 1.0), 2)
+
+            self.rows_written += 1
+            if value is not None:
+                self.written_stats.add(value)
+            if kind:
+                self.counts[kind] += 1
+                labels.append([self.rows_written + 1, date_text, kind, true_value, value])
+
+            rows.append([written_date, value, orders, None])
+            if len(rows) >= CHUNK_ROWS:
+                yield rows, labels
+                rows, labels = [], []
+
+        if rows or labels:
+            yield rows, labels
+
+    def summary(self) -> Dict:
+        return {
+            "config": self.config.to_dict(),
+            "template": TEMPLATE_HEADER,
+            "steps": self.config.rows,
+            "rows_written": self.rows_written,
+            "anomalies": dict(self.counts),
+            # Statistics of the underlying series before injection, and of the
+            # numeric Value cells actually written (what ingestion should report)
+            "clean_value_stats": self.clean_stats.to_dict(),
+            "written_value_stats": self.written_stats.to_dict(),
+        }
+
+
+class CsvWriter:
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(TEMPLATE_HEADER)
+
+    def write(self, rows: List[List]):
+        self.writer.writerows([["" if cell is None else cell for cell in row] for row in rows])
+
+    def close(self):
+        self.file.close()
+
+
+class ExcelWriter:
+    """Streams rows with openpyxl's write-only mode, rolling to a new sheet at Excel's row limit"""
+
+    def __init__(self, path: str):
+        from openpyxl import Workbook
+        self.path = path
+        self.workbook = Workbook(write_only=True)
+        self.sheet = None
+        self.sheet_rows = EXCEL_MAX_ROWS
+
+    def write(self, rows: List[List]):
+        for row in rows:
+            if self.sheet_rows >= EXCEL_MAX_ROWS:
+                self.sheet = self.workbook.create_sheet(f"Data{len(self.workbook.worksheets) + 1}")
+                self.sheet.append(TEMPLATE_HEADER)
+                self.sheet_rows = 1
+            self.sheet.append(row)
+            self.sheet_rows += 1
+
+    def close(self):
+        self.workbook.save(self.path)
+
+
+class ParquetWriter:
+    """Columnar output; Date stays a string column so injected bad dates survive"""
+
+    def __init__(self, path: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        self.path = path
+        self.schema = pa.schema([
+            ("Date", pa.string()),
+            ("Value", pa.float64()),
+            ("Orders", pa.int64()),
+            ("Forecast", pa.float64()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows: List[List]):
+        columns = [list(column) for column in zip(*rows)] if rows else [[] for _ in TEMPLATE_HEADER]
+        self.writer.write_table(self.pa.Table.from_arrays(
+            [self.pa.array(column, type=field.type) for column, field in zip(columns, self.schema)],
+            schema=self.schema
+        ))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {"csv": CsvWriter, "xlsx": ExcelWriter, "parquet": ParquetWriter}
+
+
+def generate_series(config: SeriesConfig, out_dir: str, formats: List[str]) -> Dict:
+    """Write one series in every requested format plus <name>.labels.csv and <name>.summary.json"""
+    generator = SeriesGenerator(config)
+    writers = [WRITERS[fmt](os.path.join(out_dir, f"{config.name}.{fmt}")) for fmt in formats]
+    labels_path = os.path.join(out_dir, f"{config.name}.labels.csv")
+
+    started = time.perf_counter()
+    with open(labels_path, "w", newline="") as labels_file:
+        labels_writer = csv.writer(labels_file)
+        labels_writer.writerow(["row", "date", "kind", "true_value", "written_value"])
+        try:
+            for rows, labels in generator.chunks():
+                for writer in writers:
+                    writer.write(rows)
+                labels_writer.writerows([["" if cell is None else cell for cell in label] for label in labels])
+        finally:
+            for writer in writers:
+                writer.close()
+
+    summary = generator.summary()
+    summary["files"] = [w.path for w in writers] + [labels_path]
+    summary["generation_seconds"] = time.perf_counter() - started
+    with open(os.path.join(out_dir, f"{config.name}.summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def series_seed(seed: int, name: str) -> int:
+    """Stable per-series seed so adding a LOB does not change the others"""
+    return zlib.crc32(f"{seed}:{name}".encode()) ^ seed
+
+
+def parse_season(text: str) -> Tuple[float, float]:
+    """argparse type for PERIOD:AMPLITUDE; amplitude defaults to 0.2"""
+    period, _, amplitude = text.partition(":")
+    try:
+        parsed = float(period), float(amplitude or 0.2)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected PERIOD:AMPLITUDE with numbers, e.g. 7:0.2, got {text!r}")
+    if not parsed[0] > 0:
+        raise argparse.ArgumentTypeError(f"season period must be positive, got {text!r}")
+    return parsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seeded synthetic BU/LOB dataset generator")
+    parser.add_argument("--rows", type=int, default=10_000, help="Time steps per series (gaps are dropped)")
+    parser.add_argument("--lob", action="append", default=[], metavar="NAME",
+                        help="Series to generate, e.g. bu-premium_lob-premium-phone (repeatable)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--start", default="2024-01-01")
+    parser.add_argument("--freq", choices=sorted(FREQUENCIES), default="day")
+    parser.add_argument("--base", type=float, default=1000.0)
+    parser.add_argument("--trend", type=float, default=0.5,
+                        help="Relative change in level over the whole series, e.g. 0.5 ends 50%% above --base")
+    parser.add_argument("--season", action="append", default=[], type=parse_season, metavar="PERIOD:AMPLITUDE",
+                        help="Seasonal period in steps and relative amplitude, e.g. 7:0.2 (repeatable)")
+    parser.add_argument("--noise", type=float, default=0.05, help="Relative Gaussian noise")
+    parser.add_argument("--outlier-rate", type=float, default=0.005)
+    parser.add_argument("--outlier-scale", type=float, default=5.0)
+    parser.add_argument("--gap-rate", type=float, default=0.01)
+    parser.add_argument("--missing-rate", type=float, default=0.005)
+    parser.add_argument("--bad-date-rate", type=float, default=0.002)
+    parser.add_argument("--negative-rate", type=float, default=0.002)
+    parser.add_argument("--formats", default="csv", help="Comma-separated: csv, xlsx, parquet")
+    parser.add_argument("--out-dir", default="synthetic-data")
+    args = parser.parse_args()
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = [f for f in formats if f not in WRITERS]
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(unknown)}")
+    for fmt in formats:
+        module = FORMAT_DEPENDENCIES.get(fmt)
+        if module and importlib.util.find_spec(module) is None:
+            parser.error(f"{fmt} output needs {module}: pip install {module}")
+
+    rates = {
+        "gap": args.gap_rate,
+        "bad_date": args.bad_date_rate,
+        "missing": args.missing_rate,
+        "outlier": args.outlier_rate,
+        "negative": args.negative_rate,
+    }
+    if sum(rates.values()) > 1:
+        parser.error("anomaly rates must sum to at most 1")
+
+    seasons = args.season or DEFAULT_SEASONS[args.freq]
+    start = datetime.fromisoformat(args.start)
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    print("🧪 Generating synthetic datasets")
+    print("=" * 50)
+    for name in args.lob or ["synthetic-lob"]:
+        config = SeriesConfig(name, args.rows, series_seed(args.seed, name), start, args.freq,
+                              args.base, args.trend, seasons, args.noise, rates, args.outlier_scale)
+        try:
+            summary = generate_series(config, args.out_dir, formats)
+        except ValueError as e:
+            print(f"❌ {name}: {e}")
+            sys.exit(1)
+        rate = summary["rows_written"] / max(summary["generation_seconds"], 1e-9)
+        print(f"✅ {name}: {summary['rows_written']:,} rows in {summary['generation_seconds']:.1f}s "
+              f"({rate:,.0f} rows/s), anomalies {summary['anomalies']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+/**
+ * Behaviour tests for the LLM scheduler (lib/llm-scheduler.ts)
+ *
+ * Usage: node test-llm-scheduler.js
+ *
+ * Needs the project's dev dependencies (TypeScript transpiles the scheduler).
+ */
+
+const assert = require('assert');
+const fs = require('fs');
+const path = require('path');
+
+// Transpiles a lib/ module, resolving '@/lib/...' imports the same way
+const loaded = new Map();
+function loadModule(relativePath) {
+  if (loaded.has(relativePath)) return loaded.get(relativePath).exports;
+  const ts = require('typescript');
+  const source = fs.readFileSync(path.join(__dirname, relativePath), 'utf8');
+  const { outputText } = ts.transpileModule(source, {
+    compilerOptions: { module: ts.ModuleKind.CommonJS, target: ts.ScriptTarget.ES2020, esModuleInterop: true }
+  });
+  const module = { exports: {} };
+  loaded.set(relativePath, module);
+  const localRequire = id => id.startsWith('@/') ? loadModule(`${id.slice(2)}.ts`) : require(id);
+  new Function('module', 'exports', 'require', outputText)(module, module.exports, localRequire);
+  return module.exports;
+}
+
+const { LLMScheduler, CircuitOpenError } = loadModule('lib/llm-scheduler.ts');
+
+let passed = 0;
+let failed = 0;
+
+async function check(name, fn) {
+  try {
+    await fn();
+    passed++;
+    console.log(`✅ ${name}`);
+  } catch (error) {
+    failed++;
+    console.log(`❌ ${name}`);
+    console.log(`   ${error.message}`);
+  }
+}
+
+const throttle = () => Object.assign(new Error('429 Too Many Requests'), { status: 429 });
+const unavailable = () => Object.assign(new Error('503 Service Unavailable'), { status: 503 });
+const tick = () => new Promise(resolve => setImmediate(resolve));
+
+function deferred() {
+  let resolve, reject;
+  const promise = new Promise((res, rej) => { resolve = res; reject = rej; });
+  return { promise, resolve, reject };
+}
+
+// Starts `count` calls that stay in flight until their deferreds settle
+async function inFlight(scheduler, count, priority = 'report', models = ['m']) {
+  const calls = Array.from({ length: count }, () => deferred());
+  const results = calls.map(call =>
+    scheduler.run(priority, models, () => call.promise).then(() => 'ok', error => error));
+  await tick();
+  return { calls, results };
+}
+
+async function main() {
+  console.log('=== Throttle back-off ===\n');
+
+  await check('a burst of concurrent 429s halves the limit once', async () => {
+    const scheduler = new LLMScheduler({ maxConcurrency: 8, interactiveReserve: 0 });
+    const { calls, results } = await inFlight(scheduler, 8);
+    assert.strictEqual(scheduler.getStats().active, 8);
+    calls.forEach(call => call.reject(throttle()));
+    await Promise.all(results);
+    assert.strictEqual(scheduler.getStats().limit, 4);
+  });
+
+  await check('a 429 from a call started after the decrease backs off again', async () => {
+    const scheduler = new LLMScheduler({ maxConcurrency: 8 });
+    for (const expected of [4, 2, 1, 1]) {
+      await scheduler.run('report', ['m'], async () => { throw throttle(); }).catch(() => {});
+      assert.strictEqual(scheduler.getStats().limit, expected);
+    }
+  });
+
+  await check('the limit climbs back one slot per window of successes', async () => {
+    const scheduler = new LLMScheduler({ maxConcurrency: 4 });
+    await scheduler.run('report', ['m'], async () => { throw throttle(); }).catch(() => {});
+    assert.strictEqual(scheduler.getStats().limit, 2);
+    for (let i = 0; i < 2; i++) await scheduler.run('report', ['m'], async () => 'ok');
+    assert.strictEqual(scheduler.getStats().limit, 3);
+  });
+
+  await check('queued calls wait for the reduced limit', async () => {
+    const scheduler = new LLMScheduler({ maxConcurrency: 4, interactiveReserve: 0 });
+    const first = await inFlight(scheduler, 4);
+    first.calls[0].reject(throttle());
+    await first.results[0];
+    const second = await inFlight(scheduler, 2);
+    assert.strictEqual(scheduler.getStats().limit, 2);
+    assert.strictEqual(scheduler.getStats().active, 3);
+    assert.strictEqual(scheduler.getStats().queued.report, 2);
+    first.calls.slice(1).forEach(call => call.resolve('ok'));
+    await Promise.all(first.results);
+    assert.strictEqual(scheduler.getStats().active, 2);
+    second.calls.forEach(call => call.resolve('ok'));
+    assert.deepStrictEqual(await Promise.all(second.results), ['ok', 'ok']);
+  });
+
+  console.log('\n=== Circuit breaker ===\n');
+
+  await check('429s never open the circuit of a model without fallback', async () => {
+    const scheduler = new LLMScheduler({ maxConcurrency: 8, failureThreshold: 3 });
+    for (let i = 0; i < 10; i++) {
+      const error = await scheduler.run('report', ['only'], async () => { throw throttle(); }).catch(e => e);
+      assert.strictEqual(error.status, 429);
+    }
+    assert.strictEqual(scheduler.getStats().circuits.only, 'closed');
+    assert.strictEqual(await scheduler.run('interactive', ['only'], async () => 'ok'), 'ok');
+  });
+
+  await check('a throttled model fails over to the next candidate', async () => {
+    const scheduler = new LLMScheduler();
+    const seen = [];
+    const result = await scheduler.run('interactive', ['primary', 'fallback'], async model => {
+      seen.push(model);
+      if (model === 'primary') throw throttle();
+      return model;
+    });
+    assert.strictEqual(result, 'fallback');
+    assert.deepStrictEqual(seen, ['primary', 'fallback']);
+  });
+
+  await check('upstream failures open the circuit after the threshold', async () => {
+    const scheduler = new LLMScheduler({ failureThreshold: 3, openDurationMs: 60000 });
+    for (let i = 0; i < 3; i++) {
+      await scheduler.run('report', ['m'], async () => { throw unavailable(); }).catch(() => {});
+    }
+    assert.strictEqual(scheduler.getStats().circuits.m, 'open');
+    const error = await scheduler.run('report', ['m'], async () => 'ok').catch(e => e);
+    assert.ok(error instanceof CircuitOpenError, `expected CircuitOpenError, got ${error}`);
+  });
+
+  await check('bad requests do not count against the model', async () => {
+    const scheduler = new LLMScheduler({ failureThreshold: 1 });
+    const badRequest = Object.assign(new Error('400 Bad Request'), { status: 400 });
+    const error = await scheduler.run('report', ['m'], async () => { throw badRequest; }).catch(e => e);
+    assert.strictEqual(error, badRequest);
+    assert.strictEqual(scheduler.getStats().circuits.m, 'closed');
+  });
+
+  console.log('\n=== Priorities ===\n');
+
+  await check('queued interactive calls start before queued reports', async () => {
+    const scheduler = new LLMScheduler({ maxConcurrency: 1, interactiveReserve: 0 });
+    const order = [];
+    const blocker = await inFlight(scheduler, 1);
+    const report = scheduler.run('report', ['m'], async () => { order.push('report'); });
+    const interactive = scheduler.run('interactive', ['m'], async () => { order.push('interactive'); });
+    await tick();
+    blocker.calls[0].resolve('ok');
+    await Promise.all([report, interactive, ...blocker.results]);
+    assert.deepStrictEqual(order, ['interactive', 'report']);
+  });
+
+  await check('the interactive reserve admits chat while reports fill the limit', async () => {
+    const scheduler = new LLMScheduler({ maxConcurrency: 2, interactiveReserve: 1 });
+    const reports = await inFlight(scheduler, 3);
+    assert.strictEqual(scheduler.getStats().activeByPriority.report, 1);
+    assert.strictEqual(await scheduler.run('interactive', ['m'], async () => 'chat'), 'chat');
+    reports.calls.forEach(call => call.resolve('ok'));
+    await Promise.all(reports.results);
+  });
+
+  console.log(`\n${passed} passed, ${failed} failed`);
+  process.exit(failed > 0 ? 1 : 0);
+}
+
+main();
@@ -0,0 +1,208 @@
+/**
+ * Round-trip and interop tests for the MessagePack codec (lib/msgpack.ts)
+ *
+ * Usage: node test-msgpack.js
+ *
+ * Needs the project's dev dependencies (TypeScript transpiles the codec).
+ * Python interop runs when python3 has the msgpack package; otherwise it is
+ * reported as skipped.
+ */
+
+const assert = require('assert');
+const fs = require('fs');
+const path = require('path');
+const { spawnSync } = require('child_process');
+
+function loadCodec() {
+  const ts = require('typescript');
+  const source = fs.readFileSync(path.join(__dirname, 'lib', 'msgpack.ts'), 'utf8');
+  const { outputText } = ts.transpileModule(source, {
+    compilerOptions: { module: ts.ModuleKind.CommonJS, target: ts.ScriptTarget.ES2020 }
+  });
+  const module = { exports: {} };
+  new Function('module', 'exports', 'require', outputText)(module, module.exports, require);
+  return module.exports;
+}
+
+const { encodeMsgpack, decodeMsgpack } = loadCodec();
+
+let passed = 0;
+let failed = 0;
+
+function check(name, fn) {
+  try {
+    fn();
+    passed++;
+    console.log(`✅ ${name}`);
+  } catch (error) {
+    failed++;
+    console.log(`❌ ${name}`);
+    console.log(`   ${error.message}`);
+  }
+}
+
+const hex = bytes => Buffer.from(bytes).toString('hex');
+const range = n => Array.from({ length: n }, (_, i) => i);
+const mapOf = n => Object.fromEntries(range(n).map(i => [`k${i}`, i]));
+
+// [name, value, expected leading type byte]
+const boundaryCases = [
+  ['fixstr empty', '', 0xa0],
+  ['fixstr 31', 'a'.repeat(31), 0xbf],
+  ['str8 32', 'a'.repeat(32), 0xd9],
+  ['str8 255', 'a'.repeat(255), 0xd9],
+  ['str16 256', 'a'.repeat(256), 0xda],
+  ['str16 65535', 'a'.repeat(65535), 0xda],
+  ['str32 65536', 'a'.repeat(65536), 0xdb],
+  ['str multibyte utf-8', 'Café 你好 📈', 0xb1],
+  ['fixarray empty', [], 0x90],
+  ['fixarray 15', range(15), 0x9f],
+  ['array16 16', range(16), 0xdc],
+  ['array16 65535', range(65535), 0xdc],
+  ['array32 65536', range(65536), 0xdd],
+  ['fixmap empty', {}, 0x80],
+  ['fixmap 15', mapOf(15), 0x8f],
+  ['map16 16', mapOf(16), 0xde],
+  ['map16 65535', mapOf(65535), 0xde],
+  ['map32 65536', mapOf(65536), 0xdf],
+  ['positive fixint 0', 0, 0x00],
+  ['positive fixint 127', 127, 0x7f],
+  ['uint8 128', 128, 0xcc],
+  ['uint8 255', 255, 0xcc],
+  ['uint16 256', 256, 0xcd],
+  ['uint16 65535', 65535, 0xcd],
+  ['uint32 65536', 65536, 0xce],
+  ['uint32 4294967295', 4294967295, 0xce],
+  ['negative fixint -1', -1, 0xff],
+  ['negative fixint -32', -32, 0xe0],
+  ['int8 -33', -33, 0xd0],
+  ['int8 -128', -128, 0xd0],
+  ['int16 -129', -129, 0xd1],
+  ['int16 -32768', -32768, 0xd1],
+  ['int32 -32769', -32769, 0xd2],
+  ['int32 -2147483648', -2147483648, 0xd2],
+  ['float64 for -2147483649', -2147483649, 0xcb],
+  ['float64 for 4294967296', 4294967296, 0xcb],
+  ['float64 1.5', 1.5, 0xcb],
+  ['float64 -0.1', -0.1, 0xcb],
+  ['float64 max safe', Number.MAX_SAFE_INTEGER, 0xcb],
+  ['nil', null, 0xc0],
+  ['false', false, 0xc2],
+  ['true', true, 0xc3],
+];
+
+console.log('=== MessagePack boundary round-trips ===\n');
+
+for (const [name, value, leading] of boundaryCases) {
+  check(name, () => {
+    const encoded = encodeMsgpack(value);
+    assert.strictEqual(encoded[0], leading, `leading byte 0x${encoded[0].toString(16)}, expected 0x${leading.toString(16)}`);
+    assert.deepStrictEqual(decodeMsgpack(encoded), value);
+  });
+}
+
+const nested = {
+  conversationHistory: [
+    { role: 'user', content: 'Forecast Q3 revenue' },
+    { role: 'assistant', content: '**Q3** looks strong 📈', meta: { tokens: 812, score: 0.93, flags: [true, false, null] } },
+  ],
+  analysisContext: { selectedBu: { name: 'Sales', lobs: range(20).map(i => ({ id: `lob-${i}`, value: (i + 1) * -1.25 })) } },
+  deep: JSON.parse('['.repeat(100) + ']'.repeat(100)),
+};
+
+console.log('\n=== Structure and edge cases ===\n');
+
+check('nested report payload', () => {
+  assert.deepStrictEqual(decodeMsgpack(encodeMsgpack(nested)), nested);
+});
+
+check('bin8 / bin16 / bin32', () => {
+  for (const size of [0, 255, 256, 65535, 65536]) {
+    const bytes = new Uint8Array(size).map((_, i) => i & 0xff);
+    const decoded = decodeMsgpack(encodeMsgpack(bytes));
+    assert.ok(decoded instanceof Uint8Array);
+    assert.deepStrictEqual(Buffer.from(decoded), Buffer.from(bytes));
+  }
+});
+
+check('JSON semantics: undefined members dropped, NaN becomes nil, -0 becomes 0, toJSON honoured', () => {
+  const date = new Date('2026-01-02T03:04:05Z');
+  assert.deepStrictEqual(decodeMsgpack(encodeMsgpack({ a: undefined, b: NaN, c: date })), { b: null, c: date.toJSON() });
+  assert.strictEqual(hex(encodeMsgpack(-0)), '00');
+});
+
+check('__proto__ key stays an own property', () => {
+  const decoded = decodeMsgpack(Buffer.from('81a95f5f70726f746f5f5f81a170c3', 'hex'));
+  assert.strictEqual(Object.getPrototypeOf(decoded), Object.prototype);
+  assert.deepStrictEqual(Object.keys(decoded), ['__proto__']);
+  assert.strictEqual(decoded.p, undefined);
+});
+
+check('spec example {"compact": true, "schema": 0}', () => {
+  assert.strictEqual(hex(encodeMsgpack({ compact: true, schema: 0 })), '82a7636f6d70616374c3a6736368656d6100');
+});
+
+check('64-bit and float32 values decode', () => {
+  assert.strictEqual(decodeMsgpack(Buffer.from('cf0000010000000000', 'hex')), 2 ** 40);
+  assert.strictEqual(decodeMsgpack(Buffer.from('d3ffffff0000000000', 'hex')), -(2 ** 40));
+  assert.strictEqual(decodeMsgpack(Buffer.from('ca3fc00000', 'hex')), 1.5);
+});
+
+const truncated = [
+  ['empty input', ''],
+  ['uint16 missing a byte', 'cd01'],
+  ['float64 missing bytes', 'cb3ff8'],
+  ['str8 shorter than its length', 'd90561626364'],
+  ['fixarray missing an element', '9201'],
+  ['map16 missing a value', 'de0001a16b'],
+  ['array32 claiming 2^32-1 elements', 'ddffffffff'],
+];
+
+for (const [name, input] of truncated) {
+  check(`rejects truncated input: ${name}`, () => {
+    assert.throws(() => decodeMsgpack(Buffer.from(input, 'hex')), /unexpected end of input/);
+  });
+}
+
+check('rejects trailing bytes', () => {
+  assert.throws(() => decodeMsgpack(Buffer.from('c0c0', 'hex')), /trailing bytes/);
+});
+
+check('rejects extension types', () => {
+  assert.throws(() => decodeMsgpack(Buffer.from('d40100', 'hex')), /unsupported type/);
+});
+
+console.log('\n=== Python msgpack interop ===\n');
+
+// Python decodes each JS encoding and re-encodes it; identical bytes mean both
+// sides agree on every value and on the smallest representation
+const PYTHON_ROUND_TRIP = `
+import json, sys
+import msgpack
+out = []
+for item in json.load(sys.stdin):
+    value = msgpack.unpackb(bytes.fromhex(item), raw=False, strict_map_key=False)
+    out.append(msgpack.packb(value, use_bin_type=True).hex())
+json.dump(out, sys.stdout)
+`;
+
+const interopValues = [...boundaryCases.map(([, value]) => value), nested, new Uint8Array([0, 1, 254, 255])];
+const python = spawnSync('python3', ['-c', PYTHON_ROUND_TRIP], {
+  input: JSON.stringify(interopValues.map(value => hex(encodeMsgpack(value)))),
+  maxBuffer: 64 * 1024 * 1024,
+});
+
+if (python.error || (python.status !== 0 && /No module named/.test(String(python.stderr)))) {
+  console.log('⏭️  Skipped: python3 with the msgpack package is not available');
+} else {
+  check('python3 msgpack re-encodes every value byte for byte', () => {
+    assert.strictEqual(python.status, 0, String(python.stderr));
+    const reencoded = JSON.parse(String(python.stdout));
+    interopValues.forEach((value, i) => {
+      assert.strictEqual(reencoded[i], hex(encodeMsgpack(value)), `value #${i} differs`);
+    });
+  });
+}
+
+console.log(`\n${passed} passed, ${failed} failed`);
+process.exit(failed > 0 ? 1 : 0);
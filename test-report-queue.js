@@ -0,0 +1,229 @@
+/**
+ * Concurrency and lease tests for the file-backed report queue (lib/report-queue.ts)
+ *
+ * Usage: node test-report-queue.js
+ *
+ * Needs the project's dev dependencies (TypeScript transpiles the queue).
+ * Each test uses its own directory under the OS temp dir; claim races run in
+ * separate worker processes, as they do in production.
+ */
+
+const assert = require('assert');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const { fork } = require('child_process');
+
+// Transpiles a lib/ module, resolving '@/lib/...' imports the same way
+const loaded = new Map();
+function loadModule(relativePath) {
+  if (loaded.has(relativePath)) return loaded.get(relativePath).exports;
+  const ts = require('typescript');
+  const source = fs.readFileSync(path.join(__dirname, relativePath), 'utf8');
+  const { outputText } = ts.transpileModule(source, {
+    compilerOptions: { module: ts.ModuleKind.CommonJS, target: ts.ScriptTarget.ES2020, esModuleInterop: true }
+  });
+  const module = { exports: {} };
+  loaded.set(relativePath, module);
+  const localRequire = id => id.startsWith('@/') ? loadModule(`${id.slice(2)}.ts`) : require(id);
+  new Function('module', 'exports', 'require', outputText)(module, module.exports, localRequire);
+  return module.exports;
+}
+
+const { FileReportQueue } = loadModule('lib/report-queue.ts');
+
+const INPUT = { businessUnit: 'Sales', lineOfBusiness: 'Retail', query: 'Forecast Q3' };
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+// Child mode: claim and complete jobs until the queue is empty, then report the ids
+async function runClaimWorker(dir) {
+  const queue = new FileReportQueue({ dir });
+  const claimed = [];
+  let job;
+  while ((job = await queue.claim(`worker-${process.pid}`))) {
+    claimed.push(job.id);
+    await queue.complete(job, { report: `by ${process.pid}` });
+  }
+  process.send(claimed, () => process.exit(0));
+}
+
+const tempDirs = [];
+function newQueue(config = {}) {
+  const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'report-queue-test-'));
+  tempDirs.push(dir);
+  return new FileReportQueue({ dir, leaseMs: 150, maxAttempts: 3, retentionMs: 60000, ...config });
+}
+
+let passed = 0;
+let failed = 0;
+
+async function check(name, fn) {
+  try {
+    await fn();
+    passed++;
+    console.log(`✅ ${name}`);
+  } catch (error) {
+    failed++;
+    console.log(`❌ ${name}`);
+    console.log(`   ${error.message}`);
+  }
+}
+
+function claimInWorker(dir) {
+  return new Promise((resolve, reject) => {
+    const child = fork(__filename, ['--claim-worker', dir]);
+    child.once('message', resolve);
+    child.once('error', reject);
+    child.once('exit', code => code !== 0 && reject(new Error(`claim worker exited with ${code}`)));
+  });
+}
+
+async function main() {
+  console.log('=== Claims ===\n');
+
+  await check('concurrent worker processes claim each job exactly once', async () => {
+    const queue = newQueue();
+    const ids = [];
+    for (let i = 0; i < 60; i++) ids.push((await queue.enqueue(INPUT)).id);
+
+    const perWorker = await Promise.all(Array.from({ length: 4 }, () => claimInWorker(queue.config.dir)));
+    const claimed = perWorker.flat();
+    assert.strictEqual(claimed.length, ids.length, `${claimed.length} claims for ${ids.length} jobs`);
+    assert.deepStrictEqual([...claimed].sort(), [...ids].sort());
+    assert.deepStrictEqual(await queue.stats(), { queued: 0, running: 0, completed: 60, failed: 0 });
+  });
+
+  await check('jobs are claimed in submission order', async () => {
+    const queue = newQueue();
+    const ids = [];
+    for (let i = 0; i < 5; i++) ids.push((await queue.enqueue(INPUT)).id);
+    for (const id of ids) assert.strictEqual((await queue.claim('w')).id, id);
+    assert.strictEqual(await queue.claim('w'), null);
+  });
+
+  console.log('\n=== Leases ===\n');
+
+  await check('an expired lease is reclaimed and the job runs again', async () => {
+    const queue = newQueue();
+    const { id } = await queue.enqueue(INPUT);
+    const first = await queue.claim('dead-worker');
+    assert.strictEqual(first.attempts, 1);
+
+    await sleep(200);
+    assert.strictEqual(await queue.reclaimExpired(), 1);
+    const requeued = await queue.get(id);
+    assert.strictEqual(requeued.status, 'queued');
+    assert.match(requeued.error, /lease expired/);
+
+    const second = await queue.claim('live-worker');
+    assert.strictEqual(second.id, id);
+    assert.strictEqual(second.attempts, 2);
+  });
+
+  await check('heartbeats keep a lease alive', async () => {
+    const queue = newQueue();
+    await queue.enqueue(INPUT);
+    const job = await queue.claim('w');
+    for (let i = 0; i < 4; i++) {
+      await sleep(75);
+      assert.strictEqual(await queue.heartbeat(job), true);
+    }
+    assert.strictEqual(await queue.reclaimExpired(), 0);
+    assert.strictEqual((await queue.get(job.id)).status, 'running');
+  });
+
+  await check('a job out of attempts fails instead of requeueing', async () => {
+    const queue = newQueue({ maxAttempts: 1 });
+    const { id } = await queue.enqueue(INPUT);
+    await queue.claim('dead-worker');
+    await sleep(200);
+    assert.strictEqual(await queue.reclaimExpired(), 1);
+    assert.strictEqual((await queue.get(id)).status, 'failed');
+  });
+
+  await check('a late owner can neither heartbeat nor complete a reclaimed job', async () => {
+    const queue = newQueue();
+    const { id } = await queue.enqueue(INPUT);
+    const late = await queue.claim('slow-worker');
+    await sleep(200);
+    await queue.reclaimExpired();
+    const current = await queue.claim('new-worker');
+
+    assert.strictEqual(await queue.heartbeat(late), false);
+    assert.strictEqual(await queue.complete(late, { report: 'stale' }), null);
+    assert.strictEqual(await queue.fail(late, new Error('stale'), true), null);
+    assert.strictEqual((await queue.get(id)).status, 'running');
+
+    assert.ok(await queue.complete(current, { report: 'fresh' }));
+    const done = await queue.get(id);
+    assert.strictEqual(done.status, 'completed');
+    assert.deepStrictEqual(done.result, { report: 'fresh' });
+    assert.strictEqual(done.workerId, 'new-worker');
+  });
+
+  await check('a late owner cannot complete a job that is already finished', async () => {
+    const queue = newQueue();
+    await queue.enqueue(INPUT);
+    const late = await queue.claim('slow-worker');
+    await sleep(200);
+    await queue.reclaimExpired();
+    const current = await queue.claim('new-worker');
+    await queue.complete(current, { report: 'fresh' });
+    assert.strictEqual(await queue.complete(late, { report: 'stale' }), null);
+    assert.deepStrictEqual((await queue.get(late.id)).result, { report: 'fresh' });
+  });
+
+  console.log('\n=== Recovery and retention ===\n');
+
+  await check('a move interrupted by a crash is finished by recoverStranded', async () => {
+    const queue = newQueue();
+    const { id } = await queue.enqueue(INPUT);
+    const job = await queue.claim('crashed-worker');
+    const runningFile = path.join(queue.config.dir, 'running', `${id}.${job.claimToken}.json`);
+    const moving = path.join(queue.config.dir, 'tmp', `${id}.finish-1-abcdef.moving`);
+    fs.renameSync(runningFile, moving);
+    const old = new Date(Date.now() - 1000);
+    fs.utimesSync(moving, old, old);
+
+    assert.strictEqual(await queue.recoverStranded(), 1);
+    assert.strictEqual((await queue.get(id)).status, 'queued');
+    assert.deepStrictEqual(fs.readdirSync(path.join(queue.config.dir, 'tmp')), []);
+  });
+
+  await check('finished jobs are pruned after the retention window', async () => {
+    const queue = newQueue({ retentionMs: 100 });
+    const kept = [];
+    const pruned = [];
+    for (let i = 0; i < 4; i++) {
+      await queue.enqueue(INPUT);
+      const job = await queue.claim('w');
+      if (i % 2 === 0) await queue.complete(job, { report: 'ok' });
+      else await queue.fail(job, new Error('bad input'), false);
+      (i < 2 ? pruned : kept).push(job.id);
+    }
+    await queue.enqueue(INPUT);
+
+    await sleep(150);
+    // Finished recently despite an old id
+    for (const id of kept) {
+      const { status } = await queue.get(id);
+      const file = path.join(queue.config.dir, status === 'completed' ? 'done' : 'failed', `${id}.json`);
+      fs.utimesSync(file, new Date(), new Date());
+    }
+
+    assert.strictEqual(await queue.pruneFinished(), 2);
+    for (const id of pruned) assert.strictEqual(await queue.get(id), null);
+    for (const id of kept) assert.ok(await queue.get(id));
+    assert.deepStrictEqual(await queue.stats(), { queued: 1, running: 0, completed: 1, failed: 1 });
+  });
+
+  for (const dir of tempDirs) fs.rmSync(dir, { recursive: true, force: true });
+  console.log(`\n${passed} passed, ${failed} failed`);
+  process.exit(failed > 0 ? 1 : 0);
+}
+
+if (process.argv[2] === '--claim-worker') {
+  runClaimWorker(process.argv[3]);
+} else {
+  main();
+}